@@ -1,37 +1,50 @@
-import pandas as pd
 import os
+import sys
+import time
+from football_data import open_matches, parse_dataset, compact_matches, memory_report, COLUMN_GROUPS
+from football_validation import validate_matches
 
 print("=== DIAGNOSTIC DATASET ===")
 
-# Test 1: Vérifier l'existence du fichier
-paths_to_test = ['../dataset.csv', './dataset.csv', 'dataset.csv']
+# Test 1: Vérifier l'existence du fichier (ou du dossier passé en argument)
+paths_to_test = sys.argv[1:] or ['../dataset.csv', './dataset.csv', 'dataset.csv']
 
 for path in paths_to_test:
     exists = os.path.exists(path)
     print(f"Fichier '{path}': {'✅ EXISTE' if exists else '❌ N EXISTE PAS'}")
-    
-    if exists:
+
+    if exists and os.path.isfile(path):
         size = os.path.getsize(path)
         print(f"  Taille: {size} bytes")
 
-print("\n=== TEST CHARGEMENT ===")
-
-# Test 2: Essayer de charger avec différents encodages
-encodings = ['latin-1', 'utf-8', 'cp1252', 'iso-8859-1']
-
-for path in ['../dataset.csv', './dataset.csv']:
-    if os.path.exists(path):
-        print(f"\n📁 Test du fichier: {path}")
-        
-        for encoding in encodings:
-            try:
-                data = pd.read_csv(path, encoding=encoding, nrows=5)  # Test avec seulement 5 lignes
-                print(f"  ✅ {encoding}: OK - {len(data)} lignes chargées")
-                print(f"     Colonnes: {list(data.columns[:5])}...")
-                break
-            except Exception as e:
-                print(f"  ❌ {encoding}: {str(e)[:50]}...")
-        else:
-            print(f"  ❌ Tous les encodages ont échoué pour {path}")
+print("\n=== VALIDATION COMPLÈTE ===")
+
+# Test 2: Charger toute la table et la valider en une passe vectorisée
+exit_code = 0
+for path in dict.fromkeys(os.path.abspath(path) for path in paths_to_test if os.path.exists(path)):
+    print(f"\n📁 Validation de: {path}")
+    try:
+        start = time.time()
+        table = open_matches(path)
+        data = table.frame(*COLUMN_GROUPS)
+        print(f"  ✅ Chargement: {len(data)} lignes, {len(data.columns)} colonnes "
+              f"(encodage {getattr(table, 'encoding', 'par fichier')})")
+
+        if os.path.isfile(path):
+            # Mémoire par groupe de colonnes: lecture brute vs table compacte
+            raw = parse_dataset(path)
+            memory = memory_report(raw, compact_matches(raw))
+            print("  💾 Mémoire (octets) avant / après compactage:")
+            print('    ' + memory.to_string().replace('\n', '\n    '))
+
+        report = validate_matches(data)
+        print('  ' + report.summary().replace('\n', '\n  '))
+        print(f"  ⏱️ {time.time() - start:.2f} s")
+        if not report.ok:
+            exit_code = 1
+    except Exception as e:
+        print(f"  ❌ Erreur: {str(e)[:200]}")
+        exit_code = 1
 
 print("\n=== FIN DIAGNOSTIC ===")
+sys.exit(exit_code)
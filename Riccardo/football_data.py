@@ -0,0 +1,1231 @@
+"""
+📦 FOOTBALL DATA - Chargement et cache du dataset
+=================================================
+Fonctions de chargement partagées par football_prediction_pro.py
+et football_prediction_advanced.py (sans dépendance à Streamlit).
+"""
+
+import io
+import os
+import json
+import re
+import csv
+import codecs
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from glob import glob
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from football_stats import SeasonCube
+
+# Dossier du cache colonnaire (créé à côté du fichier CSV)
+CACHE_DIR_NAME = '.football_cache'
+
+# À incrémenter si le format du cache ou le traitement du CSV change
+CACHE_FORMAT_VERSION = 8
+
+# Cache d'un groupe: morceaux successifs (lignes ajoutées au CSV), réécrit en un seul fichier au-delà
+MAX_CACHE_CHUNKS = 8
+
+# Étendue d'index réservée à chaque fichier d'un dossier: index global = n° du fichier × étendue + ligne
+FILE_ROW_SPAN = 10 ** 9
+
+# Colonnes texte du format football-data.co.uk
+TEXT_COLUMNS = ['Div', 'Time', 'HomeTeam', 'AwayTeam', 'FTR', 'HTR', 'Referee']
+
+# Statistiques de match (buts, tirs, fautes, corners, cartons)
+STAT_COLUMNS = [
+    'FTHG', 'FTAG', 'HTHG', 'HTAG',
+    'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC',
+    'HY', 'AY', 'HR', 'AR', 'HO', 'AO', 'HHW', 'AHW', 'HFKC', 'AFKC', 'HBP', 'ABP',
+    'Attendance'
+]
+
+# Colonnes principales (identité du match et score)
+CORE_COLUMNS = ['Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam',
+                'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR', 'Referee', 'Season']
+
+# Préfixes des bookmakers (le plus long d'abord pour que 'PS' passe avant 'P')
+BOOKMAKERS = sorted(
+    ['1XB', 'B365', 'BF', 'BFD', 'BFE', 'BMGM', 'BS', 'BV', 'BW', 'BbAv', 'BbMx', 'CL', 'GB',
+     'IW', 'LB', 'Max', 'Avg', 'P', 'PS', 'SB', 'SJ', 'SO', 'SY', 'VC', 'WH'],
+    key=len, reverse=True
+)
+
+# Cotes: <bookmaker>[C]H/D/A, <bookmaker>[C]>2.5 / <2.5, <bookmaker>[C]AHH / AHA, [Bb]AHh / AHCh
+# Le 'C' optionnel après le bookmaker désigne les cotes de clôture
+ODDS_PATTERN = re.compile(
+    r'^(?:(?:' + '|'.join(BOOKMAKERS) + r')(?P<closing>C?)(?P<market>H|D|A|>2\.5|<2\.5|AHH|AHA)'
+    r'|(?:Bb)?AH(?P<line_closing>C?)h)$'
+)
+
+# Noms alternatifs selon les saisons / ligues football-data -> nom canonique
+SCHEMA_ALIASES = {
+    'Home': 'HomeTeam', 'Away': 'AwayTeam',
+    'HG': 'FTHG', 'AG': 'FTAG', 'Res': 'FTR',
+    'BbMxH': 'MaxH', 'BbMxD': 'MaxD', 'BbMxA': 'MaxA',
+    'BbAvH': 'AvgH', 'BbAvD': 'AvgD', 'BbAvA': 'AvgA',
+    'BbMx>2.5': 'Max>2.5', 'BbMx<2.5': 'Max<2.5',
+    'BbAv>2.5': 'Avg>2.5', 'BbAv<2.5': 'Avg<2.5',
+    'BbAHh': 'AHh', 'BbMxAHH': 'MaxAHH', 'BbMxAHA': 'MaxAHA',
+    'BbAvAHH': 'AvgAHH', 'BbAvAHA': 'AvgAHA',
+}
+
+# Variantes de noms d'équipes selon les saisons / sources -> nom canonique
+# (les différences de casse, de points et d'espaces sont déjà ignorées: 'St. Truiden' == 'St Truiden')
+TEAM_ALIASES = {
+    'Sint-Truiden': 'St Truiden', 'Sint Truiden': 'St Truiden', 'STVV': 'St Truiden',
+    'Union SG': 'St. Gilloise', 'Union St Gilloise': 'St. Gilloise', 'Union Saint-Gilloise': 'St. Gilloise',
+    'OH Leuven': 'Oud-Heverlee Leuven', 'Leuven': 'Oud-Heverlee Leuven',
+    'Zulte Waregem': 'Waregem', 'Zulte-Waregem': 'Waregem',
+    'Royal Antwerp': 'Antwerp', 'Standard Liege': 'Standard', 'Club Bruges': 'Club Brugge',
+    'Mouscron-Peruwelz': 'Mouscron', 'Beerschot': 'Beerschot VA', 'KAS Eupen': 'Eupen',
+}
+
+# Formats de date rencontrés (ISO pour dataset.csv, jj/mm/aa et jj/mm/aaaa sur football-data.co.uk)
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%y', '%d/%m/%Y']
+
+# Groupes de colonnes chargés à la demande (dans cet ordre)
+COLUMN_GROUPS = ['core', 'match_stats', 'odds_1x2', 'odds_ou', 'odds_ah', 'odds_closing', 'other']
+
+# Colonnes codées en catégories (les deux colonnes d'équipes partagent le même vocabulaire)
+CATEGORY_COLUMNS = TEXT_COLUMNS + ['Season']
+TEAM_COLUMNS = ['HomeTeam', 'AwayTeam']
+
+# Taille du préfixe lu pour détecter l'encodage
+SNIFF_BYTES = 64 * 1024
+
+# Emplacements du dataset des applications (relatifs au dossier de lancement), dans l'ordre
+DATASET_PATHS = [
+    '../dataset.csv',
+    './dataset.csv',
+    'dataset.csv',
+    'C:/Users/Ricca/football_prediction_clean/dataset.csv',
+    'C:/Users/Ricca/football_prediction_clean/Riccardo/dataset.csv'
+]
+
+# Âge minimal (secondes) d'une modification pour se fier à (taille, date de modification) sans hacher
+STAMP_MARGIN = 2.0
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """Empreinte du contenu d'un fichier (BLAKE2b, lecture par blocs)"""
+    return fingerprint_with_prefix(path, None, chunk_size)[0]
+
+
+def fingerprint_with_prefix(path, prefix_size, chunk_size=1 << 20):
+    """Empreinte du fichier complet et de ses prefix_size premiers octets, en une seule lecture"""
+    digest = hashlib.blake2b(digest_size=16)
+    prefix_digest = None
+    remaining = prefix_size
+
+    with open(path, 'rb') as f:
+        if prefix_size is not None:
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+            if remaining == 0:
+                prefix_digest = digest.copy().hexdigest()
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest(), prefix_digest
+
+
+def file_stamp(path):
+    """(taille, date de modification en ns) d'un fichier: contrôle rapide avant tout hachage
+
+    Une modification plus récente que STAMP_MARGIN n'est pas datée de façon fiable (résolution
+    du système de fichiers): la date vaut alors None et le fichier devra être haché.
+    """
+    stat = os.stat(path)
+    recent = time.time() - stat.st_mtime < STAMP_MARGIN
+    return stat.st_size, None if recent else stat.st_mtime_ns
+
+
+def is_append_of(path, previous_fingerprint, previous_size):
+    """Le fichier est-il l'ancien contenu (même préfixe, terminé par un saut de ligne) + de nouvelles lignes ?"""
+    if previous_fingerprint is None or previous_size is None or previous_size <= 0:
+        return False, None
+    if os.path.getsize(path) <= previous_size:
+        return False, None
+
+    fingerprint, prefix = fingerprint_with_prefix(path, previous_size)
+    if prefix != previous_fingerprint:
+        return False, fingerprint
+
+    with open(path, 'rb') as f:
+        f.seek(previous_size - 1)
+        ends_with_newline = f.read(1) == b'\n'
+    return ends_with_newline, fingerprint
+
+
+def sniff_encoding(path, sniff_bytes=SNIFF_BYTES):
+    """Détection de l'encodage à partir d'un court préfixe du fichier"""
+    with open(path, 'rb') as f:
+        prefix = f.read(sniff_bytes)
+
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    try:
+        # Décodage incrémental: un caractère coupé en fin de préfixe n'est pas une erreur
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        # latin-1 décode n'importe quel octet: c'était déjà l'encodage retenu en premier
+        return 'latin-1'
+
+
+def read_header(path, encoding):
+    """Lecture de la ligne d'en-tête uniquement"""
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def column_dtypes(columns):
+    """Types explicites pour les colonnes football-data connues"""
+    dtypes = {}
+    for col in columns:
+        if col in TEXT_COLUMNS:
+            dtypes[col] = str
+        elif col in STAT_COLUMNS or ODDS_PATTERN.match(col):
+            dtypes[col] = 'float64'
+    return dtypes
+
+
+def canonical_columns(header):
+    """Correspondance nom brut -> nom canonique (un alias n'écrase jamais une colonne existante)"""
+    present = set(header)
+    mapping = {}
+    for col in header:
+        canonical = SCHEMA_ALIASES.get(col, col)
+        mapping[col] = canonical if canonical == col or canonical not in present else col
+    return mapping
+
+
+def parse_match_dates(values):
+    """Conversion vectorisée des dates, un format à la fois"""
+    dates = pd.to_datetime(values, format=DATE_FORMATS[0], errors='coerce')
+    for fmt in DATE_FORMATS[1:]:
+        missing = dates.isna() & values.notna()
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+    return dates.astype('datetime64[ns]')
+
+
+def season_labels(dates):
+    """Saison (Juillet à Juin) calculée de façon vectorisée"""
+    start_year = dates.dt.year - (dates.dt.month < 7).astype(int)
+    # Une seule chaîne construite par saison distincte
+    labels = {year: f"{year}-{year+1}" for year in start_year.unique()}
+    return start_year.map(labels)
+
+
+def parse_dataset(path, columns=None, encoding=None, offset=None):
+    """Lecture du CSV football-data en une passe avec types explicites
+
+    columns: sous-ensemble de colonnes à lire (None = toutes). 'Date' est toujours lue
+    pour filtrer les lignes de la même façon quel que soit le sous-ensemble.
+    offset: position en octets du début des lignes à lire (None = tout le fichier);
+    seules les lignes ajoutées après cette position sont parsées.
+    Le décodage est strict: un octet non UTF-8 au-delà du préfixe examiné par
+    sniff_encoding provoque une relecture en latin-1, jamais un remplacement par U+FFFD.
+    """
+    encoding = encoding or sniff_encoding(path)
+    header = read_header(path, encoding)
+    names = canonical_columns(header)
+
+    if columns is None:
+        usecols = header
+        keep_date = True
+    else:
+        wanted = set(columns) | {'Date'}
+        usecols = [col for col in header if names[col] in wanted]
+        keep_date = 'Date' in columns
+
+    source = path
+    if offset is not None:
+        # En-tête + nouvelles lignes seulement
+        with open(path, 'rb') as f:
+            header_line = f.readline()
+            f.seek(max(offset, len(header_line)))
+            source = io.BytesIO(header_line + f.read())
+
+    dtypes = column_dtypes([names[col] for col in usecols])
+    try:
+        data = pd.read_csv(source, encoding=encoding, encoding_errors='strict',
+                           dtype={col: dtypes[names[col]] for col in usecols if names[col] in dtypes},
+                           usecols=usecols)
+    except UnicodeDecodeError:
+        if encoding == 'latin-1':
+            raise
+        # latin-1 décode n'importe quel octet: relecture complète, en-tête compris
+        return parse_dataset(path, columns, 'latin-1', offset)
+    data = data.rename(columns=names)
+
+    # Nettoyer et formater les données
+    data['Date'] = parse_match_dates(data['Date'])
+    data = data.dropna(subset=['Date']).reset_index(drop=True)
+
+    # Fichiers sans colonne Div: la division est le nom du fichier
+    if (columns is None or 'Div' in columns) and 'Div' not in data.columns:
+        data.insert(0, 'Div', os.path.splitext(os.path.basename(path))[0])
+
+    # Calculer la saison (Juillet à Juin)
+    if columns is None or 'Season' in columns:
+        data['Season'] = season_labels(data['Date'])
+
+    if not keep_date:
+        data = data.drop(columns=['Date'])
+
+    return data
+
+
+def narrow_integer_dtype(values):
+    """Plus petit type entier capable de contenir les valeurs"""
+    low, high = values.min(), values.max()
+    for dtype in ('int8', 'int16', 'int32'):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return 'int64'
+
+
+def is_nullable_integer(series):
+    """Colonne d'entiers nullables (Int8, Int16...): valeurs + masque des valeurs manquantes"""
+    return pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_integer_dtype(series.dtype)
+
+
+def compact_matches(data, registry=None):
+    """Représentation compacte: catégories pour le texte, entiers courts et float32
+
+    Les statistiques entières sont des entiers courts, nullables (Int8, Int16) quand
+    quelques valeurs manquent; float32 seulement pour les valeurs non entières.
+
+    Avec un registre d'équipes, les codes des colonnes d'équipes sont les identifiants du registre.
+    """
+    data = data.copy()
+
+    # Équipes: un vocabulaire commun pour que les codes domicile/extérieur soient comparables
+    teams = [col for col in TEAM_COLUMNS if col in data.columns]
+    if teams and registry is not None:
+        for col in teams:
+            data[col] = registry.apply(data[col])
+    elif teams:
+        vocabulary = pd.Index(pd.concat([data[col] for col in teams]).dropna().unique()).sort_values()
+        for col in teams:
+            data[col] = pd.Categorical(data[col], categories=vocabulary)
+
+    for col in data.columns:
+        series = data[col]
+        if col in teams:
+            continue
+        if col in CATEGORY_COLUMNS:
+            data[col] = series.astype('category')
+        elif col in STAT_COLUMNS and pd.api.types.is_numeric_dtype(series):
+            # Entiers courts (nullables s'il manque des valeurs), float32 si valeurs non entières
+            valid = series.dropna()
+            if len(valid) > 0 and (valid == valid.round()).all():
+                dtype = narrow_integer_dtype(valid)
+                data[col] = series.astype(dtype if len(valid) == len(series) else dtype.capitalize())
+            else:
+                data[col] = series.astype('float32')
+        elif pd.api.types.is_float_dtype(series):
+            data[col] = series.astype('float32')
+
+    return data
+
+
+def column_group(col):
+    """Groupe de colonnes (voir COLUMN_GROUPS) auquel appartient une colonne"""
+    if col in CORE_COLUMNS:
+        return 'core'
+    if col in STAT_COLUMNS:
+        return 'match_stats'
+
+    match = ODDS_PATTERN.match(col)
+    if match is None:
+        return 'other'
+    if match.group('closing') or match.group('line_closing'):
+        return 'odds_closing'
+    if match.group('market') in ('H', 'D', 'A'):
+        return 'odds_1x2'
+    if match.group('market') in ('>2.5', '<2.5'):
+        return 'odds_ou'
+    return 'odds_ah'
+
+
+def split_columns(columns):
+    """Répartition des colonnes d'un en-tête par groupe"""
+    groups = {name: [] for name in COLUMN_GROUPS}
+    for col in columns:
+        groups[column_group(col)].append(col)
+    # La saison est dérivée de la date et la division peut venir du nom du fichier
+    if 'Date' in groups['core']:
+        for col in ('Div', 'Season'):
+            if col not in groups['core']:
+                groups['core'].append(col)
+    return groups
+
+
+def memory_report(before, after):
+    """Octets par groupe de colonnes avant / après compactage"""
+    rows = []
+    for label, frame in (('before', before), ('after', after)):
+        usage = frame.memory_usage(index=False, deep=True)
+        for col, nbytes in usage.items():
+            rows.append({'group': column_group(col), 'state': label, 'bytes': int(nbytes)})
+
+    report = pd.DataFrame(rows).pivot_table(
+        index='group', columns='state', values='bytes', aggfunc='sum', fill_value=0
+    )
+    report = report.reindex(columns=['before', 'after'], fill_value=0)
+    report.loc['total'] = report.sum()
+    report['ratio'] = (report['after'] / report['before'].replace(0, np.nan)).round(3)
+    return report
+
+
+def cache_path_for(path, fingerprint, group):
+    """Chemin du fichier cache .npz associé à un CSV, à son empreinte et à un groupe de colonnes"""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{stem}-v{CACHE_FORMAT_VERSION}-{fingerprint}-{group}.npz")
+
+
+def save_cache(data, cache_path):
+    """Sauvegarde colonnaire du DataFrame dans un bundle .npz (sans pickle)"""
+    arrays = {'__columns__': np.array(list(data.columns), dtype=str)}
+
+    for i, col in enumerate(data.columns):
+        series = data[col]
+        key = f"c{i}"
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Catégories: codes entiers + vocabulaire
+            arrays[key] = series.cat.codes.to_numpy()
+            arrays[f"k{i}"] = np.asarray(series.cat.categories.astype(str), dtype=str)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            arrays[key] = series.to_numpy(dtype='datetime64[ns]')
+        elif is_nullable_integer(series):
+            # Entiers nullables: valeurs (0 si manquante) + masque des valeurs manquantes
+            arrays[key] = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+            arrays[f"m{i}"] = series.isna().to_numpy()
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            arrays[key] = series.to_numpy()
+        else:
+            # Colonnes texte: chaînes à largeur fixe + masque des valeurs manquantes
+            missing = series.isna().to_numpy()
+            arrays[key] = series.fillna('').astype(str).to_numpy(dtype=str)
+            if missing.any():
+                arrays[f"m{i}"] = missing
+
+    directory = os.path.dirname(cache_path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Écriture atomique pour éviter un cache corrompu si plusieurs workers écrivent
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, cache_path)
+
+
+def read_cache(cache_path):
+    """Reconstruction du DataFrame à partir d'un bundle .npz"""
+    with np.load(cache_path, allow_pickle=False) as bundle:
+        columns = list(bundle['__columns__'])
+        values = {}
+        for i, col in enumerate(columns):
+            array = bundle[f"c{i}"]
+            if f"k{i}" in bundle.files:
+                values[col] = pd.Series(pd.Categorical.from_codes(array, categories=bundle[f"k{i}"]))
+            elif array.dtype.kind == 'U':
+                series = pd.Series(array, dtype=object)
+                if f"m{i}" in bundle.files:
+                    series[bundle[f"m{i}"]] = np.nan
+                values[col] = series
+            elif f"m{i}" in bundle.files:
+                values[col] = pd.Series(pd.arrays.IntegerArray(array, bundle[f"m{i}"]))
+            else:
+                values[col] = pd.Series(array)
+
+    return pd.DataFrame(values, columns=columns)
+
+
+def manifest_path_for(path):
+    """Chemin du manifeste (empreinte et taille du CSV au moment de la mise en cache)"""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{stem}-v{CACHE_FORMAT_VERSION}.json")
+
+
+def read_manifest(path):
+    """Lecture du manifeste de cache ({} s'il n'existe pas)"""
+    try:
+        with open(manifest_path_for(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(path, manifest):
+    """Écriture atomique du manifeste de cache"""
+    manifest_path = manifest_path_for(path)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def purge_stale_caches(path, *fingerprints):
+    """Supprimer les caches du même fichier source construits pour d'autres empreintes,
+    ainsi que ses manifestes des anciennes versions du format"""
+    directory = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    if not os.path.isdir(directory):
+        return
+    stem = os.path.splitext(os.path.basename(path))[0]
+    current = tuple(f"{stem}-v{CACHE_FORMAT_VERSION}-{fp}-" for fp in fingerprints if fp)
+    manifest = re.compile(rf"{re.escape(stem)}-v(\d+)\.json$")
+    for name in os.listdir(directory):
+        old_manifest = manifest.match(name)
+        if (name.endswith('.npz') and name.startswith(f"{stem}-v") and not name.startswith(current)) or \
+                (old_manifest and int(old_manifest.group(1)) != CACHE_FORMAT_VERSION):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+class DatasetVersion(namedtuple('DatasetVersion', ['fingerprint', 'rows', 'max_date'])):
+    """Version du dataset: empreinte du contenu, nombre de lignes et dernière date
+
+    Calculée une fois au chargement, elle sert de clé (avec les paramètres) à tous les
+    artefacts dérivés: statistiques, tables de forme, features, modèles, prédictions.
+    """
+    __slots__ = ()
+
+    @property
+    def key(self):
+        """Clé texte courte (noms de fichiers, signatures)"""
+        return f"{self.fingerprint[:16]}-{self.rows}-{self.max_date}"
+
+
+def dataset_version(fingerprint, core):
+    """Version d'un dataset à partir de son empreinte et de ses colonnes principales"""
+    max_date = core['Date'].max() if len(core) else None
+    return DatasetVersion(fingerprint, len(core), f"{max_date:%Y-%m-%d}" if pd.notna(max_date) else '')
+
+
+def normalize_team_name(name):
+    """Clé de comparaison d'un nom d'équipe (casse, points, tirets et espaces ignorés)"""
+    return re.sub(r'[\s.\-]+', ' ', str(name)).strip().casefold()
+
+
+class TeamRegistry:
+    """Identifiants entiers stables des équipes, variantes d'orthographe comprises
+
+    names[i] est le nom canonique de l'équipe d'identifiant i. Un nom inconnu reçoit
+    l'identifiant suivant; les identifiants existants ne changent jamais, ils restent donc
+    valides quelle que soit la sélection de saisons ou de fichiers.
+    """
+
+    def __init__(self, names=(), aliases=None, path=None):
+        self.path = path
+        self.names = []
+        self.aliases = dict(TEAM_ALIASES if aliases is None else aliases)
+        self._alias_keys = {normalize_team_name(alias): team for alias, team in self.aliases.items()}
+        self._ids = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        for name in names:
+            self.intern(name)
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path, aliases=None):
+        """Registre persisté (vide si le fichier n'existe pas)
+
+        Les alias du code (TEAM_ALIASES, ou aliases) priment sur ceux du fichier. S'ils ont
+        changé depuis l'enregistrement, les noms enregistrés sont réinternés dans leur ordre
+        d'origine avec la nouvelle table (deux équipes fusionnées partagent alors un
+        identifiant) et le registre sera réécrit à la prochaine sauvegarde.
+        """
+        aliases = TEAM_ALIASES if aliases is None else aliases
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            registry = cls(saved['teams'], {**saved['aliases'], **aliases}, path)
+        except (OSError, ValueError, KeyError):
+            return cls(aliases=aliases, path=path)
+        registry._dirty = registry.aliases != saved['aliases'] or registry.names != saved['teams']
+        return registry
+
+    def save(self, path=None):
+        """Écriture atomique du registre (seulement s'il a changé)"""
+        path = path or self.path
+        if path is None or not self._dirty:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'teams': self.names, 'aliases': self.aliases}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, path)
+            self._dirty = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def _key(self, name):
+        key = normalize_team_name(name)
+        alias = self._alias_keys.get(key)
+        return normalize_team_name(alias) if alias is not None else key
+
+    def canonical(self, name):
+        """Nom canonique d'une équipe (le nom lui-même s'il est inconnu)"""
+        team_id = self.lookup(name)
+        return self.names[team_id] if team_id is not None else self._alias_keys.get(normalize_team_name(name), name)
+
+    def lookup(self, name):
+        """Identifiant d'une équipe ou d'un de ses alias (None si inconnue)"""
+        return self._ids.get(self._key(name))
+
+    def intern(self, name):
+        """Identifiant d'une équipe, attribué au premier passage"""
+        key = self._key(name)
+        team_id = self._ids.get(key)
+        if team_id is not None:
+            return team_id
+        with self._lock:
+            if key not in self._ids:
+                # Le nom canonique est celui de la table d'alias, sinon la première orthographe vue
+                self._ids[key] = len(self.names)
+                self.names.append(self._alias_keys.get(normalize_team_name(name), str(name).strip()))
+                self._dirty = True
+            return self._ids[key]
+
+    def encode(self, values):
+        """Identifiants (int32) d'une série de noms, -1 pour les valeurs manquantes"""
+        if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            ids = np.array([self.intern(name) for name in values.cat.categories], dtype=np.int32)
+        else:
+            codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+            ids = np.array([self.intern(name) for name in uniques], dtype=np.int32)
+        # Un seul passage par nom distinct, puis indexation vectorisée
+        return np.where(codes >= 0, ids[np.maximum(codes, 0)] if len(ids) else -1, -1).astype(np.int32)
+
+    def categories(self):
+        """Vocabulaire ordonné par identifiant (codes des catégories = identifiants)"""
+        return pd.Index(list(self.names), dtype=object)
+
+    def apply(self, values):
+        """Colonne d'équipes en catégories dont les codes sont les identifiants du registre"""
+        ids = self.encode(values)
+        return pd.Categorical.from_codes(ids, categories=self.categories())
+
+
+# Registres partagés par les tables d'un même dossier
+_REGISTRIES = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def registry_path_for(path):
+    """Chemin du registre des équipes d'un CSV ou d'un dossier de CSV"""
+    directory = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    return os.path.join(os.path.abspath(directory), CACHE_DIR_NAME, 'teams.json')
+
+
+def team_registry(path):
+    """Registre des équipes persisté à côté des données (une instance par dossier)"""
+    registry_path = registry_path_for(path)
+    with _REGISTRIES_LOCK:
+        if registry_path not in _REGISTRIES:
+            _REGISTRIES[registry_path] = TeamRegistry.load(registry_path)
+        return _REGISTRIES[registry_path]
+
+
+def team_ids(values, registry=None):
+    """Identifiants entiers des équipes d'une colonne (codes du registre si déjà appliqué)"""
+    if registry is None and isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy()
+    return (registry or TeamRegistry()).encode(values)
+
+
+class MatchTable:
+    """Dataset découpé en groupes de colonnes chargés au premier accès
+
+    Chaque groupe est lu depuis son propre cache .npz ou, à défaut, depuis le CSV
+    en ne parsant que ses colonnes. Toutes les vues partagent le même index de lignes.
+    Quand le CSV a seulement reçu de nouvelles lignes (ajout en fin de fichier),
+    seules ces lignes sont parsées; elles sont écrites dans un nouveau morceau du
+    cache (le cache existant n'est pas réécrit, sauf compactage au-delà de
+    MAX_CACHE_CHUNKS morceaux). Les équipes sont codées avec le registre du dossier.
+    validator(groupe, colonnes) contrôle chaque groupe chargé ou complété par refresh();
+    les rapports sont conservés dans reports (voir football_validation.validate_group).
+    """
+
+    def __init__(self, path, use_cache=True, registry=None, validator=None):
+        self.path = path
+        self.use_cache = use_cache
+        if registry is None:
+            registry = team_registry(path) if use_cache else TeamRegistry()
+        self.registry = registry
+        self.validator = validator
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._version = None
+        self._open()
+
+    def _open(self):
+        path = self.path
+        self.encoding = sniff_encoding(path)
+        header = canonical_columns(read_header(path, self.encoding)).values()
+        self.columns = split_columns(header)
+        self.size, self.mtime = file_stamp(path)
+        # Morceaux du cache par groupe: [[empreinte, taille du CSV]] du plus ancien au plus récent
+        self.chunks = {}
+        self._frames = {}
+        self.reports = {}
+
+        if not self.use_cache:
+            self.fingerprint = file_fingerprint(path)
+            return
+
+        manifest = read_manifest(path)
+        if self.mtime is not None and [manifest.get('size'), manifest.get('mtime')] == [self.size, self.mtime]:
+            # Fichier non modifié depuis la mise en cache: pas de relecture pour l'empreinte
+            appended, fingerprint = False, manifest.get('fingerprint')
+        else:
+            # Ajout de lignes depuis la dernière mise en cache ?
+            appended, fingerprint = is_append_of(path, manifest.get('fingerprint'), manifest.get('size'))
+        self.fingerprint = fingerprint or file_fingerprint(path)
+
+        if appended or manifest.get('fingerprint') == self.fingerprint:
+            # Chaque morceau couvre un préfixe du fichier actuel: il reste valable
+            self.chunks = manifest.get('chunks', {})
+
+        purge_stale_caches(path, self.fingerprint, *self._chunk_fingerprints())
+
+    def loaded_groups(self):
+        """Groupes déjà matérialisés en mémoire"""
+        return [name for name in COLUMN_GROUPS if name in self._frames]
+
+    @property
+    def version(self):
+        """Version courante du dataset (recalculée seulement quand l'empreinte change)"""
+        if self._version is None or self._version.fingerprint != self.fingerprint:
+            self._version = dataset_version(self.fingerprint, self.group('core'))
+        return self._version
+
+    def group(self, name):
+        """Colonnes d'un groupe (chargées au premier accès puis gardées en mémoire)"""
+        if name not in self.columns:
+            raise KeyError(f"Groupe de colonnes inconnu: {name}")
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = self._load_group(name)
+                self._validate(name)
+            return self._frames[name]
+
+    def frame(self, *names):
+        """Groupe principal + groupes demandés réunis dans un seul DataFrame"""
+        names = ['core'] + [name for name in names if name != 'core']
+        frames = [self.group(name) for name in names if self.columns[name]]
+        return pd.concat(frames, axis=1) if len(frames) > 1 else frames[0]
+
+    def validation(self):
+        """Rapports de validation des groupes chargés {groupe: rapport}"""
+        return dict(self.reports)
+
+    def _validate(self, name):
+        """Contrôle d'un groupe chargé ou complété (sans validator: aucun rapport)"""
+        if self.validator is not None and len(self._frames[name].columns):
+            self.reports[name] = self.validator(name, self._frames[name])
+
+    def subscribe(self, callback):
+        """Abonnement aux deltas publiés par refresh() (callback(delta))"""
+        self._listeners.append(callback)
+
+    def refresh(self):
+        """Prise en compte des modifications du CSV
+
+        Renvoie le delta {groupe: nouvelles lignes} pour les groupes déjà chargés
+        ({} si rien n'a changé), ou None si le fichier a été réécrit et que tout
+        doit être recalculé. Le delta est aussi transmis aux abonnés, hors du verrou.
+        """
+        delta = self._refresh()
+        if delta != {}:
+            for callback in self._listeners:
+                callback(delta)
+        return delta
+
+    def _refresh(self):
+        with self._lock:
+            stamp = file_stamp(self.path)
+            if stamp[1] is not None and stamp == (self.size, self.mtime):
+                # Même taille et même date de modification: rien à relire ni à hacher
+                return {}
+            appended, fingerprint = is_append_of(self.path, self.fingerprint, self.size)
+            if not appended:
+                fingerprint = fingerprint or file_fingerprint(self.path)
+                if fingerprint == self.fingerprint:
+                    # Fichier touché sans changement de contenu
+                    self.mtime = stamp[1]
+                    return {}
+                # Modification autre qu'un ajout: rechargement complet
+                self._open()
+                return None
+
+            offset = self.size
+            self.fingerprint = fingerprint
+            self.size, self.mtime = stamp
+
+            delta = {}
+            for name, frame in list(self._frames.items()):
+                if not len(frame.columns):
+                    continue
+                merged = self._merge_tail(name, frame, offset)
+                self._frames[name] = merged
+                self._validate(name)
+                delta[name] = merged.iloc[len(frame):]
+                self._save_tail(name, merged, len(frame))
+
+            return delta
+
+    def _merge_tail(self, name, frame, offset):
+        """Ajout des lignes situées après offset à un groupe déjà chargé"""
+        tail = compact_matches(parse_dataset(self.path, self.columns[name], self.encoding, offset), self.registry)
+        tail.index = pd.RangeIndex(len(frame), len(frame) + len(tail))
+        return concat_matches([frame, tail], self.registry)
+
+    def _chunk_fingerprints(self):
+        return {fingerprint for chunks in self.chunks.values() for fingerprint, _ in chunks}
+
+    def _save_tail(self, name, data, start):
+        """Mise en cache des lignes data[start:] d'un groupe: nouveau morceau ou, au-delà de
+        MAX_CACHE_CHUNKS morceaux (ou sans cache existant), réécriture du groupe entier"""
+        chunks = self.chunks.get(name, [])
+        if start == 0 or not chunks or len(chunks) >= MAX_CACHE_CHUNKS:
+            chunks, start = [], 0
+        elif start == len(data):
+            return
+        self._save(name, data.iloc[start:], chunks + [[self.fingerprint, self.size]])
+        if start == 0:
+            purge_stale_caches(self.path, self.fingerprint, *self._chunk_fingerprints())
+
+    def _save(self, name, data, chunks):
+        if not self.use_cache:
+            return
+        try:
+            self.registry.save()
+            save_cache(data, cache_path_for(self.path, self.fingerprint, name))
+            self.chunks[name] = chunks
+            write_manifest(self.path, {'fingerprint': self.fingerprint, 'size': self.size, 'mtime': self.mtime,
+                                       'chunks': self.chunks})
+        except OSError:
+            # Dossier en lecture seule: le cache est optionnel
+            pass
+
+    def _read_chunks(self, name):
+        """Groupe reconstitué à partir des morceaux de son cache (None si aucun)"""
+        chunks = self.chunks.get(name)
+        if not chunks:
+            return None
+        frames = [read_cache(cache_path_for(self.path, fingerprint, name)) for fingerprint, _ in chunks]
+        data = self._with_registry(concat_matches(frames, self.registry) if len(frames) > 1 else frames[0])
+        data.index = pd.RangeIndex(len(data))
+        return data, chunks[-1][1]
+
+    def _load_group(self, name):
+        columns = self.columns[name]
+        if not columns:
+            return pd.DataFrame()
+
+        if self.use_cache:
+            try:
+                cached = self._read_chunks(name)
+            except Exception:
+                # Cache illisible: on reconstruit à partir du CSV
+                cached = None
+            if cached is not None:
+                data, size = cached
+                if size < self.size:
+                    # Lignes ajoutées au CSV depuis le dernier morceau
+                    rows = len(data)
+                    data = self._merge_tail(name, data, size)
+                    self._save_tail(name, data, rows)
+                return data
+
+        data = compact_matches(parse_dataset(self.path, columns, self.encoding), self.registry)
+        self._save_tail(name, data, 0)
+        return data
+
+    def _with_registry(self, data):
+        """Recodage des équipes d'un cache avec le registre courant (vocabulaire seulement)"""
+        for col in TEAM_COLUMNS:
+            if col in data.columns:
+                data[col] = self.registry.apply(data[col])
+        return data
+
+
+def delta_frame(delta, *names):
+    """Nouvelles lignes d'un delta de refresh(): groupe principal + groupes demandés réunis"""
+    frames = [delta[name] for name in ['core'] + [name for name in names if name != 'core'] if name in delta]
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1) if len(frames) > 1 else frames[0]
+
+
+def concat_matches(frames, registry=None):
+    """Concaténation en conservant des catégories communes (équipes comprises)
+
+    Avec un registre, le vocabulaire des équipes est celui du registre (codes = identifiants).
+    """
+    frames = [frame for frame in frames if len(frame.columns) > 0]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    categorical = {
+        col for frame in frames for col in frame.columns
+        if isinstance(frame[col].dtype, pd.CategoricalDtype)
+    }
+    # Les colonnes d'équipes partagent un seul vocabulaire
+    vocabularies = {}
+    for col in categorical:
+        key = 'teams' if col in TEAM_COLUMNS else col
+        members = TEAM_COLUMNS if key == 'teams' else [col]
+        if key == 'teams' and registry is not None:
+            vocabularies[key] = registry.categories()
+        elif key not in vocabularies:
+            values = [
+                frame[member].cat.categories for frame in frames for member in members
+                if member in frame.columns and isinstance(frame[member].dtype, pd.CategoricalDtype)
+            ]
+            vocabularies[key] = pd.Index(np.concatenate(values) if values else []).unique().sort_values()
+
+    aligned = []
+    for frame in frames:
+        frame = frame.copy()
+        for col in categorical & set(frame.columns):
+            key = 'teams' if col in TEAM_COLUMNS else col
+            frame[col] = pd.Categorical(frame[col], categories=vocabularies[key])
+        aligned.append(frame)
+
+    return pd.concat(aligned)
+
+
+class MatchDirectory:
+    """Dossier de fichiers football-data (plusieurs divisions et saisons) lus en parallèle
+
+    Même interface que MatchTable: chaque groupe de colonnes est chargé au premier accès,
+    fichier par fichier dans un pool de threads, puis concaténé avec un index global stable:
+    chaque fichier reçoit une étendue fixe (n° du fichier × FILE_ROW_SPAN + ligne), que les
+    autres fichiers grandissent ou non. refresh() ajoute les nouvelles lignes en fin de groupe.
+    """
+
+    def __init__(self, directory, max_workers=None, use_cache=True, pattern='*.csv', validator=None):
+        self.directory = directory
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.pattern = pattern
+        # Contrôle des groupes réunis (doublons entre fichiers compris), pas fichier par fichier
+        self.validator = validator
+        # Un seul registre pour tous les fichiers: mêmes identifiants d'une ligue/saison à l'autre
+        self.registry = team_registry(directory) if use_cache else TeamRegistry()
+        self.offsets = {}
+        self.tables = self._open_tables(self._paths())
+        self._update_columns()
+        self._frames = {}
+        self.reports = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._version = None
+
+    def _paths(self):
+        return sorted(glob(os.path.join(self.directory, self.pattern)))
+
+    def _open_tables(self, paths):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            tables = list(pool.map(lambda path: MatchTable(path, self.use_cache, self.registry), paths))
+        # Début de l'index de chaque fichier, attribué une fois dans l'ordre d'arrivée
+        for table in tables:
+            self.offsets.setdefault(table.path, len(self.offsets) * FILE_ROW_SPAN)
+        return tables
+
+    def _index(self, table, rows):
+        """Index global de lignes locales d'un fichier"""
+        if len(rows) and rows[-1] >= FILE_ROW_SPAN:
+            raise ValueError(f"{table.path}: plus de {FILE_ROW_SPAN} lignes")
+        return self.offsets[table.path] + pd.Index(rows)
+
+    def _update_columns(self):
+        self.columns = {name: [] for name in COLUMN_GROUPS}
+        for table in self.tables:
+            for name, columns in table.columns.items():
+                self.columns[name] += [col for col in columns if col not in self.columns[name]]
+
+    def loaded_groups(self):
+        """Groupes déjà matérialisés en mémoire"""
+        return [name for name in COLUMN_GROUPS if name in self._frames]
+
+    def group(self, name):
+        """Colonnes d'un groupe pour tous les fichiers (chargées au premier accès)"""
+        if name not in self.columns:
+            raise KeyError(f"Groupe de colonnes inconnu: {name}")
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = self._load_group(name)
+                self._validate(name)
+            return self._frames[name]
+
+    def frame(self, *names):
+        """Groupe principal + groupes demandés réunis dans un seul DataFrame"""
+        names = ['core'] + [name for name in names if name != 'core']
+        frames = [self.group(name) for name in names if self.columns[name]]
+        return pd.concat(frames, axis=1) if len(frames) > 1 else frames[0]
+
+    def partitions(self, *names):
+        """Matchs partitionnés par (Div, Season)"""
+        return PartitionedMatches.from_frame(self.frame(*names))
+
+    @property
+    def fingerprint(self):
+        """Empreinte du dossier (combinaison des empreintes des fichiers)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for table in sorted(self.tables, key=lambda table: table.path):
+            digest.update(f"{os.path.basename(table.path)}:{table.fingerprint};".encode())
+        return digest.hexdigest()
+
+    @property
+    def version(self):
+        """Version courante du dossier (recalculée seulement quand un fichier change)"""
+        fingerprint = self.fingerprint
+        if self._version is None or self._version.fingerprint != fingerprint:
+            self._version = dataset_version(fingerprint, self.group('core'))
+        return self._version
+
+    def validation(self):
+        """Rapports de validation des groupes chargés {groupe: rapport}"""
+        return dict(self.reports)
+
+    def _validate(self, name):
+        """Contrôle d'un groupe chargé ou complété (sans validator: aucun rapport)"""
+        if self.validator is not None and len(self._frames[name].columns):
+            self.reports[name] = self.validator(name, self._frames[name])
+
+    def subscribe(self, callback):
+        """Abonnement aux deltas publiés par refresh() (callback(delta))"""
+        self._listeners.append(callback)
+
+    def refresh(self):
+        """Prise en compte des fichiers complétés ou ajoutés au dossier
+
+        Seules les nouvelles lignes sont parsées et ajoutées aux groupes chargés. Renvoie le
+        delta {groupe: nouvelles lignes} (index global stable: les lignes déjà connues gardent
+        leur index), {} si rien n'a changé, ou None si un fichier a été réécrit ou supprimé.
+        Les abonnés sont appelés hors du verrou (ils peuvent relire les groupes).
+        """
+        delta = self._refresh()
+        if delta != {}:
+            for callback in self._listeners:
+                callback(delta)
+        return delta
+
+    def _refresh(self):
+        with self._lock:
+            paths = self._paths()
+            if not set(table.path for table in self.tables) <= set(paths):
+                # Fichier supprimé: nouveaux index à partir de zéro
+                self.offsets = {}
+                self.tables = self._open_tables(paths)
+                self._update_columns()
+                self._frames = {}
+                self.reports = {}
+                return None
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                deltas = list(pool.map(lambda table: table.refresh(), self.tables))
+            known = set(self.offsets)
+            added = self._open_tables([path for path in paths if path not in known])
+
+            if all(delta == {} for delta in deltas) and not added:
+                return {}
+
+            tables = self.tables
+            self.tables = tables + added
+            self._update_columns()
+            if any(delta is None for delta in deltas):
+                self._frames = {}
+                self.reports = {}
+                return None
+
+            # Lignes ajoutées: index local (après les lignes déjà chargées) décalé de l'étendue du fichier
+            delta = {}
+            for name, frame in list(self._frames.items()):
+                parts = []
+                for table, table_delta in zip(tables, deltas):
+                    rows = table_delta.get(name, table_delta.get('core')) if table_delta else None
+                    if rows is not None and len(rows):
+                        parts.append(self._aligned(table, rows, table_delta.get(name)))
+                for table in added:
+                    parts.append(self._aligned(table, table.group('core'), table.group(name)))
+                merged = concat_matches([frame] + parts, self.registry)
+                self._frames[name] = merged
+                self._validate(name)
+                delta[name] = merged.iloc[len(frame):]
+            return delta
+
+    def _aligned(self, table, rows, frame):
+        """Lignes d'un fichier (frame, ou index seul si le fichier n'a pas ces colonnes) à l'index global"""
+        index = self._index(table, rows.index)
+        return frame.set_axis(index) if frame is not None and len(frame.columns) else pd.DataFrame(index=index)
+
+    def _load_group(self, name):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            frames = list(pool.map(lambda table: table.group(name), self.tables))
+
+        # Index global: étendue fixe de chaque fichier (n° × FILE_ROW_SPAN) + ligne
+        aligned = [self._aligned(table, table.group('core'), frame) for table, frame in zip(self.tables, frames)]
+        return concat_matches(aligned, self.registry)
+
+
+class PartitionedMatches:
+    """Matchs répartis par (Div, Season): une sélection ne touche que les partitions concernées"""
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+
+    @classmethod
+    def from_frame(cls, data):
+        """Découpage d'un DataFrame en partitions (Div, Season)"""
+        if len(data) == 0:
+            return cls({})
+        groups = data.groupby(['Div', 'Season'], observed=True, sort=True).indices
+        partitions = {}
+        for (div, season), positions in groups.items():
+            if positions[-1] - positions[0] + 1 == len(positions):
+                # Partition contiguë: tranche sans copie (ex. tableaux partagés triés)
+                partitions[(str(div), str(season))] = data.iloc[positions[0]:positions[-1] + 1]
+            else:
+                partitions[(str(div), str(season))] = data.iloc[positions]
+        return cls(partitions)
+
+    def __len__(self):
+        return sum(len(part) for part in self.partitions.values())
+
+    def divisions(self):
+        """Divisions disponibles"""
+        return sorted({div for div, _ in self.partitions})
+
+    def seasons(self, divisions=None):
+        """Saisons disponibles (éventuellement pour certaines divisions)"""
+        return sorted({
+            season for div, season in self.partitions
+            if divisions is None or div in divisions
+        })
+
+    def select(self, seasons=None, divisions=None):
+        """Matchs des seules partitions correspondant à la sélection
+
+        Une seule partition: elle est renvoyée telle quelle (vue sans copie si elle est
+        contiguë). Plusieurs partitions: nouveau DataFrame (concaténation copiée puis triée
+        par index); les applications le gardent donc en cache par sélection.
+        """
+        keys = [
+            key for key in self.partitions
+            if (seasons is None or key[1] in seasons) and (divisions is None or key[0] in divisions)
+        ]
+        if not keys:
+            any_part = next(iter(self.partitions.values()), pd.DataFrame())
+            return any_part.iloc[0:0]
+        if len(keys) == 1:
+            return self.partitions[keys[0]]
+        return pd.concat([self.partitions[key] for key in keys]).sort_index()
+
+
+def open_matches(path, max_workers=None, use_cache=True, validator=None):
+    """Fichier CSV unique (MatchTable) ou dossier de fichiers football-data (MatchDirectory)"""
+    if os.path.isdir(path):
+        return MatchDirectory(path, max_workers=max_workers, use_cache=use_cache, validator=validator)
+    return MatchTable(path, use_cache, validator=validator)
+
+
+def load_matches(path, use_cache=True):
+    """Chargement du dataset compact complet (tous les groupes de colonnes)"""
+    return MatchTable(path, use_cache).frame(*COLUMN_GROUPS)
+
+
+def open_dataset(paths=DATASET_PATHS, validator=None):
+    """Dataset des applications: dossier FOOTBALL_DATA_DIR si configuré, sinon premier CSV
+    existant parmi paths (None si aucun). Les groupes de colonnes sont lus au premier accès."""
+    data_dir = os.environ.get('FOOTBALL_DATA_DIR')
+    if data_dir and os.path.isdir(data_dir):
+        return open_matches(data_dir, validator=validator)
+    for path in paths:
+        if os.path.exists(path):
+            return open_matches(path, validator=validator)
+    return None
+
+
+def shared_matches(table, shared_dir=None):
+    """Colonnes principales + statistiques en tableaux .npy mappés partagés entre processus
+
+    shared_dir: dossier partagé (par défaut la variable FOOTBALL_SHARED_DIR; None si non configuré).
+    Le premier processus exporte la version courante du dataset, les suivants s'y attachent.
+    """
+    # football_store importe ce module: import au premier appel
+    from football_store import attach_shared_arrays, export_shared_arrays
+
+    shared_dir = shared_dir or os.environ.get('FOOTBALL_SHARED_DIR')
+    if not shared_dir or table is None:
+        return None
+    key = table.version.key
+    data = attach_shared_arrays(shared_dir, key)
+    if data is None:
+        os.makedirs(shared_dir, exist_ok=True)
+        export_shared_arrays(table.frame('match_stats'), shared_dir, key)
+        data = attach_shared_arrays(shared_dir, key)
+    return data
+
+
+def season_cube(data, table=None):
+    """Cube (équipe, saison, terrain) des matchs, tenu à jour par les lignes ajoutées au CSV
+
+    Le cube est abonné aux deltas de table.refresh(): pas de recalcul complet.
+    """
+    cube = SeasonCube.from_frame(data)
+    if table is not None:
+        table.subscribe(lambda delta: cube.apply(delta_frame(delta, 'match_stats')) if delta else None)
+    return cube
+
+
+def refresh_dataset(table, cube=None, loaders=()):
+    """Prise en compte des modifications du CSV (bouton « Actualiser » des applications)
+
+    Les lignes ajoutées passent dans le cube par l'abonnement de season_cube(); pour un fichier
+    réécrit (ex. résultats corrigés), seules les lignes modifiées y passent (SeasonCube.update).
+    loaders: chargeurs mis en cache (méthode clear()) vidés si le dataset a changé.
+    Renvoie True si le dataset a changé.
+    """
+    if table is None:
+        return False
+    previous = table.frame('match_stats') if cube is not None else None
+    delta = table.refresh()
+    if delta is None and cube is not None:
+        cube.update(previous, table.frame('match_stats'))
+    if delta == {}:
+        return False
+    for loader in loaders:
+        loader.clear()
+    return True
@@ -0,0 +1,813 @@
+"""
+🧮 FOOTBALL FEATURES - Tables de features précalculées
+=======================================================
+Vue longue (une ligne par équipe et par match, triée par équipe puis par date) et
+tables construites une fois dessus par sommes cumulées vectorisées (sans dépendance
+à Streamlit): une recherche (équipe, date, N) devient une recherche dichotomique
+au lieu d'un tri et d'un filtrage de tout le dataset.
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+
+def team_codes(data):
+    """Codes entiers communs à HomeTeam / AwayTeam et vocabulaire des équipes"""
+    home, away = data['HomeTeam'], data['AwayTeam']
+    if (isinstance(home.dtype, pd.CategoricalDtype) and isinstance(away.dtype, pd.CategoricalDtype)
+            and home.cat.categories.equals(away.cat.categories)):
+        # Catégories du registre d'équipes: les codes sont déjà communs
+        return home.cat.codes.to_numpy(), away.cat.codes.to_numpy(), pd.Index(home.cat.categories).astype(str)
+    values = np.concatenate([home.astype(object).to_numpy(), away.astype(object).to_numpy()])
+    codes, uniques = pd.factorize(values)
+    return codes[:len(data)], codes[len(data):], pd.Index(uniques).astype(str)
+
+
+def date_values(dates):
+    """Dates en entiers (nanosecondes), NaT -> valeur minimale d'int64"""
+    return pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[ns]').view('int64')
+
+
+def date_value(date):
+    """Une date (Timestamp, chaîne...) en nanosecondes"""
+    return pd.Timestamp(date).value
+
+
+class SortedKeys:
+    """Clés (groupe, rang de la date) d'une vue triée par groupe puis par date
+
+    Une seule recherche dichotomique globale répond à un lot de requêtes (groupe, date).
+    """
+
+    def __init__(self, groups, dates):
+        self.dates, ranks = np.unique(dates, return_inverse=True)
+        self.span = len(self.dates) + 1
+        self.keys = groups * self.span + ranks.reshape(-1)
+
+    def before(self, groups, dates):
+        """Positions de fin des lignes de chaque groupe strictement antérieures à la date"""
+        ranks = np.searchsorted(self.dates, dates, side='left')
+        return np.searchsorted(self.keys, groups * self.span + ranks, side='left')
+
+    def starts(self, groups):
+        """Positions de début de chaque groupe"""
+        return np.searchsorted(self.keys, groups * self.span, side='left')
+
+
+class LongView:
+    """Une ligne par (équipe, match), triée par équipe, date puis ordre du fichier
+
+    Colonnes (tableaux NumPy alignés): team, opponent, date (ns), home, goals_for,
+    goals_against, row (position dans le DataFrame source). Les matchs d'une équipe
+    occupent la tranche offsets[code]:offsets[code + 1].
+    """
+
+    def __init__(self, teams, columns):
+        self.teams = teams
+        self._team_positions = {team: i for i, team in enumerate(teams)}
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self.offsets = np.searchsorted(self.team, np.arange(len(teams) + 1))
+        self._keys = None
+
+    @classmethod
+    def from_frame(cls, data):
+        home_codes, away_codes, teams = team_codes(data)
+        n = len(data)
+        dates = date_values(data['Date'])
+        home_goals = data['FTHG'].to_numpy(dtype='float64', na_value=np.nan)
+        away_goals = data['FTAG'].to_numpy(dtype='float64', na_value=np.nan)
+
+        columns = {
+            'team': np.concatenate([home_codes, away_codes]).astype('int64'),
+            'opponent': np.concatenate([away_codes, home_codes]).astype('int64'),
+            'date': np.concatenate([dates, dates]),
+            'home': np.repeat([True, False], n),
+            'goals_for': np.concatenate([home_goals, away_goals]),
+            'goals_against': np.concatenate([away_goals, home_goals]),
+            'row': np.concatenate([np.arange(n), np.arange(n)]),
+        }
+        # Équipes inconnues et dates manquantes écartées
+        valid = (columns['team'] >= 0) & (columns['date'] != np.iinfo('int64').min)
+        order = np.lexsort((columns['row'][valid], columns['date'][valid], columns['team'][valid]))
+        return cls(teams, {name: values[valid][order] for name, values in columns.items()})
+
+    def __len__(self):
+        return len(self.team)
+
+    def code(self, team):
+        """Code d'une équipe (None si inconnue)"""
+        return self._team_positions.get(str(team))
+
+    def codes(self, teams):
+        """Codes d'une série d'équipes (-1 si inconnue)"""
+        return self.teams.get_indexer(pd.Index(teams).astype(str)).astype('int64')
+
+    def bounds(self, code, before=None):
+        """Tranche des matchs d'une équipe, limitée aux matchs strictement antérieurs à before"""
+        start, stop = self.offsets[code], self.offsets[code + 1]
+        if before is not None:
+            stop = start + np.searchsorted(self.date[start:stop], date_value(before), side='left')
+        return int(start), int(stop)
+
+    def ends(self, codes, dates):
+        """Fin des tranches (matchs strictement antérieurs) pour des équipes et dates vectorisées"""
+        if self._keys is None:
+            self._keys = SortedKeys(self.team, self.date)
+        return self._keys.before(codes, dates)
+
+    def results(self):
+        """Victoires, nuls et défaites (un NaN dans le score compte comme une défaite)"""
+        with np.errstate(invalid='ignore'):
+            wins = self.goals_for > self.goals_against
+            draws = self.goals_for == self.goals_against
+        return wins, draws, ~(wins | draws)
+
+
+def cumulative(values):
+    """Somme cumulée précédée de 0: la somme de [i, j) vaut cum[j] - cum[i]"""
+    cum = np.zeros(len(values) + 1, dtype=np.result_type(values, np.int64))
+    np.cumsum(values, out=cum[1:])
+    return cum
+
+
+def window(cumulatives, starts, ends, n=None):
+    """Sommes sur [début, fin) limitées aux n dernières lignes (toutes si n vaut None)"""
+    begins = starts if n is None else np.maximum(starts, ends - n)
+    return {name: cum[ends] - cum[begins] for name, cum in cumulatives.items()}
+
+
+class FormTable:
+    """Forme de toutes les équipes à chaque date de match
+
+    Sommes cumulées par équipe de points, V/N/D et buts pour / contre sur la vue longue:
+    la forme sur les N derniers matchs avant une date vaut cum[fin] - cum[fin - N],
+    la fin étant trouvée par recherche dichotomique dans la tranche de l'équipe.
+    Les buts manquants comptent pour 0.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        wins, draws, losses = view.results()
+        self.cumulative = {
+            'matches': np.arange(len(view) + 1, dtype='int64'),
+            'points': cumulative(wins * 3 + draws),
+            'wins': cumulative(wins.astype('int64')),
+            'draws': cumulative(draws.astype('int64')),
+            'losses': cumulative(losses.astype('int64')),
+            'goals_for': cumulative(np.nan_to_num(view.goals_for).astype('int64')),
+            'goals_against': cumulative(np.nan_to_num(view.goals_against).astype('int64')),
+        }
+
+    @classmethod
+    def from_frame(cls, data):
+        return cls(LongView.from_frame(data))
+
+    def _window(self, starts, ends, n):
+        return window(self.cumulative, starts, ends, n)
+
+    def last(self, team, n=5, before=None):
+        """Forme d'une équipe sur ses N derniers matchs (avant la date before si fournie)
+
+        dict: matches, points, wins, draws, losses, goals_for, goals_against.
+        """
+        code = self.view.code(team)
+        if code is None:
+            return {name: 0 for name in self.cumulative}
+        start, stop = self.view.bounds(code, before)
+        window = self._window(start, stop, n)
+        return {name: int(value) for name, value in window.items()}
+
+    def lookup(self, teams, dates, n=5):
+        """Forme avant chaque (équipe, date), vectorisée: DataFrame aligné sur les entrées"""
+        codes = self.view.codes(teams)
+        known = codes >= 0
+        safe = np.where(known, codes, 0)
+        starts = self.view.offsets[safe]
+        ends = np.where(known, self.view.ends(safe, date_values(dates)), starts)
+        return pd.DataFrame(self._window(starts, ends, n))
+
+    def rolling(self, n=5):
+        """Table complète: forme avant chaque match de chaque équipe (hors match courant)"""
+        view = self.view
+        positions = np.arange(len(view))
+        window = self._window(view.offsets[view.team], positions, n)
+        table = pd.DataFrame({
+            'team': pd.Categorical.from_codes(view.team, view.teams),
+            'Date': view.date.view('datetime64[ns]'),
+            'row': view.row,
+            'home': view.home,
+        })
+        for name, values in window.items():
+            table[name] = values
+        return table
+
+
+# Avantage domicile par défaut et bornes (en points de pourcentage), comme calculate_home_advantage_factor
+DEFAULT_HOME_ADVANTAGE = 7.0
+HOME_ADVANTAGE_RANGE = (0, 15)
+
+
+def home_advantage_factor(home_matches, home_wins, away_matches, away_wins):
+    """Écart de taux de victoire domicile / extérieur en %, borné (valeur par défaut sans historique)"""
+    home_matches, away_matches = np.asarray(home_matches), np.asarray(away_matches)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (np.asarray(home_wins) / home_matches - np.asarray(away_wins) / away_matches) * 100
+    factor = np.clip(factor, *HOME_ADVANTAGE_RANGE)
+    return np.where((home_matches == 0) | (away_matches == 0), DEFAULT_HOME_ADVANTAGE, factor)
+
+
+# Comptages du tableau d'avantage domicile, par (équipe, saison)
+HOME_ADVANTAGE_COUNTS = ['home_matches', 'home_wins', 'away_matches', 'away_wins']
+
+
+class HomeAdvantageTable:
+    """Avantage domicile de toutes les équipes, global et par fenêtre de saisons
+
+    counts[équipe, saison, comptage] (matchs et victoires à domicile / à l'extérieur) est
+    rempli en un passage par bincount; les saisons sont triées chronologiquement.
+    Une fenêtre de saisons se résout par sommes cumulées le long de l'axe des saisons.
+    """
+
+    def __init__(self, teams, seasons, counts):
+        self.teams = teams
+        self.seasons = seasons
+        self.counts = counts
+
+    @classmethod
+    def from_frame(cls, data):
+        home_codes, away_codes, teams = team_codes(data)
+        seasons = pd.Index(sorted(data['Season'].dropna().astype(str).unique()))
+        season_codes = seasons.get_indexer(data['Season'].astype(str))
+        home_goals = data['FTHG'].to_numpy(dtype='float64', na_value=np.nan)
+        away_goals = data['FTAG'].to_numpy(dtype='float64', na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            home_won, away_won = home_goals > away_goals, away_goals > home_goals
+
+        shape = (len(teams), len(seasons))
+        counts = np.zeros(shape + (len(HOME_ADVANTAGE_COUNTS),), dtype='int64')
+        for offset, codes, won in ((0, home_codes, home_won), (2, away_codes, away_won)):
+            valid = (codes >= 0) & (season_codes >= 0)
+            cells = codes[valid].astype('int64') * len(seasons) + season_codes[valid]
+            counts[..., offset] = np.bincount(cells, minlength=shape[0] * shape[1]).reshape(shape)
+            counts[..., offset + 1] = np.bincount(cells, weights=won[valid], minlength=shape[0] * shape[1]).reshape(shape)
+        return cls(teams, seasons, counts)
+
+    def factors(self):
+        """Avantage domicile de chaque équipe sur tout l'historique (Series indexée par équipe)"""
+        totals = self.counts.sum(axis=1)
+        return pd.Series(home_advantage_factor(*totals.T), index=self.teams, name='home_advantage')
+
+    def factor(self, team):
+        """Avantage domicile d'une équipe (valeur par défaut si inconnue)"""
+        position = self.teams.get_indexer([str(team)])[0]
+        if position < 0:
+            return DEFAULT_HOME_ADVANTAGE
+        return float(home_advantage_factor(*self.counts[position].sum(axis=0)))
+
+    def windowed(self, window=3, include_current=False):
+        """Avantage domicile par (équipe, saison) sur les window saisons précédentes
+
+        Avec include_current=False (défaut), la saison elle-même est exclue: la valeur est
+        celle qui s'appliquait au début de la saison, sans information future.
+        DataFrame: index équipes, colonnes saisons.
+        """
+        cum = np.concatenate([np.zeros_like(self.counts[:, :1]), self.counts.cumsum(axis=1)], axis=1)
+        ends = np.arange(len(self.seasons)) + (1 if include_current else 0)
+        sums = cum[:, ends] - cum[:, np.maximum(ends - window, 0)]
+        return pd.DataFrame(home_advantage_factor(*np.moveaxis(sums, -1, 0)),
+                            index=self.teams, columns=self.seasons)
+
+    def at(self, teams, seasons, window=3, include_current=False):
+        """Avantage domicile applicable à des (équipe, saison) vectorisés (valeur par défaut si inconnus)"""
+        table = self.windowed(window, include_current).to_numpy()
+        codes = self.teams.get_indexer(pd.Index(teams).astype(str))
+        season_codes = self.seasons.get_indexer(pd.Index(seasons).astype(str))
+        known = (codes >= 0) & (season_codes >= 0)
+        return np.where(known, table[np.where(known, codes, 0), np.where(known, season_codes, 0)],
+                        DEFAULT_HOME_ADVANTAGE)
+
+
+class AsOfStore:
+    """Features à une date donnée, sans fuite d'information
+
+    État cumulé par équipe (totaux, forme, bilan domicile / extérieur) et par paire
+    ordonnée (équipe, adversaire) pour les confrontations, trié par date: l'état avant
+    une date se lit par recherche dichotomique, les matchs du jour même étant exclus.
+    features() matérialise les features de tout un lot de matchs en un appel vectorisé.
+    """
+
+    def __init__(self, form):
+        self.form = form
+        view = self.view = form.view
+        wins, draws, losses = view.results()
+        self.venue_cumulative = {
+            'home_matches': cumulative(view.home.astype('int64')),
+            'home_wins': cumulative((view.home & wins).astype('int64')),
+            'away_matches': cumulative((~view.home).astype('int64')),
+            'away_wins': cumulative((~view.home & wins).astype('int64')),
+        }
+
+        # Vue des confrontations: triée par (équipe, adversaire, date)
+        order = np.lexsort((view.row, view.date, view.opponent, view.team))
+        self.pairs = SortedKeys(view.team[order] * len(view.teams) + view.opponent[order], view.date[order])
+        self.pair_cumulative = {name: cumulative(np.diff(cum)[order]) for name, cum in form.cumulative.items()}
+
+    @classmethod
+    def from_frame(cls, data):
+        return cls(FormTable.from_frame(data))
+
+    def _team_windows(self, codes, dates, n):
+        view = self.view
+        starts = view.offsets[codes]
+        ends = view.ends(codes, dates) if dates is not None else view.offsets[codes + 1]
+        totals = window(self.form.cumulative, starts, ends)
+        totals.update(window(self.venue_cumulative, starts, ends))
+        recent = window(self.form.cumulative, starts, ends, n)
+        totals.update({f"form_{name}": values for name, values in recent.items()})
+        totals['home_advantage'] = home_advantage_factor(
+            totals['home_matches'], totals['home_wins'], totals['away_matches'], totals['away_wins'])
+        return totals
+
+    def _pair_windows(self, codes, opponents, dates, n):
+        groups = codes * len(self.view.teams) + opponents
+        starts = self.pairs.starts(groups)
+        ends = self.pairs.before(groups, dates) if dates is not None else self.pairs.starts(groups + 1)
+        return window(self.pair_cumulative, starts, ends, n)
+
+    def state(self, team, before=None, n=5):
+        """État d'une équipe avant une date (tout l'historique si before vaut None)
+
+        dict: totaux (matches, points, wins, draws, losses, goals_for, goals_against),
+        bilan par terrain (home_matches, home_wins, away_matches, away_wins),
+        home_advantage et forme sur les n derniers matchs (form_*).
+        """
+        code = self.view.code(team)
+        if code is None:
+            code = -1
+        return self._scalar(self._lookup(self._team_windows, [code], before, n))
+
+    def head_to_head(self, team, opponent, before=None, last_n=10):
+        """Confrontations d'une équipe contre une autre avant une date (les last_n dernières)
+
+        dict du point de vue de team: matches, points, wins, draws, losses, goals_for, goals_against.
+        """
+        codes = self.view.codes([team, opponent])
+        return self._scalar(self._lookup(self._pair_windows, codes[:1], before, last_n, codes[1:]))
+
+    def _lookup(self, windows, codes, before, n, opponents=None):
+        codes = np.asarray(codes, dtype='int64')
+        known = codes >= 0 if opponents is None else (codes >= 0) & (opponents >= 0)
+        safe = np.where(known, codes, 0)
+        dates = None if before is None else date_values(np.broadcast_to(before, codes.shape))
+        args = (safe,) if opponents is None else (safe, np.where(known, opponents, 0))
+        result = windows(*args, dates, n)
+        for name, values in result.items():
+            default = DEFAULT_HOME_ADVANTAGE if name == 'home_advantage' else 0
+            result[name] = np.where(known, values, default)
+        return result
+
+    @staticmethod
+    def _scalar(result):
+        return {name: (float(values[0]) if name == 'home_advantage' else int(values[0]))
+                for name, values in result.items()}
+
+    def features(self, fixtures, n=5, h2h_n=10):
+        """Features avant le coup d'envoi de chaque match (colonnes HomeTeam, AwayTeam, Date)
+
+        Une ligne par match, alignée sur fixtures: état de l'équipe à domicile (home_*),
+        de l'équipe à l'extérieur (away_*) et confrontations du point de vue de
+        l'équipe à domicile (h2h_*), calculés uniquement sur les matchs antérieurs.
+        """
+        home = self.view.codes(fixtures['HomeTeam'])
+        away = self.view.codes(fixtures['AwayTeam'])
+        dates = fixtures['Date']
+        columns = {}
+        for side, codes in (('home', home), ('away', away)):
+            state = self._lookup(self._team_windows, codes, dates, n)
+            columns.update({f"{side}_{name}": values for name, values in state.items()})
+        h2h = self._lookup(self._pair_windows, home, dates, h2h_n, away)
+        columns.update({f"h2h_{name}": values for name, values in h2h.items()})
+        return pd.DataFrame(columns, index=fixtures.index)
+
+
+class PairIndex:
+    """Matchs de chaque paire d'équipes non ordonnée: positions de lignes triées par date
+
+    Une confrontation se lit par recherche dichotomique sur la clé de paire, à coût
+    proportionnel au nombre de rencontres et non à la taille du dataset. L'ordre du
+    fichier source est celui des identifiants de lignes (index entier du DataFrame, comme
+    row_id dans MatchStore), pas celui des positions: les tableaux partagés sont triés
+    par (Div, Season, Date) mais gardent l'index d'origine.
+    """
+
+    def __init__(self, teams, keys, rows, row_ids=None):
+        self.teams = teams
+        self.keys = keys
+        self.rows = rows
+        self.row_ids = row_ids
+
+    @classmethod
+    def from_frame(cls, data):
+        home_codes, away_codes, teams = team_codes(data)
+        home_codes, away_codes = home_codes.astype('int64'), away_codes.astype('int64')
+        keys = np.minimum(home_codes, away_codes) * len(teams) + np.maximum(home_codes, away_codes)
+        dates = date_values(data['Date'])
+        rows = np.arange(len(data))
+        # Identifiants de lignes d'origine (index entier), sinon positions
+        row_ids = data.index.to_numpy() if pd.api.types.is_integer_dtype(data.index) else rows
+        valid = (home_codes >= 0) & (away_codes >= 0)
+        order = np.lexsort((row_ids[valid], dates[valid], keys[valid]))
+        return cls(teams, keys[valid][order], rows[valid][order], row_ids)
+
+    def positions(self, team_a, team_b, last_n=None, order='Date'):
+        """Positions des confrontations (les last_n plus récentes), par date ou dans l'ordre du fichier source"""
+        codes = self.teams.get_indexer([str(team_a), str(team_b)])
+        if (codes < 0).any():
+            return self.rows[:0]
+        key = codes.min() * len(self.teams) + codes.max()
+        start, stop = np.searchsorted(self.keys, [key, key + 1], side='left')
+        rows = self.rows[start:stop]
+        if order != 'Date':
+            rows = rows[np.argsort(self.row_ids[rows], kind='stable')] if self.row_ids is not None else np.sort(rows)
+        return rows[-last_n:] if last_n else rows
+
+    def matches(self, data, team_a, team_b, last_n=None, order='Date'):
+        """Confrontations entre deux équipes (quel que soit le terrain), comme MatchStore.pair_matches"""
+        return data.iloc[self.positions(team_a, team_b, last_n, order)]
+
+
+# Mesures du tenseur des confrontations, du point de vue de l'équipe en ligne
+H2H_METRICS = ['meetings', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']
+
+
+class HeadToHeadTensor:
+    """Confrontations de toutes les paires: values[équipe, adversaire, mesure]
+
+    Construit en un passage (sommes par bincount sur les codes entiers des équipes),
+    éventuellement limité aux last_k dernières rencontres de chaque paire. Les
+    features de milliers de matchs se lisent par indexation avancée (gather()).
+    """
+
+    def __init__(self, teams, values, last_k=None):
+        self.teams = teams
+        self.values = values
+        self.last_k = last_k
+
+    @classmethod
+    def from_frame(cls, data, last_k=None, index=None):
+        """index: PairIndex de data déjà construit (sinon construit ici si last_k est fourni)
+
+        Les matchs sans score (reportés, non joués) ne comptent pas comme des rencontres.
+        """
+        home_codes, away_codes, teams = team_codes(data)
+        all_home_goals = data['FTHG'].to_numpy(dtype='float64', na_value=np.nan)
+        all_away_goals = data['FTAG'].to_numpy(dtype='float64', na_value=np.nan)
+        scored = ~np.isnan(all_home_goals) & ~np.isnan(all_away_goals)
+        rows = np.flatnonzero((home_codes >= 0) & (away_codes >= 0) & scored)
+        if last_k is not None:
+            # Rang depuis la fin de chaque paire dans l'index trié par date, matchs joués seulement
+            if index is None:
+                index = PairIndex.from_frame(data)
+            played = scored[index.rows]
+            keys, rows = index.keys[played], index.rows[played]
+            group_end = np.searchsorted(keys, keys, side='right')
+            rows = rows[group_end - np.arange(len(rows)) <= last_k]
+
+        home, away = home_codes[rows].astype('int64'), away_codes[rows].astype('int64')
+        home_goals, away_goals = all_home_goals[rows], all_away_goals[rows]
+        size = len(teams) * len(teams)
+        values = np.zeros((len(teams), len(teams), len(H2H_METRICS)), dtype='int32')
+        # Chaque match compte pour (domicile, extérieur) et pour (extérieur, domicile)
+        for team, opponent, goals_for, goals_against in ((home, away, home_goals, away_goals),
+                                                         (away, home, away_goals, home_goals)):
+            cells = team * len(teams) + opponent
+            measures = [np.ones(len(cells)), goals_for > goals_against, goals_for == goals_against,
+                        goals_for < goals_against, goals_for, goals_against]
+            for m, weights in enumerate(measures):
+                values[:, :, m] += np.bincount(cells, weights=weights, minlength=size).reshape(
+                    len(teams), len(teams)).astype('int32')
+        return cls(teams, values, last_k)
+
+    def gather(self, teams, opponents):
+        """Mesures pour des paires (équipe, adversaire) vectorisées: DataFrame (0 si équipe inconnue)"""
+        codes = self.teams.get_indexer(pd.Index(teams).astype(str))
+        opponent_codes = self.teams.get_indexer(pd.Index(opponents).astype(str))
+        known = (codes >= 0) & (opponent_codes >= 0)
+        values = self.values[np.where(known, codes, 0), np.where(known, opponent_codes, 0)]
+        values = np.where(known[:, None], values, 0)
+        return pd.DataFrame(values, columns=H2H_METRICS)
+
+    def summary(self, team, opponent):
+        """Mesures d'une paire (dict)"""
+        values = self.gather([team], [opponent]).iloc[0]
+        return {name: int(value) for name, value in values.items()}
+
+
+# Colonnes cumulées du classement (par équipe, journée après journée)
+STANDINGS_COLUMNS = ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'goal_difference', 'points']
+
+
+def dense_groups(*keys):
+    """Rang dense des n-uplets de clés (ordre lexicographique) et une ligne représentative par groupe"""
+    order = np.lexsort(keys[::-1])
+    changed = np.ones(len(order), dtype=bool)
+    changed[1:] = np.any([key[order][1:] != key[order][:-1] for key in keys], axis=0)
+    ranks = np.empty(len(order), dtype='int64')
+    ranks[order] = np.cumsum(changed) - 1
+    return ranks, order[changed]
+
+
+class Standings:
+    """Classements de toutes les divisions, à chaque journée de chaque saison
+
+    history: une ligne par (division, saison, date de match, équipe) avec les totaux
+    cumulés depuis le début de la saison et la position, triée par championnat, date
+    et position. Les totaux viennent de sommes cumulées sur une grille (championnat,
+    équipe, journée), les positions d'un lexsort unique (points, différence de buts,
+    buts marqués, puis nom). table(date) lit une tranche par championnat.
+    """
+
+    def __init__(self, history, snapshots, teams):
+        self.history = history
+        self.snapshots = snapshots
+        self.teams = teams
+        self._keys = None
+
+    @classmethod
+    def from_frame(cls, data, view=None):
+        """view: vue longue de data déjà construite (sinon construite ici)"""
+        if view is None:
+            view = LongView.from_frame(data)
+        divisions = data['Div'].astype(str).to_numpy() if 'Div' in data.columns else np.full(len(data), '')
+        league_codes, leagues = pd.factorize(
+            pd.MultiIndex.from_arrays([divisions, data['Season'].astype(str).to_numpy()]), sort=True)
+        league = league_codes[view.row].astype('int64')
+        # Matchs sans score (reportés, non joués): ni joués ni perdus
+        keep = (league >= 0) & ~np.isnan(view.goals_for) & ~np.isnan(view.goals_against)
+        wins, draws, losses = (values[keep] for values in view.results())
+        team, date, league = view.team[keep], view.date[keep], league[keep]
+        values = {
+            'played': np.ones(len(team), dtype='int64'),
+            'wins': wins, 'draws': draws, 'losses': losses,
+            'goals_for': view.goals_for[keep],
+            'goals_against': view.goals_against[keep],
+            'points': wins * 3 + draws,
+        }
+
+        # Journées (championnat, date) et membres (championnat, équipe), contigus par championnat
+        day, day_rows = dense_groups(league, date)
+        member, member_rows = dense_groups(league, team)
+        day_league, day_date = league[day_rows], date[day_rows]
+        member_league, member_team = league[member_rows], team[member_rows]
+        n_days = np.bincount(day_league, minlength=len(leagues))
+        n_members = np.bincount(member_league, minlength=len(leagues))
+        first_day = np.cumsum(n_days) - n_days
+        first_member = np.cumsum(n_members) - n_members
+
+        # Grille (championnat, équipe, journée): chaque membre occupe un bloc de n_days cases
+        block_size = n_days[member_league]
+        block_start = np.cumsum(block_size) - block_size
+        size = int(block_size.sum())
+        grid_member = np.repeat(np.arange(len(member_rows)), block_size)
+        grid_day = first_day[member_league[grid_member]] + np.arange(size) - block_start[grid_member]
+        cells = block_start[member] + day - first_day[league]
+
+        history = {}
+        for name, column in values.items():
+            totals = np.bincount(cells, weights=column, minlength=size).cumsum()
+            # Somme cumulée globale ramenée au début du bloc de chaque membre
+            before_block = np.concatenate([[0], totals])[block_start]
+            history[name] = (totals - before_block[grid_member]).astype('int32')
+        history['goal_difference'] = history['goals_for'] - history['goals_against']
+
+        # Positions: un seul lexsort par (journée, -points, -différence, -buts marqués, nom)
+        name_rank = np.argsort(np.argsort(view.teams.to_numpy()))[member_team[grid_member]]
+        order = np.lexsort((name_rank, -history['goals_for'], -history['goal_difference'],
+                            -history['points'], grid_day))
+        day_start = np.cumsum(n_members[day_league]) - n_members[day_league]
+        position = np.empty(size, dtype='int32')
+        position[order] = np.arange(size) - day_start[grid_day[order]] + 1
+
+        grid_league = member_league[grid_member]
+        table = pd.DataFrame({
+            'Div': leagues.get_level_values(0)[grid_league],
+            'Season': leagues.get_level_values(1)[grid_league],
+            'Date': day_date[grid_day].view('datetime64[ns]'),
+            'team': pd.Categorical.from_codes(member_team[grid_member], view.teams),
+            'position': position,
+            **{name: history[name] for name in STANDINGS_COLUMNS},
+        }).iloc[order].reset_index(drop=True)
+
+        snapshots = pd.DataFrame({
+            'Div': leagues.get_level_values(0)[day_league],
+            'Season': leagues.get_level_values(1)[day_league],
+            'Date': day_date.view('datetime64[ns]'),
+            'start': day_start,
+            'stop': day_start + n_members[day_league],
+        })
+        return cls(table, snapshots, view.teams)
+
+    def table(self, date=None, division=None):
+        """Classement à une date (dernière journée jouée à cette date incluse), par division
+
+        Sans date: classements actuels. Entre deux saisons, le classement final de la saison
+        précédente est renvoyé.
+        """
+        snapshots = self.snapshots
+        if division is not None:
+            snapshots = snapshots[snapshots['Div'] == str(division)]
+        if date is not None:
+            snapshots = snapshots[snapshots['Date'] <= pd.Timestamp(date)]
+        if len(snapshots) == 0:
+            return self.history.iloc[:0]
+        latest = snapshots.loc[snapshots.groupby('Div', sort=True)['Date'].idxmax()]
+        rows = np.concatenate([np.arange(start, stop) for start, stop in zip(latest['start'], latest['stop'])])
+        return self.history.iloc[rows]
+
+    def team_history(self, team, season=None):
+        """Évolution d'une équipe journée après journée (position, points...) pour les graphiques"""
+        history = self.history[self.history['team'] == str(team)]
+        if season is not None:
+            history = history[history['Season'] == str(season)]
+        return history.sort_values('Date')
+
+    def lookup(self, teams, dates):
+        """Classement de chaque équipe avant chaque date (journées strictement antérieures), vectorisé
+
+        DataFrame aligné sur les entrées: Season, position et totaux; position 0 et totaux
+        nuls quand l'équipe n'a pas encore de classement.
+        """
+        history = self.history
+        if self._keys is None:
+            self._order = np.lexsort((history['Date'].to_numpy(), history['team'].cat.codes.to_numpy()))
+            self._keys = SortedKeys(history['team'].cat.codes.to_numpy()[self._order].astype('int64'),
+                                    history['Date'].to_numpy().view('int64')[self._order])
+        codes = self.teams.get_indexer(pd.Index(teams).astype(str)).astype('int64')
+        known = codes >= 0
+        safe = np.where(known, codes, 0)
+        ends = self._keys.before(safe, date_values(dates))
+        found = known & (ends > self._keys.starts(safe))
+        rows = self._order[np.where(found, ends - 1, 0)]
+
+        columns = ['position'] + STANDINGS_COLUMNS
+        result = pd.DataFrame({col: np.where(found, history[col].to_numpy()[rows], 0) for col in columns})
+        result.insert(0, 'Season', np.where(found, history['Season'].to_numpy()[rows], None))
+        return result
+
+
+# Fenêtres de congestion (jours) et plafond du repos: au-delà de 4 semaines le repos ne distingue plus les équipes
+CONGESTION_WINDOWS = (7, 14, 28)
+REST_CAP_DAYS = 28
+DAY = 86_400 * 10 ** 9
+
+
+def fatigue_impact(rest_days, matches_14d):
+    """Impact en buts de la fatigue: repos de moins de 4 jours et plus de 3 matchs en 14 jours (entre -0.3 et 0)"""
+    impact = -0.1 * np.maximum(0, 4 - np.asarray(rest_days, dtype='float64')) \
+        - 0.05 * np.maximum(0, np.asarray(matches_14d, dtype='float64') - 3)
+    return np.maximum(-0.3, impact)
+
+
+class RestFeatures:
+    """Jours de repos et congestion du calendrier de chaque équipe avant chaque match
+
+    Sur la vue longue triée par (équipe, date): repos = écart avec le match précédent de
+    l'équipe (plafonné à REST_CAP_DAYS, plafond aussi pour un premier match), matchs joués
+    dans les 7 / 14 / 28 jours précédents par recherche dichotomique groupée. Aucune boucle.
+    """
+
+    def __init__(self, view, rows):
+        self.view = view
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, data, view=None):
+        """view: vue longue de data déjà construite (sinon construite ici)"""
+        if view is None:
+            view = LongView.from_frame(data)
+        positions = np.arange(len(view))
+        first = positions == view.offsets[view.team]
+        gaps = np.diff(view.date, prepend=view.date[:1]) / DAY
+        columns = {'rest_days': np.where(first, REST_CAP_DAYS, np.minimum(gaps, REST_CAP_DAYS))}
+        keys = SortedKeys(view.team, view.date)
+        # Matchs de l'équipe datés de [date - fenêtre, date): les clés sont triées par (équipe, date)
+        ends = keys.before(view.team, view.date)
+        for window in CONGESTION_WINDOWS:
+            columns[f"matches_{window}d"] = ends - keys.before(view.team, view.date - window * DAY)
+        return cls(view, pd.DataFrame(columns))
+
+    def matches(self, length):
+        """Features de chaque match du DataFrame source (aligné sur ses positions)
+
+        home_* / away_* pour chaque équipe et diff_* (domicile - extérieur).
+        """
+        columns = {}
+        for side, at_home in (('home', True), ('away', False)):
+            mask = self.view.home == at_home
+            for name, values in self.rows.items():
+                column = np.full(length, REST_CAP_DAYS if name == 'rest_days' else 0, dtype='float64')
+                column[self.view.row[mask]] = values.to_numpy()[mask]
+                columns[f"{side}_{name}"] = column
+        return self._with_diffs(columns)
+
+    def lookup(self, teams, dates):
+        """Repos et congestion de chaque équipe avant une date (matchs strictement antérieurs)"""
+        view = self.view
+        codes = view.codes(teams)
+        known = codes >= 0
+        safe = np.where(known, codes, 0)
+        dates = date_values(dates)
+        starts = view.offsets[safe]
+        ends = np.where(known, view.ends(safe, dates), starts)
+        last = view.date[np.maximum(ends - 1, 0)] if len(view) else np.zeros(len(ends), dtype='int64')
+        rest = np.where(ends > starts, np.minimum((dates - last) / DAY, REST_CAP_DAYS), REST_CAP_DAYS)
+        columns = {'rest_days': rest}
+        for window in CONGESTION_WINDOWS:
+            window_start = np.where(known, view.ends(safe, dates - window * DAY), starts)
+            columns[f"matches_{window}d"] = ends - np.maximum(window_start, starts)
+        return pd.DataFrame(columns)
+
+    def next_matchday(self, days=7):
+        """Date par défaut d'un match à venir: une semaine après le dernier match connu"""
+        latest = self.view.date.max() if len(self.view) else pd.Timestamp.today().normalize().value
+        return pd.Timestamp(latest) + pd.Timedelta(days=days)
+
+    def fixtures(self, home_teams, away_teams, dates):
+        """Features de matchs à venir: home_*, away_* et diff_* (domicile - extérieur)"""
+        columns = {}
+        for side, teams in (('home', home_teams), ('away', away_teams)):
+            for name, values in self.lookup(teams, dates).items():
+                columns[f"{side}_{name}"] = values.to_numpy()
+        return self._with_diffs(columns)
+
+    @staticmethod
+    def _with_diffs(columns):
+        for name in ['rest_days'] + [f"matches_{window}d" for window in CONGESTION_WINDOWS]:
+            columns[f"diff_{name}"] = columns[f"home_{name}"] - columns[f"away_{name}"]
+        return pd.DataFrame(columns)
+
+
+class MatchFeatures:
+    """Un DataFrame de matchs et ses tables de features, construites au premier usage
+
+    Objet partagé en lecture seule: les applications le tiennent dans un loader
+    st.cache_resource indexé par (version du dataset, saisons sélectionnées), comme le
+    cube de saisons, et chaque table n'est construite qu'une fois par entrée du cache.
+    La vue longue est commune à toutes les tables qui en dépendent.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._tables = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def _table(self, name, build):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = build()
+            return self._tables[name]
+
+    def view(self):
+        return self._table('view', lambda: LongView.from_frame(self.data))
+
+    def form(self):
+        return self._table('form', lambda: FormTable(self.view()))
+
+    def home_advantage(self):
+        return self._table('home_advantage', lambda: HomeAdvantageTable.from_frame(self.data))
+
+    def asof(self):
+        return self._table('asof', lambda: AsOfStore(self.form()))
+
+    def pairs(self):
+        return self._table('pairs', lambda: PairIndex.from_frame(self.data))
+
+    def pair_matches(self, team_a, team_b, last_n=None, order='Date'):
+        """Confrontations entre deux équipes lues dans l'index des paires (comme MatchStore.pair_matches)"""
+        return self.pairs().matches(self.data, team_a, team_b, last_n, order)
+
+    def h2h(self, last_k=None):
+        return self._table(('h2h', last_k),
+                           lambda: HeadToHeadTensor.from_frame(
+                               self.data, last_k, self.pairs() if last_k is not None else None))
+
+    def standings(self):
+        return self._table('standings', lambda: Standings.from_frame(self.data, self.view()))
+
+    def rest(self):
+        return self._table('rest', lambda: RestFeatures.from_frame(self.data, self.view()))
+
+
+def match_features(data):
+    """MatchFeatures de data: data lui-même, celles d'un MatchStore (gardées par la base) ou,
+    pour un DataFrame, construites sans cache (les applications passent celles de leur loader)"""
+    if isinstance(data, MatchFeatures):
+        return data
+    if not isinstance(data, pd.DataFrame) and hasattr(data, 'features'):
+        return data.features()
+    return MatchFeatures(data)
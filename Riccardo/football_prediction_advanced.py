@@ -4,6 +4,8 @@
 Application de prédiction football avec modèles ML avancés
 """
 
+import os
+import sqlite3
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -14,7 +16,7 @@ import time
 from sklearn.model_selection import train_test_split, TimeSeriesSplit, cross_val_score
 from sklearn.ensemble import RandomForestRegressor, VotingRegressor, StackingRegressor
 from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, mean_squared_error, r2_score
 import xgboost as xgb
 try:
@@ -25,6 +27,11 @@ try:
 except ImportError:
     ADVANCED_ML_AVAILABLE = False
     st.warning("⚠️ Modèles avancés non disponibles. Installez: pip install lightgbm catboost optuna")
+from football_data import open_dataset, shared_matches, season_cube, refresh_dataset, PartitionedMatches, team_ids
+from football_store import MatchStore
+from football_validation import validate_group, combine_reports
+from football_stats import TeamStrengths, DEFAULT_HALF_LIFE
+from football_features import MatchFeatures, match_features
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -382,31 +389,23 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def open_match_table():
+    """Ouverture paresseuse du dataset (les groupes de colonnes sont lus au premier accès)"""
+    return open_dataset(['../dataset.csv'], validator=validate_group)
+
 @st.cache_data
 def load_data():
-    """Chargement des données football"""
+    """Chargement des données football (colonnes principales + statistiques de match)"""
     try:
-        # Essayer différents encodages
-        encodings = ['latin-1', 'utf-8', 'cp1252']
-        data = None
-        
-        for encoding in encodings:
-            try:
-                data = pd.read_csv('../dataset.csv', encoding=encoding)
-                break
-            except:
-                continue
+        table = open_match_table()
         
-        if data is None:
+        if table is None:
             st.error("❌ Impossible de charger le fichier dataset.csv")
             return None
         
-        # Nettoyer et formater les données
-        data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d', errors='coerce')
-        data = data.dropna(subset=['Date'])
-        
-        # Calculer la saison (Juillet à Juin)
-        data['Season'] = data['Date'].apply(lambda x: f"{x.year}-{x.year+1}" if x.month >= 7 else f"{x.year-1}-{x.year}")
+        # Les ~70 colonnes de cotes ne sont chargées que par la vue des cotes
+        data = table.frame('match_stats')
         
         return data
         
@@ -414,49 +413,89 @@ def load_data():
         st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
         return None
 
-def calculate_team_stats(data, seasons):
-    """Calcul des statistiques des équipes - Version Simplifiée"""
-    if data is None or len(data) == 0:
-        return {}
-    
-    season_data = data[data['Season'].isin(seasons)]
-    team_stats = {}
-    
-    # Obtenir toutes les équipes uniques
-    all_teams = set(season_data['HomeTeam'].unique()) | set(season_data['AwayTeam'].unique())
-    
-    for team in all_teams:
-        # Matchs à domicile
-        home_matches = season_data[season_data['HomeTeam'] == team]
-        home_wins = len(home_matches[home_matches['FTR'] == 'H'])
-        home_goals = home_matches['FTHG'].mean() if len(home_matches) > 0 else 0
-        
-        # Matchs à l'extérieur
-        away_matches = season_data[season_data['AwayTeam'] == team]
-        away_wins = len(away_matches[away_matches['FTR'] == 'A'])
-        away_goals = away_matches['FTAG'].mean() if len(away_matches) > 0 else 0
-        
-        team_stats[team] = {
-            'total_home_matches': len(home_matches),
-            'home_wins': home_wins,
-            'home_win_rate': home_wins / len(home_matches) if len(home_matches) > 0 else 0,
-            'avg_goals_home': home_goals,
-            'total_away_matches': len(away_matches),
-            'away_wins': away_wins,
-            'away_win_rate': away_wins / len(away_matches) if len(away_matches) > 0 else 0,
-            'avg_goals_away': away_goals
-        }
-    
-    return team_stats
+@st.cache_resource
+def load_shared_data():
+    """Tableaux .npy mappés partagés entre processus (variable FOOTBALL_SHARED_DIR)"""
+    return shared_matches(open_match_table())
 
-@st.cache_data
-def prepare_ml_features(data, seasons):
-    """Préparation des features pour les modèles ML avancés"""
+def get_match_data():
+    """Matchs partagés en mémoire si configuré, sinon copie propre au processus"""
+    data = load_shared_data()
+    return data if data is not None else load_data()
+
+@st.cache_resource
+def load_partitions():
+    """Matchs partitionnés par (Div, Season) pour la sélection des saisons"""
+    data = get_match_data()
+    return PartitionedMatches.from_frame(data) if data is not None else None
+
+@st.cache_resource
+def open_match_store():
+    """Backend SQLite optionnel (variable FOOTBALL_SQLITE = chemin du fichier .db)"""
+    db_path = os.environ.get('FOOTBALL_SQLITE')
+    data = get_match_data()
+    if not db_path or data is None:
+        return None
+    return MatchStore.open(db_path, data, dataset_version().key)
+
+def dataset_version():
+    """Version du dataset (empreinte, lignes, dernière date): clé des caches dérivés"""
+    table = open_match_table()
+    return table.version if table is not None else None
+
+def validation_report():
+    """Rapport des contrôles faits à l'ingestion de chaque groupe chargé (cotes comprises)"""
+    table = open_match_table()
+    return combine_reports(table.validation().values() if table is not None else [])
+
+def load_odds():
+    """Cotes 1X2 (chargées au premier affichage de la vue des cotes)"""
+    table = open_match_table()
+    return table.group('odds_1x2') if table is not None else pd.DataFrame()
+
+@st.cache_resource
+def load_season_cube():
+    """Cube (équipe, saison, terrain) construit une fois puis tenu à jour par les nouveaux résultats
+
+    Une sélection de saisons se résout en sommant des tranches du cube.
+    """
+    return season_cube(get_match_data(), open_match_table())
+
+@st.cache_resource(max_entries=8)
+def load_team_strengths(version, half_life, seasons=None):
+    """Forces pondérées dans le temps, calculées une fois par (version du dataset, demi-vie, saisons)
+
+    seasons: tuple de saisons (None = tout l'historique), mêmes matchs que load_match_features.
+    """
+    features = load_match_features(version, seasons)
+    return TeamStrengths.from_frame(features.data, half_life) if features is not None else None
+
+@st.cache_resource(max_entries=4)
+def load_match_features(version, seasons=None):
+    """Tables de features (forme, confrontations, avantage domicile, repos) construites une fois par (version du dataset, saisons)
+
+    seasons: tuple de saisons (None = tout l'historique).
+    """
+    if seasons is None:
+        data = get_match_data()
+    else:
+        data = load_partitions().select(seasons=list(seasons))
+    return MatchFeatures(data) if data is not None else None
+
+@st.cache_data(max_entries=32)
+def prepare_ml_features(_data, seasons, version):
+    """Préparation des features pour les modèles ML avancés
+
+    Cache indexé par (saisons, version du dataset): _data n'est pas haché. _data est le
+    DataFrame de get_match_data(), aligné sur les tables de load_match_features(version).
+    """
+    data = _data
     if data is None or len(data) == 0:
         return None, None, None, None
     
     # Filtrer les données par saisons
-    season_data = data[data['Season'].isin(seasons)].copy()
+    season_mask = data['Season'].isin(seasons).to_numpy()
+    season_data = data[season_mask].copy()
     
     # Features disponibles dans le dataset
     available_features = []
@@ -471,22 +510,25 @@ def prepare_ml_features(data, seasons):
         return None, None, None, None
     
     # Préparer les features et targets
-    X = season_data[available_features].fillna(0)
-    y_home = season_data['FTHG'].fillna(0)
-    y_away = season_data['FTAG'].fillna(0)
-    
-    # Encoder les équipes pour des features supplémentaires
-    le_home = LabelEncoder()
-    le_away = LabelEncoder()
+    # Statistiques stockées en entiers courts nullables: float32 pour les modèles
+    X = season_data[available_features].astype('float32').fillna(0)
+    y_home = season_data['FTHG'].astype('float32').fillna(0)
+    y_away = season_data['FTAG'].astype('float32').fillna(0)
     
-    home_encoded = le_home.fit_transform(season_data['HomeTeam'].astype(str))
-    away_encoded = le_away.fit_transform(season_data['AwayTeam'].astype(str))
+    # Identifiants stables du registre des équipes (identiques quelle que soit la sélection de saisons)
+    home_encoded = team_ids(season_data['HomeTeam'])
+    away_encoded = team_ids(season_data['AwayTeam'])
     
     # Ajouter les features d'équipes
     X = X.copy()
     X['HomeTeam_encoded'] = home_encoded
     X['AwayTeam_encoded'] = away_encoded
     
+    # Repos et congestion avant chaque match (table du cache, sur tout l'historique, puis filtrés)
+    rest = load_match_features(version).rest().matches(len(data))[season_mask]
+    for col in rest.columns:
+        X[col] = rest[col].to_numpy()
+    
     return X, y_home, y_away, available_features
 
 def create_advanced_models():
@@ -578,9 +620,13 @@ def create_ensemble_model(models, X, y):
     
     return ensemble
 
-@st.cache_data
-def train_advanced_models(X, y_home, y_away):
-    """Entraînement des modèles avancés avec cache"""
+@st.cache_data(max_entries=8)
+def train_advanced_models(_X, _y_home, _y_away, version, seasons):
+    """Entraînement des modèles avancés avec cache
+
+    Cache indexé par (version du dataset, saisons) au lieu du hachage des features.
+    """
+    X, y_home, y_away = _X, _y_home, _y_away
     if X is None or len(X) == 0:
         return None
     
@@ -632,24 +678,43 @@ def train_advanced_models(X, y_home, y_away):
     
     return results
 
+# Forme neutre: aucun match connu pour l'équipe
+NEUTRAL_RECENT_FORM = {
+    'recent_wins': 0,
+    'recent_draws': 0,
+    'recent_losses': 0,
+    'recent_goals_for': 0,
+    'recent_goals_against': 0,
+    'recent_form_score': 50,  # Neutre
+    'recent_matches_count': 0
+}
+
 def calculate_recent_form(data, team, last_n=5):
     """Calcule la forme récente d'une équipe sur les N derniers matchs"""
+    if data is None:
+        return dict(NEUTRAL_RECENT_FORM)
     try:
         # Récupérer tous les matchs de l'équipe
-        team_matches = data[
-            (data['HomeTeam'] == team) | (data['AwayTeam'] == team)
-        ].sort_values('Date').tail(last_n)
-        
-        if len(team_matches) == 0:
+        if not isinstance(data, MatchStore):
+            # Table de forme construite une fois (sommes cumulées par équipe), recherche dichotomique
+            form = match_features(data).form().last(team, last_n)
+            if form['matches'] == 0:
+                return dict(NEUTRAL_RECENT_FORM)
             return {
-                'recent_wins': 0,
-                'recent_draws': 0,
-                'recent_losses': 0,
-                'recent_goals_for': 0,
-                'recent_goals_against': 0,
-                'recent_form_score': 50,  # Neutre
-                'recent_matches_count': 0
+                'recent_wins': form['wins'],
+                'recent_draws': form['draws'],
+                'recent_losses': form['losses'],
+                'recent_goals_for': form['goals_for'],
+                'recent_goals_against': form['goals_against'],
+                'recent_form_score': round(form['points'] / (form['matches'] * 3) * 100, 1),
+                'recent_matches_count': form['matches']
             }
+
+        # Requête indexée (HomeTeam, Date) / (AwayTeam, Date)
+        team_matches = data.team_matches(team, last_n)
+        
+        if len(team_matches) == 0:
+            return dict(NEUTRAL_RECENT_FORM)
         
         wins, draws, losses = 0, 0, 0
         goals_for, goals_against = 0, 0
@@ -687,25 +752,20 @@ def calculate_recent_form(data, team, last_n=5):
             'recent_matches_count': len(team_matches)
         }
     
-    except Exception as e:
-        return {
-            'recent_wins': 0,
-            'recent_draws': 0,
-            'recent_losses': 0,
-            'recent_goals_for': 0,
-            'recent_goals_against': 0,
-            'recent_form_score': 50,
-            'recent_matches_count': 0
-        }
+    except (KeyError, TypeError, ValueError, sqlite3.Error):
+        # Colonnes manquantes ou valeurs illisibles, base inaccessible: forme neutre
+        return dict(NEUTRAL_RECENT_FORM)
 
 def calculate_head_to_head(data, home_team, away_team, last_n=10):
     """Calcule les statistiques face-à-face entre deux équipes"""
     try:
         # Récupérer tous les matchs entre ces deux équipes
-        h2h_matches = data[
-            ((data['HomeTeam'] == home_team) & (data['AwayTeam'] == away_team)) |
-            ((data['HomeTeam'] == away_team) & (data['AwayTeam'] == home_team))
-        ].sort_values('Date').tail(last_n)
+        if isinstance(data, MatchStore):
+            # Requête indexée sur la paire non ordonnée (team_lo, team_hi, Date)
+            h2h_matches = data.pair_matches(home_team, away_team, last_n)
+        else:
+            # Index des paires construit une fois: lecture des seules confrontations
+            h2h_matches = match_features(data).pair_matches(home_team, away_team, last_n)
         
         if len(h2h_matches) == 0:
             return {
@@ -718,28 +778,17 @@ def calculate_head_to_head(data, home_team, away_team, last_n=10):
                 'last_result': None
             }
         
-        home_wins, away_wins, draws = 0, 0, 0
-        total_home_goals, total_away_goals = 0, 0
+        # Buts du point de vue de home_team, en tableaux (pas de boucle sur les matchs)
+        at_home = (h2h_matches['HomeTeam'].astype(str) == str(home_team)).to_numpy()
+        fthg = h2h_matches['FTHG'].to_numpy(dtype='float64')
+        ftag = h2h_matches['FTAG'].to_numpy(dtype='float64')
+        home_goals = np.where(at_home, fthg, ftag)
+        away_goals = np.where(at_home, ftag, fthg)
         
-        for _, match in h2h_matches.iterrows():
-            if match['HomeTeam'] == home_team:
-                # home_team jouait à domicile
-                home_goals = match['FTHG']
-                away_goals = match['FTAG']
-            else:
-                # home_team jouait à l'extérieur
-                home_goals = match['FTAG']
-                away_goals = match['FTHG']
-            
-            total_home_goals += home_goals
-            total_away_goals += away_goals
-            
-            if home_goals > away_goals:
-                home_wins += 1
-            elif home_goals == away_goals:
-                draws += 1
-            else:
-                away_wins += 1
+        total_home_goals, total_away_goals = home_goals.sum(), away_goals.sum()
+        home_wins = int((home_goals > away_goals).sum())
+        draws = int((home_goals == away_goals).sum())
+        away_wins = len(h2h_matches) - home_wins - draws
         
         # Dernier résultat
         last_match = h2h_matches.iloc[-1]
@@ -772,19 +821,22 @@ def calculate_head_to_head(data, home_team, away_team, last_n=10):
 def calculate_home_advantage_factor(data, team):
     """Calcule le facteur d'avantage à domicile spécifique à une équipe"""
     try:
-        home_matches = data[data['HomeTeam'] == team]
-        away_matches = data[data['AwayTeam'] == team]
+        if not isinstance(data, MatchStore):
+            # Tableau précalculé pour toutes les équipes (agrégation groupée, une fois par dataset)
+            return match_features(data).home_advantage().factor(team)
+        
+        # Comptages lus directement dans les index couvrants
+        home_played, home_wins = data.venue_record(team, 'home')
+        away_played, away_wins = data.venue_record(team, 'away')
         
-        if len(home_matches) == 0 or len(away_matches) == 0:
+        if home_played == 0 or away_played == 0:
             return 7.0  # Valeur par défaut
         
         # Performance à domicile
-        home_wins = len(home_matches[home_matches['FTHG'] > home_matches['FTAG']])
-        home_win_rate = home_wins / len(home_matches)
+        home_win_rate = home_wins / home_played
         
         # Performance à l'extérieur
-        away_wins = len(away_matches[away_matches['FTAG'] > away_matches['FTHG']])
-        away_win_rate = away_wins / len(away_matches)
+        away_win_rate = away_wins / away_played
         
         # Facteur d'avantage (différence en pourcentage)
         advantage_factor = (home_win_rate - away_win_rate) * 100
@@ -1312,6 +1364,40 @@ def show_prediction_history_interface(data, selected_seasons):
     for rec in recommendations:
         st.info(rec)
 
+def show_ml_models_interface(data, selected_seasons):
+    """Interface d'entraînement des modèles ML sur les saisons sélectionnées
+
+    data: DataFrame de get_match_data() (features alignées sur load_match_features). Features
+    et modèles sont gardés en cache par (version du dataset, saisons).
+    """
+    st.markdown("---")
+    st.markdown("## 🤖 Modèles ML (buts domicile / extérieur)")
+    
+    show_advanced_notification("Entraînement des régresseurs sur les statistiques, équipes, repos et congestion", "info")
+    
+    seasons = tuple(sorted(selected_seasons))
+    if not st.button("🚀 ENTRAÎNER LES MODÈLES", type="primary"):
+        return
+    
+    with st.spinner("🤖 Préparation des features et entraînement..."):
+        X, y_home, y_away, available_features = prepare_ml_features(data, seasons, dataset_version())
+        results = train_advanced_models(X, y_home, y_away, dataset_version(), seasons)
+    
+    if not results:
+        st.error("❌ Aucun modèle n'a pu être entraîné sur cette sélection")
+        return
+    
+    scores = pd.DataFrame({
+        name: {'MSE domicile': r['home_mse'], 'R² domicile': r['home_r2'],
+               'MSE extérieur': r['away_mse'], 'R² extérieur': r['away_r2']}
+        for name, r in results.items()
+    }).T.round(3)
+    st.dataframe(scores, use_container_width=True)
+    
+    best = scores[['MSE domicile', 'MSE extérieur']].mean(axis=1).idxmin()
+    st.success(f"🏆 Meilleur modèle: {best} ({len(X)} matchs, {X.shape[1]} features dont "
+               f"{len(available_features)} statistiques de match)")
+
 def show_prediction_interface(data, selected_seasons, team_stats, teams):
     """Interface de prédiction principale - PROPRE"""
     st.markdown("---")
@@ -1350,7 +1436,12 @@ def show_prediction_interface(data, selected_seasons, team_stats, teams):
         if home_team and away_team and home_team != away_team:
             with st.spinner("� Analyse avancée en cours..."):
                 # Calculer les probabilités avec toutes les nouvelles features
-                season_data = data[data['Season'].isin(selected_seasons)]
+                store = open_match_store()
+                if store is not None:
+                    season_data = store.view(selected_seasons)
+                else:
+                    # Tables de features des saisons sélectionnées, tenues par le cache
+                    season_data = load_match_features(dataset_version(), tuple(sorted(selected_seasons)))
                 probabilities = predict_match_probabilities_advanced(home_team, away_team, team_stats, season_data)
             
             if probabilities:
@@ -1535,16 +1626,18 @@ def show_bookmaker_odds(data, teams):
     if st.button("💰 VOIR LES COTES", type="primary"):
         if home_team and away_team and home_team != away_team:
             # Recherche des matchs historiques
-            historical_matches = data[
-                ((data['HomeTeam'] == home_team) & (data['AwayTeam'] == away_team)) |
-                ((data['HomeTeam'] == away_team) & (data['AwayTeam'] == home_team))
-            ]
+            if isinstance(data, MatchStore):
+                # Requête indexée sur la paire d'équipes
+                historical_matches = data.pair_matches(home_team, away_team, order='row')
+            else:
+                # Index des paires construit une fois: lecture des seules confrontations
+                historical_matches = match_features(data).pair_matches(home_team, away_team, order='row')
             
             if len(historical_matches) > 0:
                 st.success(f"✅ {len(historical_matches)} match(s) trouvé(s)")
                 
-                # Afficher les 3 derniers matchs
-                recent_matches = historical_matches.tail(3)
+                # Afficher les 3 derniers matchs (avec leurs cotes)
+                recent_matches = historical_matches.tail(3).join(load_odds())
                 
                 for idx, (_, match) in enumerate(recent_matches.iterrows()):
                     with st.expander(f"🏆 Match {idx+1} - {match['Date'].strftime('%d/%m/%Y')} - {match['HomeTeam']} vs {match['AwayTeam']}"):
@@ -1583,7 +1676,7 @@ def main():
     
     # Chargement des données
     with st.spinner("📊 Chargement des données..."):
-        data = load_data()
+        data = get_match_data()
     
     if data is None:
         st.stop()
@@ -1594,7 +1687,21 @@ def main():
     # Sidebar pour sélection des saisons
     st.sidebar.markdown("## 📅 Configuration")
     
-    available_seasons = sorted(data['Season'].unique())
+    # Contrôle de cohérence du dataset (scores, résultats, doublons, bornes, cotes)
+    report = validation_report()
+    if not report.ok:
+        st.sidebar.warning(f"⚠️ {len(report.invalid_rows)} lignes incohérentes dans le dataset")
+        with st.sidebar.expander("🔎 Détails de la validation"):
+            st.text(report.summary())
+    
+    # Nouvelle journée ajoutée au CSV: seules les nouvelles lignes sont parsées
+    if st.sidebar.button("🔄 Actualiser les données"):
+        loaders = [load_data, load_shared_data, load_partitions, open_match_store, load_match_features]
+        if refresh_dataset(open_match_table(), load_season_cube(), loaders):
+            st.rerun()
+    
+    partitions = load_partitions()
+    available_seasons = partitions.seasons()
     selected_seasons = st.sidebar.multiselect(
         "Saisons à analyser:",
         available_seasons,
@@ -1605,17 +1712,25 @@ def main():
         show_advanced_notification("Veuillez sélectionner au moins une saison pour continuer", "warning")
         st.stop()
     
+    # Seules les partitions des saisons sélectionnées sont lues (sélection gardée en cache)
+    season_data = load_match_features(dataset_version(), tuple(sorted(selected_seasons))).data
+    
     # Calcul des statistiques
     with st.spinner("📊 Calcul des statistiques..."):
-        team_stats = calculate_team_stats(data, selected_seasons)
+        team_stats = load_season_cube().team_profiles(selected_seasons)
         teams = sorted(team_stats.keys())
     
+    # Pondération temporelle optionnelle: moyennes de buts, tirs cadrés et corners à demi-vie
+    if st.sidebar.checkbox("⏳ Pondérer les matchs récents", value=False):
+        half_life = st.sidebar.slider("Demi-vie (jours):", 30, 720, DEFAULT_HALF_LIFE, step=30)
+        strengths = load_team_strengths(dataset_version(), half_life, tuple(sorted(selected_seasons)))
+        if strengths is not None:
+            team_stats = strengths.apply(team_stats)
+    
     # Métriques générales
     st.markdown("### 📊 Aperçu des Données")
     col1, col2, col3, col4 = st.columns(4)
     
-    season_data = data[data['Season'].isin(selected_seasons)]
-    
     with col1:
         show_metric_card("Matchs", len(season_data), "Total analysés")
     
@@ -1633,18 +1748,27 @@ def main():
     st.sidebar.markdown("---")
     view = st.sidebar.radio(
         "🎯 Fonctionnalités:",
-        ["🔮 Prédiction IA", "📅 Calendrier Multi-Matchs", "💰 Cotes Bookmakers", "📈 Historique & Performance"]
+        ["🔮 Prédiction IA", "📅 Calendrier Multi-Matchs", "💰 Cotes Bookmakers", "📈 Historique & Performance",
+         "🤖 Modèles ML"]
     )
     
+    # Recherches par équipe / paire: base SQLite indexée si configurée
+    match_source = open_match_store()
+    if match_source is None:
+        # Tables de features tenues par le cache, par version du dataset
+        match_source = load_match_features(dataset_version())
+    
     # Affichage selon la vue
     if view == "🔮 Prédiction IA":
         show_prediction_interface(data, selected_seasons, team_stats, teams)
     elif view == "📅 Calendrier Multi-Matchs":
         show_multi_match_interface(data, selected_seasons, team_stats, teams)
     elif view == "💰 Cotes Bookmakers":
-        show_bookmaker_odds(data, teams)
+        show_bookmaker_odds(match_source, teams)
     elif view == "📈 Historique & Performance":
         show_prediction_history_interface(data, selected_seasons)
+    elif view == "🤖 Modèles ML":
+        show_ml_models_interface(data, selected_seasons)
 
 if __name__ == "__main__":
     main()
@@ -23,6 +23,11 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score
+from football_data import open_dataset, shared_matches, season_cube, refresh_dataset, PartitionedMatches
+from football_store import MatchStore
+from football_validation import validate_group, combine_reports
+from football_stats import TeamStrengths, DEFAULT_HALF_LIFE
+from football_features import MatchFeatures, match_features, fatigue_impact, H2H_METRICS
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -380,53 +385,23 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def open_match_table():
+    """Ouverture paresseuse du dataset (les groupes de colonnes sont lus au premier accès)"""
+    return open_dataset(validator=validate_group)
+
 @st.cache_data
 def load_data():
-    """Chargement des données football"""
+    """Chargement des données football (colonnes principales + statistiques de match)"""
     try:
-        import os
-        
-        # Lister les chemins possibles pour le dataset
-        possible_paths = [
-            '../dataset.csv',
-            './dataset.csv', 
-            'dataset.csv',
-            'C:/Users/Ricca/football_prediction_clean/dataset.csv',
-            'C:/Users/Ricca/football_prediction_clean/Riccardo/dataset.csv'
-        ]
-        
-        # Charger le dataset
-        dataset_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                dataset_path = path
-                break
+        table = open_match_table()
         
-        if dataset_path is None:
+        if table is None:
             st.error("❌ Impossible de charger le fichier dataset.csv")
             return None
             
-        # Charger avec l'encodage qui fonctionne
-        encodings = ['latin-1', 'utf-8', 'cp1252']
-        data = None
-        
-        for encoding in encodings:
-            try:
-                data = pd.read_csv(dataset_path, encoding=encoding)
-                break
-            except Exception:
-                continue
-        
-        if data is None:
-            st.error("❌ Impossible de charger le fichier avec tous les encodages testés")
-            return None
-        
-        # Nettoyer et formater les données
-        data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d', errors='coerce')
-        data = data.dropna(subset=['Date'])
-        
-        # Calculer la saison (Juillet à Juin)
-        data['Season'] = data['Date'].apply(lambda x: f"{x.year}-{x.year+1}" if x.month >= 7 else f"{x.year-1}-{x.year}")
+        # Les ~70 colonnes de cotes ne sont chargées que par la vue des cotes
+        data = table.frame('match_stats')
         
         return data
         
@@ -434,18 +409,68 @@ def load_data():
         st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
         return None
 
+@st.cache_resource
+def load_shared_data():
+    """Tableaux .npy mappés partagés entre processus (variable FOOTBALL_SHARED_DIR)"""
+    return shared_matches(open_match_table())
+
+def get_match_data():
+    """Matchs partagés en mémoire si configuré, sinon copie propre au processus"""
+    data = load_shared_data()
+    return data if data is not None else load_data()
+
+@st.cache_resource
+def load_partitions():
+    """Matchs partitionnés par (Div, Season) pour la sélection des saisons"""
+    data = get_match_data()
+    return PartitionedMatches.from_frame(data) if data is not None else None
+
+@st.cache_resource
+def open_match_store():
+    """Backend SQLite optionnel (variable FOOTBALL_SQLITE = chemin du fichier .db)"""
+    import os
+    
+    db_path = os.environ.get('FOOTBALL_SQLITE')
+    data = get_match_data()
+    if not db_path or data is None:
+        return None
+    return MatchStore.open(db_path, data, dataset_version().key)
+
+def dataset_version():
+    """Version du dataset (empreinte, lignes, dernière date): clé des caches dérivés"""
+    table = open_match_table()
+    return table.version if table is not None else None
+
+def validation_report():
+    """Rapport des contrôles faits à l'ingestion de chaque groupe chargé (cotes comprises)"""
+    table = open_match_table()
+    return combine_reports(table.validation().values() if table is not None else [])
+
+def load_odds():
+    """Cotes 1X2 (chargées au premier affichage de la vue des cotes)"""
+    table = open_match_table()
+    return table.group('odds_1x2') if table is not None else pd.DataFrame()
+
 def calculate_recent_form(data, team, num_matches=5):
     """AMÉLIORATION 2: Calcul de la forme récente d'une équipe (derniers 5 matchs)"""
     if data is None or len(data) == 0:
         return {"points": 0, "goals_for": 0, "goals_against": 0, "form_rating": 0.5}
     
-    # Trier les données par date décroissante
-    sorted_data = data.sort_values('Date', ascending=False)
+    if not isinstance(data, MatchStore):
+        # Table de forme construite une fois (sommes cumulées par équipe), recherche dichotomique
+        form = match_features(data).form().last(team, num_matches)
+        if form['matches'] == 0:
+            return {"points": 0, "goals_for": 0, "goals_against": 0, "form_rating": 0.5}
+        return {
+            "points": form['points'],
+            "goals_for": form['goals_for'],
+            "goals_against": form['goals_against'],
+            "form_rating": form['points'] / (num_matches * 3) if num_matches > 0 else 0.5,
+            "matches_played": form['matches']
+        }
     
-    # Récupérer les derniers matchs de l'équipe
-    team_matches = sorted_data[
-        (sorted_data['HomeTeam'] == team) | (sorted_data['AwayTeam'] == team)
-    ].head(num_matches)
+    # Requête indexée (HomeTeam, Date) / (AwayTeam, Date)
+    team_matches = data.team_matches(team, num_matches)
     
     if len(team_matches) == 0:
         return {"points": 0, "goals_for": 0, "goals_against": 0, "form_rating": 0.5}
@@ -485,14 +510,19 @@ def calculate_recent_form(data, team, num_matches=5):
         "matches_played": len(team_matches)
     }
 
-def simulate_team_condition(team):
-    """AMÉLIORATION 3: Simulation des blessures/suspensions et condition de l'équipe"""
+def simulate_team_condition(team, fatigue=None):
+    """AMÉLIORATION 3: Simulation des blessures/suspensions et condition de l'équipe
+
+    fatigue: impact mesuré (repos / congestion du calendrier) qui remplace la fatigue simulée.
+    """
     import random
     
     # Simulation réaliste des facteurs d'équipe
     injury_impact = random.uniform(-0.3, 0.1)  # Généralement négatif
     suspension_impact = random.uniform(-0.2, 0)  # Toujours négatif ou neutre
     fatigue_impact = random.uniform(-0.2, 0.2)  # Peut être positif (repos) ou négatif (fatigue)
+    if fatigue is not None:
+        fatigue_impact = fatigue
     
     # Facteurs positifs occasionnels
     motivation_boost = random.uniform(-0.1, 0.3)  # Derby, match important
@@ -518,40 +548,58 @@ def simulate_team_condition(team):
         }
     }
 
-def calculate_team_stats(data, seasons):
-    """Calcul des statistiques des équipes - Version Simplifiée"""
-    if data is None or len(data) == 0:
-        return {}
-    
-    season_data = data[data['Season'].isin(seasons)]
-    team_stats = {}
-    
-    # Obtenir toutes les équipes uniques
-    all_teams = set(season_data['HomeTeam'].unique()) | set(season_data['AwayTeam'].unique())
-    
-    for team in all_teams:
-        # Matchs à domicile
-        home_matches = season_data[season_data['HomeTeam'] == team]
-        home_wins = len(home_matches[home_matches['FTR'] == 'H'])
-        home_goals = home_matches['FTHG'].mean() if len(home_matches) > 0 else 0
-        
-        # Matchs à l'extérieur
-        away_matches = season_data[season_data['AwayTeam'] == team]
-        away_wins = len(away_matches[away_matches['FTR'] == 'A'])
-        away_goals = away_matches['FTAG'].mean() if len(away_matches) > 0 else 0
-        
-        team_stats[team] = {
-            'total_home_matches': len(home_matches),
-            'home_wins': home_wins,
-            'home_win_rate': home_wins / len(home_matches) if len(home_matches) > 0 else 0,
-            'avg_goals_home': home_goals,
-            'total_away_matches': len(away_matches),
-            'away_wins': away_wins,
-            'away_win_rate': away_wins / len(away_matches) if len(away_matches) > 0 else 0,
-            'avg_goals_away': away_goals
-        }
-    
-    return team_stats
+def simulate_team_conditions(size, fatigue=None, rng=None):
+    """Impact de condition (simulate_team_condition) pour un lot d'équipes, en un tirage vectorisé"""
+    rng = rng if rng is not None else np.random.default_rng()
+    injury_impact = rng.uniform(-0.3, 0.1, size)
+    suspension_impact = rng.uniform(-0.2, 0, size)
+    fatigue_impact = rng.uniform(-0.2, 0.2, size) if fatigue is None else fatigue
+    motivation_boost = rng.uniform(-0.1, 0.3, size)
+    home_advantage_extra = rng.uniform(0, 0.2, size)
+    total_impact = (injury_impact + suspension_impact + fatigue_impact +
+                    motivation_boost + home_advantage_extra)
+    return np.clip(total_impact, -0.5, 0.5)
+
+@st.cache_resource
+def load_season_cube():
+    """Cube (équipe, saison, terrain) construit une fois puis tenu à jour par les nouveaux résultats
+
+    Une sélection de saisons se résout en sommant des tranches du cube.
+    """
+    return season_cube(get_match_data(), open_match_table())
+
+@st.cache_resource(max_entries=8)
+def load_team_strengths(version, half_life, seasons=None):
+    """Forces pondérées dans le temps, calculées une fois par (version du dataset, demi-vie, saisons)
+
+    seasons: tuple de saisons (None = tout l'historique), mêmes matchs que load_match_features.
+    """
+    features = load_match_features(version, seasons)
+    return TeamStrengths.from_frame(features.data, half_life) if features is not None else None
+
+@st.cache_resource(max_entries=4)
+def load_match_features(version, seasons=None):
+    """Tables de features (forme, confrontations, repos...) construites une fois par (version du dataset, saisons)
+
+    seasons: tuple de saisons (None = tout l'historique).
+    """
+    if seasons is None:
+        data = get_match_data()
+    else:
+        data = load_partitions().select(seasons=list(seasons))
+    return MatchFeatures(data) if data is not None else None
+
+def calculate_rest_features(data, home_team, away_team, match_date=None):
+    """Repos et congestion des deux équipes avant le match (une semaine après le dernier match connu par défaut)
+
+    data: matchs de la prédiction (DataFrame, MatchFeatures ou MatchStore).
+    """
+    if data is None:
+        return None
+    rest = match_features(data).rest()
+    if match_date is None:
+        match_date = rest.next_matchday()
+    return rest.fixtures([home_team], [away_team], [match_date]).iloc[0].to_dict()
 
 def show_metric_card(title, value, subtitle):
     """Affichage d'une métrique propre adaptée au thème"""
@@ -615,7 +663,13 @@ def show_advanced_notification(message, notification_type="info", icon="ℹ️")
     </div>
     """, unsafe_allow_html=True)
 
-def advanced_prediction_ensemble(home_team, away_team, team_stats, data=None):
+# Poids des 4 modèles de l'ensemble (historique, forme, attaque/défense, facteurs externes)
+ENSEMBLE_WEIGHTS = [0.3, 0.25, 0.25, 0.2]
+
+# Confrontations rapportées par predict_matches (dernières rencontres de chaque paire, à titre indicatif)
+H2H_LAST_K = 10
+
+def advanced_prediction_ensemble(home_team, away_team, team_stats, data=None, match_date=None):
     """AMÉLIORATION 4: Modèle d'ensemble avec plusieurs approches de prédiction"""
     
     # Modèle 1: Prédiction basée sur les statistiques historiques
@@ -645,15 +699,18 @@ def advanced_prediction_ensemble(home_team, away_team, team_stats, data=None):
     model3_home = (home_attack + away_defense) / 2
     model3_away = (away_attack + home_defense) / 2
     
-    # Modèle 4: Prédiction avec facteurs externes
-    home_condition = simulate_team_condition(home_team)
-    away_condition = simulate_team_condition(away_team)
+    # Modèle 4: Prédiction avec facteurs externes (fatigue mesurée: repos et congestion du calendrier)
+    rest = calculate_rest_features(data, home_team, away_team, match_date)
+    home_fatigue = float(fatigue_impact(rest['home_rest_days'], rest['home_matches_14d'])) if rest else None
+    away_fatigue = float(fatigue_impact(rest['away_rest_days'], rest['away_matches_14d'])) if rest else None
+    home_condition = simulate_team_condition(home_team, home_fatigue)
+    away_condition = simulate_team_condition(away_team, away_fatigue)
     
     model4_home = model1_home + home_condition['condition_impact']
     model4_away = model1_away + away_condition['condition_impact']
     
     # Ensemble: Moyenne pondérée des 4 modèles
-    weights = [0.3, 0.25, 0.25, 0.2]  # Poids pour chaque modèle
+    weights = ENSEMBLE_WEIGHTS  # Poids pour chaque modèle
     
     ensemble_home = (
         weights[0] * model1_home + 
@@ -693,7 +750,8 @@ def advanced_prediction_ensemble(home_team, away_team, team_stats, data=None):
         "model3": [model3_home, model3_away], 
         "model4": [model4_home, model4_away],
         "home_condition": home_condition,
-        "away_condition": away_condition
+        "away_condition": away_condition,
+        "rest": rest
     }
 
 def calculate_match_probabilities(home_goals, away_goals):
@@ -743,7 +801,99 @@ def calculate_match_probabilities(home_goals, away_goals):
         'away_win': round(away_win_prob, 1)
     }
 
-def predict_match(home_team, away_team, team_stats, data=None, use_advanced=True):
+def match_probabilities(home_goals, away_goals):
+    """Probabilités 1X2 (%) de calculate_match_probabilities, vectorisées sur des tableaux de scores"""
+    goal_diff = np.asarray(home_goals, dtype='float64') - np.asarray(away_goals, dtype='float64')
+    gap = np.abs(goal_diff)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        home_win_prob = np.where(goal_diff > 0, 0.5 + (gap / (gap + 2)) * 0.4, 0.5 / (1 + gap))
+        away_win_prob = np.where(goal_diff < 0, 0.5 + (gap / (gap + 2)) * 0.4, 0.5 / (1 + gap))
+    draw_prob = np.where(gap < 0.5, 0.35, np.where(gap < 1.0, 0.25, 0.15 / (1 + gap)))
+    
+    total = home_win_prob + away_win_prob + draw_prob
+    return {
+        'home_win': np.round(home_win_prob / total * 100, 1),
+        'draw': np.round(draw_prob / total * 100, 1),
+        'away_win': np.round(away_win_prob / total * 100, 1)
+    }
+
+def predict_matches(fixtures, team_stats, data=None, seed=None):
+    """Prédiction vectorisée d'un lot de matchs: mêmes 4 modèles et poids que advanced_prediction_ensemble
+
+    fixtures: DataFrame HomeTeam, AwayTeam et Date optionnelle (une semaine après le dernier
+    match connu par défaut); forme et repos sont lus avant cette date. data: matchs
+    (DataFrame, MatchFeatures ou MatchStore; None = forme neutre et fatigue simulée). Renvoie un DataFrame aligné sur fixtures: buts attendus,
+    confiance, probabilités 1X2 (%), impacts de condition et bilan des H2H_LAST_K dernières
+    confrontations du point de vue de l'équipe à domicile (h2h_*, indicatif, hors modèle; NaN
+    sans data); NaN si une équipe est inconnue.
+    """
+    size = len(fixtures)
+    home_teams = fixtures['HomeTeam'].astype(str).to_numpy()
+    away_teams = fixtures['AwayTeam'].astype(str).to_numpy()
+    
+    # Statistiques des équipes en tableau (mêmes valeurs par défaut que le modèle unitaire)
+    teams = pd.Index(sorted(team_stats))
+    fields = ['avg_goals_home', 'avg_goals_away', 'avg_goals_scored', 'avg_goals_conceded']
+    stats = np.array([[team_stats[team].get(field, 1.5) for field in fields] for team in teams],
+                     dtype='float64').reshape(len(teams), len(fields))
+    home_pos, away_pos = teams.get_indexer(home_teams), teams.get_indexer(away_teams)
+    known = (home_pos >= 0) & (away_pos >= 0)
+    stats = np.vstack([stats, np.full((1, len(fields)), np.nan)])
+    home_stats, away_stats = stats[np.where(known, home_pos, -1)], stats[np.where(known, away_pos, -1)]
+    
+    # Forme (5 derniers matchs) et repos avant la date de chaque match
+    home_form = away_form = np.full(size, 0.5)
+    home_fatigue = away_fatigue = None
+    h2h = pd.DataFrame(np.nan, index=range(size), columns=H2H_METRICS)
+    if data is not None:
+        features = match_features(data)
+        rest = features.rest()
+        dates = fixtures['Date'] if 'Date' in fixtures.columns else pd.Series(rest.next_matchday(), index=fixtures.index)
+        form = features.form()
+        home_form, away_form = (
+            np.where(recent['matches'] > 0, recent['points'] / 15, 0.5)
+            for recent in (form.lookup(home_teams, dates, 5), form.lookup(away_teams, dates, 5))
+        )
+        congestion = rest.fixtures(home_teams, away_teams, dates)
+        home_fatigue = fatigue_impact(congestion['home_rest_days'], congestion['home_matches_14d'])
+        away_fatigue = fatigue_impact(congestion['away_rest_days'], congestion['away_matches_14d'])
+        h2h = features.h2h(last_k=H2H_LAST_K).gather(home_teams, away_teams)
+    
+    # Modèles 1 à 4
+    model1_home, model1_away = home_stats[:, 0], away_stats[:, 1]
+    model2_home = model1_home * (0.8 + home_form * 0.4)
+    model2_away = model1_away * (0.8 + away_form * 0.4)
+    model3_home = (home_stats[:, 2] + away_stats[:, 3]) / 2
+    model3_away = (away_stats[:, 2] + home_stats[:, 3]) / 2
+    rng = np.random.default_rng(seed)
+    home_condition = simulate_team_conditions(size, home_fatigue, rng)
+    away_condition = simulate_team_conditions(size, away_fatigue, rng)
+    model4_home = model1_home + home_condition
+    model4_away = model1_away + away_condition
+    
+    # Ensemble pondéré et confiance selon la convergence des modèles
+    models_home = np.vstack([model1_home, model2_home, model3_home, model4_home])
+    models_away = np.vstack([model1_away, model2_away, model3_away, model4_away])
+    weights = np.asarray(ENSEMBLE_WEIGHTS)[:, None]
+    ensemble_home = np.maximum(0, (weights * models_home).sum(axis=0))
+    ensemble_away = np.maximum(0, (weights * models_away).sum(axis=0))
+    avg_variance = (models_home.var(axis=0) + models_away.var(axis=0)) / 2
+    confidence = np.maximum(40, 70 - np.minimum(30, avg_variance * 50))
+    
+    results = pd.DataFrame({
+        'home_goals': ensemble_home,
+        'away_goals': ensemble_away,
+        'confidence': confidence,
+        **match_probabilities(ensemble_home, ensemble_away),
+        'home_condition': home_condition,
+        'away_condition': away_condition,
+        **{f"h2h_{name}": h2h[name].to_numpy(dtype='float64') for name in H2H_METRICS},
+    }, index=fixtures.index)
+    results.loc[~known] = np.nan
+    return results
+
+def predict_match(home_team, away_team, team_stats, data=None, use_advanced=True, match_date=None):
     """Prédiction améliorée d'un match avec toutes les améliorations et probabilités"""
     if home_team not in team_stats or away_team not in team_stats:
         return None, None, 0, None
@@ -751,7 +901,7 @@ def predict_match(home_team, away_team, team_stats, data=None, use_advanced=True
     # AMÉLIORATION 4: Utiliser le modèle d'ensemble avancé par défaut
     if use_advanced:
         ensemble_home, ensemble_away, ensemble_confidence, details = advanced_prediction_ensemble(
-            home_team, away_team, team_stats, data
+            home_team, away_team, team_stats, data, match_date
         )
         # Calculer les probabilités de résultat
         probabilities = calculate_match_probabilities(ensemble_home, ensemble_away)
@@ -826,17 +976,22 @@ def generate_multi_match_predictions(teams, team_stats, data=None, num_matches=1
     """Générer des prédictions pour un calendrier complet - ÉTAPE 1.B"""
     import random
     
-    predictions = []
-    
+    # Sélectionner les paires aléatoirement, puis prédire tout le calendrier en un appel vectorisé
+    fixtures = []
     for i in range(num_matches):
-        # Sélectionner deux équipes aléatoirement
         home_team = random.choice(teams)
         away_team = random.choice([t for t in teams if t != home_team])
-        
-        # Prédire le match avec données de forme récente
-        home_pred, away_pred, confidence, probabilities = predict_match(home_team, away_team, team_stats, data)
-        
-        if home_pred is not None:
+        fixtures.append((home_team, away_team))
+    fixtures = pd.DataFrame(fixtures, columns=['HomeTeam', 'AwayTeam'])
+    results = predict_matches(fixtures, team_stats, data)
+    
+    predictions = []
+    
+    for home_team, away_team, home_pred, away_pred, confidence, h2h in zip(
+        fixtures['HomeTeam'], fixtures['AwayTeam'], results['home_goals'], results['away_goals'], results['confidence'],
+        results[['h2h_wins', 'h2h_draws', 'h2h_losses']].itertuples(index=False)
+    ):
+        if not np.isnan(home_pred):
             # Déterminer le résultat
             if home_pred > away_pred + 0.5:
                 result = "1"
@@ -854,7 +1009,9 @@ def generate_multi_match_predictions(teams, team_stats, data=None, num_matches=1
                 "Résultat": result,
                 "Gagnant": winner,
                 "Confiance": f"{confidence:.0f}%",
-                "Total Buts": f"{home_pred + away_pred:.1f}"
+                "Total Buts": f"{home_pred + away_pred:.1f}",
+                "Face-à-face": f"{h2h.h2h_wins:.0f}V-{h2h.h2h_draws:.0f}N-{h2h.h2h_losses:.0f}D"
+                if not np.isnan(h2h.h2h_wins) else "-"
             })
     
     return predictions
@@ -1197,16 +1354,18 @@ def show_bookmaker_odds(data, teams):
     if st.button("💰 VOIR LES COTES", type="primary"):
         if home_team and away_team and home_team != away_team:
             # Recherche des matchs historiques
-            historical_matches = data[
-                ((data['HomeTeam'] == home_team) & (data['AwayTeam'] == away_team)) |
-                ((data['HomeTeam'] == away_team) & (data['AwayTeam'] == home_team))
-            ]
+            if isinstance(data, MatchStore):
+                # Requête indexée sur la paire d'équipes
+                historical_matches = data.pair_matches(home_team, away_team, order='row')
+            else:
+                # Index des paires construit une fois: lecture des seules confrontations
+                historical_matches = match_features(data).pair_matches(home_team, away_team, order='row')
             
             if len(historical_matches) > 0:
                 st.success(f"✅ {len(historical_matches)} match(s) trouvé(s)")
                 
-                # Afficher les 3 derniers matchs
-                recent_matches = historical_matches.tail(3)
+                # Afficher les 3 derniers matchs (avec leurs cotes)
+                recent_matches = historical_matches.tail(3).join(load_odds())
                 
                 for idx, (_, match) in enumerate(recent_matches.iterrows()):
                     with st.expander(f"🏆 Match {idx+1} - {match['Date'].strftime('%d/%m/%Y')} - {match['HomeTeam']} vs {match['AwayTeam']}"):
@@ -1245,7 +1404,7 @@ def main():
     
     # Chargement des données
     with st.spinner("📊 Chargement des données..."):
-        data = load_data()
+        data = get_match_data()
     
     if data is None:
         st.stop()
@@ -1256,7 +1415,21 @@ def main():
     # Sidebar pour sélection des saisons
     st.sidebar.markdown("## 📅 Configuration")
     
-    available_seasons = sorted(data['Season'].unique())
+    # Contrôle de cohérence du dataset (scores, résultats, doublons, bornes, cotes)
+    report = validation_report()
+    if not report.ok:
+        st.sidebar.warning(f"⚠️ {len(report.invalid_rows)} lignes incohérentes dans le dataset")
+        with st.sidebar.expander("🔎 Détails de la validation"):
+            st.text(report.summary())
+    
+    # Nouvelle journée ajoutée au CSV: seules les nouvelles lignes sont parsées
+    if st.sidebar.button("🔄 Actualiser les données"):
+        loaders = [load_data, load_shared_data, load_partitions, open_match_store, load_match_features]
+        if refresh_dataset(open_match_table(), load_season_cube(), loaders):
+            st.rerun()
+    
+    partitions = load_partitions()
+    available_seasons = partitions.seasons()
     selected_seasons = st.sidebar.multiselect(
         "Saisons à analyser:",
         available_seasons,
@@ -1267,17 +1440,25 @@ def main():
         show_advanced_notification("Veuillez sélectionner au moins une saison pour continuer", "warning")
         st.stop()
     
+    # Seules les partitions des saisons sélectionnées sont lues (sélection gardée en cache)
+    season_data = load_match_features(dataset_version(), tuple(sorted(selected_seasons))).data
+    
     # Calcul des statistiques
     with st.spinner("📊 Calcul des statistiques..."):
-        team_stats = calculate_team_stats(data, selected_seasons)
+        team_stats = load_season_cube().team_profiles(selected_seasons)
         teams = sorted(team_stats.keys())
     
+    # Pondération temporelle optionnelle: moyennes de buts, tirs cadrés et corners à demi-vie
+    if st.sidebar.checkbox("⏳ Pondérer les matchs récents", value=False):
+        half_life = st.sidebar.slider("Demi-vie (jours):", 30, 720, DEFAULT_HALF_LIFE, step=30)
+        strengths = load_team_strengths(dataset_version(), half_life, tuple(sorted(selected_seasons)))
+        if strengths is not None:
+            team_stats = strengths.apply(team_stats)
+    
     # Métriques générales
     st.markdown("### 📊 Aperçu des Données")
     col1, col2, col3, col4 = st.columns(4)
     
-    season_data = data[data['Season'].isin(selected_seasons)]
-    
     with col1:
         show_metric_card("Matchs", len(season_data), "Total analysés")
     
@@ -1298,13 +1479,19 @@ def main():
         ["🔮 Prédiction Simple", "📅 Calendrier Multi-Matchs", "💰 Cotes Bookmakers", "📈 Historique & Performance"]
     )
     
+    # Recherches par équipe / paire: base SQLite indexée si configurée
+    match_source = open_match_store()
+    if match_source is None:
+        # Tables de features tenues par le cache, par version du dataset
+        match_source = load_match_features(dataset_version())
+    
     # Affichage selon la vue
     if view == "🔮 Prédiction Simple":
-        show_prediction_interface(data, selected_seasons, team_stats, teams)
+        show_prediction_interface(match_source, selected_seasons, team_stats, teams)
     elif view == "📅 Calendrier Multi-Matchs":
-        show_multi_match_interface(data, selected_seasons, team_stats, teams)
+        show_multi_match_interface(match_source, selected_seasons, team_stats, teams)
     elif view == "💰 Cotes Bookmakers":
-        show_bookmaker_odds(data, teams)
+        show_bookmaker_odds(match_source, teams)
     elif view == "📈 Historique & Performance":
         show_prediction_history_interface(data, selected_seasons)
 
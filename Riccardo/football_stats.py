@@ -0,0 +1,367 @@
+"""
+📈 FOOTBALL STATS - Statistiques d'équipes agrégées
+====================================================
+Agrégations groupées partagées par football_prediction_pro.py et
+football_prediction_advanced.py (sans dépendance à Streamlit): un passage
+sur les matchs au lieu d'un filtrage par équipe.
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+# Statistiques additives du cube, du point de vue de l'équipe: (mesure, colonne domicile, colonne extérieur)
+CUBE_STATS = [
+    ('goals', 'FTHG', 'FTAG'),
+    ('shots', 'HS', 'AS'),
+    ('shots_on_target', 'HST', 'AST'),
+    ('corners', 'HC', 'AC'),
+]
+CUBE_VENUES = ['home', 'away']
+
+
+def cube_measures():
+    """Mesures du cube: comptages de résultats, puis sommes pour / contre et nombre de valeurs présentes"""
+    measures = ['matches', 'wins', 'draws', 'losses', 'clean_sheets']
+    for name, _, _ in CUBE_STATS:
+        measures += [f"{name}_for", f"{name}_for_n", f"{name}_against", f"{name}_against_n"]
+    return measures
+
+
+def category_codes(series):
+    """Codes entiers et vocabulaire d'une colonne (catégorielle ou non)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Index(uniques)
+
+
+class SeasonCube:
+    """Statistiques suffisantes additives par (équipe, saison, terrain)
+
+    values[équipe, saison, terrain, mesure]: une sélection de saisons se résout en sommant
+    des tranches du cube, sans relire les matchs. Les comptages sont exacts (float64).
+    Le cube est additif: apply() ajoute un lot de matchs (nouveaux résultats) et retract()
+    le retire (résultat corrigé), à coût proportionnel au lot.
+    """
+
+    def __init__(self, teams=(), seasons=(), values=None):
+        self.teams = pd.Index(teams).astype(str)
+        self.seasons = pd.Index(seasons).astype(str)
+        self.measures = cube_measures()
+        if values is None:
+            values = np.zeros((len(self.teams), len(self.seasons), len(CUBE_VENUES), len(self.measures)))
+        self.values = values
+        self._lock = threading.RLock()
+        self._index_positions()
+
+    def _index_positions(self):
+        self._team_positions = {team: i for i, team in enumerate(self.teams)}
+        self._season_positions = {season: i for i, season in enumerate(self.seasons)}
+
+    @classmethod
+    def from_frame(cls, data):
+        """Construction en un passage sur les matchs"""
+        cube = cls()
+        cube.apply(data)
+        return cube
+
+    def _register(self, teams, seasons):
+        """Ajout des équipes (à la fin) et des saisons (dans l'ordre chronologique) inconnues"""
+        new_teams = [team for team in dict.fromkeys(teams) if team not in self._team_positions]
+        new_seasons = [season for season in dict.fromkeys(seasons) if season not in self._season_positions]
+        if not new_teams and not new_seasons:
+            return
+
+        values = self.values
+        if new_teams:
+            values = np.concatenate([values, np.zeros((len(new_teams),) + values.shape[1:])], axis=0)
+            self.teams = self.teams.append(pd.Index(new_teams, dtype=str))
+        if new_seasons:
+            seasons = sorted(list(self.seasons) + new_seasons)
+            grown = np.zeros((values.shape[0], len(seasons)) + values.shape[2:])
+            grown[:, [seasons.index(season) for season in self.seasons]] = values
+            values = grown
+            self.seasons = pd.Index(seasons, dtype=str)
+        self.values = values
+        self._index_positions()
+
+    def _positions(self, series, positions):
+        """Positions dans le cube des valeurs d'une colonne (-1 si manquante)"""
+        codes, vocabulary = category_codes(series)
+        # Seuls les codes présents dans le lot sont traduits; code -1 (manquant) -> dernière case
+        lookup = np.full(len(vocabulary) + 1, -1, dtype=np.int64)
+        for code in np.unique(codes[codes >= 0]):
+            lookup[code] = positions.get(str(vocabulary[code]), -1)
+        return lookup[np.where(codes >= 0, codes, len(vocabulary))]
+
+    def apply(self, data, sign=1):
+        """Ajout (sign=1) ou retrait (sign=-1) d'un lot de matchs
+
+        Seules les cellules (équipe, saison) touchées par le lot sont mises à jour.
+        """
+        if data is None or len(data) == 0:
+            return self
+        with self._lock:
+            present = lambda series: [str(value) for value in pd.unique(series.dropna())]
+            self._register(present(data['HomeTeam']) + present(data['AwayTeam']), present(data['Season']))
+
+            teams_home = self._positions(data['HomeTeam'], self._team_positions)
+            teams_away = self._positions(data['AwayTeam'], self._team_positions)
+            season_codes = self._positions(data['Season'], self._season_positions)
+            n_seasons = len(self.seasons)
+            cells = self.values.reshape(-1, len(CUBE_VENUES), len(self.measures))
+
+            result = data['FTR']
+            home_win, draw, away_win = [(result == code).to_numpy().astype(np.float64) for code in 'HDA']
+            outcomes = {'home': (home_win, draw, away_win), 'away': (away_win, draw, home_win)}
+
+            # Colonnes converties une seule fois: valeurs (0 si manquante), présence, clean sheet
+            stats = {}
+            for name, home_col, away_col in CUBE_STATS:
+                if home_col in data.columns and away_col in data.columns:
+                    for col in (home_col, away_col):
+                        values = data[col].to_numpy(dtype='float64', na_value=np.nan)
+                        present_values = ~np.isnan(values)
+                        stats[col] = (np.where(present_values, values, 0.0), present_values.astype(np.float64),
+                                      (present_values & (values == 0)).astype(np.float64))
+
+            for v, (venue, team_codes) in enumerate([('home', teams_home), ('away', teams_away)]):
+                valid = (team_codes >= 0) & (season_codes >= 0)
+                # Cellules distinctes du lot, puis une somme par cellule et par mesure
+                touched, inverse = np.unique(team_codes[valid] * n_seasons + season_codes[valid], return_inverse=True)
+
+                def add(measure, weights=None):
+                    sums = np.bincount(inverse, weights=None if weights is None else weights[valid],
+                                       minlength=len(touched))
+                    cells[touched, v, self.measures.index(measure)] += sign * sums
+
+                add('matches')
+                for measure, weights in zip(['wins', 'draws', 'losses'], outcomes[venue]):
+                    add(measure, weights)
+
+                for name, home_col, away_col in CUBE_STATS:
+                    if home_col not in stats:
+                        continue
+                    own, other = (home_col, away_col) if venue == 'home' else (away_col, home_col)
+                    for suffix, col in [('for', own), ('against', other)]:
+                        values, counted, zero = stats[col]
+                        add(f"{name}_{suffix}", values)
+                        add(f"{name}_{suffix}_n", counted)
+                        if name == 'goals' and suffix == 'against':
+                            add('clean_sheets', zero)
+        return self
+
+    def retract(self, data):
+        """Retrait d'un lot de matchs (ex. avant d'appliquer un résultat corrigé)"""
+        return self.apply(data, sign=-1)
+
+    def update(self, previous, current):
+        """Passage d'une version des matchs à la suivante (mêmes index de lignes)
+
+        Les lignes supprimées ou modifiées sont retirées, les lignes ajoutées ou corrigées
+        appliquées: le coût dépend du nombre de lignes qui changent.
+        """
+        columns = ['HomeTeam', 'AwayTeam', 'Season', 'FTR'] + [
+            col for _, home_col, away_col in CUBE_STATS for col in (home_col, away_col)
+        ]
+        columns = [col for col in columns if col in previous.columns and col in current.columns]
+        common = previous.index.intersection(current.index)
+
+        def comparable(series):
+            # Nombres en float64 (NaN pour les entiers nullables manquants), le reste en objets
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                return series.to_numpy(dtype='float64', na_value=np.nan)
+            return series.astype(object).to_numpy()
+
+        changed = np.zeros(len(common), dtype=bool)
+        for col in columns:
+            before = comparable(previous[col].reindex(common))
+            after = comparable(current[col].reindex(common))
+            changed |= ~((before == after) | (pd.isna(before) & pd.isna(after)))
+
+        removed = previous.index.difference(current.index).append(common[changed])
+        added = current.index.difference(previous.index).append(common[changed])
+        self.retract(previous.loc[removed])
+        self.apply(current.loc[added])
+        return self
+
+    def season_positions(self, seasons=None):
+        """Positions des saisons sélectionnées dans le cube (toutes si None)"""
+        if seasons is None:
+            return slice(None)
+        return [self._season_positions[season] for season in seasons if season in self._season_positions]
+
+    def totals(self, seasons=None):
+        """Sommes (équipe, terrain, mesure) sur les saisons sélectionnées"""
+        with self._lock:
+            return self.values[:, self.season_positions(seasons)].sum(axis=1)
+
+    def frame(self, seasons=None):
+        """Agrégats des saisons sélectionnées: une ligne par équipe ayant joué, colonnes terrain_mesure"""
+        totals = self.totals(seasons)
+        played = totals[:, :, 0].sum(axis=1) > 0
+        columns = [f"{venue}_{measure}" for venue in CUBE_VENUES for measure in self.measures]
+        return pd.DataFrame(totals[played].reshape(int(played.sum()), -1), index=self.teams[played], columns=columns)
+
+    def team_profiles(self, seasons=None):
+        """Profil étendu des équipes: clés de team_stats + buts marqués / encaissés, taux de nuls,
+        tirs et corners pour / contre, clean sheets, toutes saisons sélectionnées et par terrain
+
+        Calculé en une fois sur les tranches du cube (opérations vectorisées sur toutes les équipes).
+        """
+        totals = self.totals(seasons)
+        team_stats = self.team_stats(seasons)
+        if not team_stats:
+            return team_stats
+
+        def measure(name, venue=None):
+            values = totals[:, :, self.measures.index(name)]
+            return values.sum(axis=1) if venue is None else values[:, CUBE_VENUES.index(venue)]
+
+        def ratio(numerator, denominator):
+            # 0 quand il n'y a pas de donnée (comme les moyennes de team_stats)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(denominator > 0, numerator / denominator, 0.0)
+
+        fields = {}
+        for venue in [None] + CUBE_VENUES:
+            suffix = '' if venue is None else f"_{venue}"
+            matches = measure('matches', venue)
+            fields[f"draw_rate{suffix}"] = ratio(measure('draws', venue), matches)
+            fields[f"clean_sheets{suffix}"] = measure('clean_sheets', venue)
+            fields[f"clean_sheet_rate{suffix}"] = ratio(measure('clean_sheets', venue), measure('goals_against_n', venue))
+            fields[f"avg_goals_conceded{suffix}"] = ratio(measure('goals_against', venue), measure('goals_against_n', venue))
+            for name, _, _ in CUBE_STATS[1:]:
+                for side in ['for', 'against']:
+                    fields[f"avg_{name}_{side}{suffix}"] = ratio(
+                        measure(f"{name}_{side}", venue), measure(f"{name}_{side}_n", venue)
+                    )
+        matches = measure('matches')
+        fields['total_matches'] = matches
+        fields['wins'] = measure('wins')
+        fields['draws'] = measure('draws')
+        fields['losses'] = measure('losses')
+        fields['win_rate'] = ratio(measure('wins'), matches)
+        fields['avg_goals_scored'] = ratio(measure('goals_for'), measure('goals_for_n'))
+
+        counts = {'total_matches', 'wins', 'draws', 'losses', 'clean_sheets', 'clean_sheets_home', 'clean_sheets_away'}
+        positions = self._team_positions
+        for team, stats in team_stats.items():
+            i = positions[team]
+            for field, values in fields.items():
+                stats[field] = int(values[i]) if field in counts else float(values[i])
+        return team_stats
+
+    def team_stats(self, seasons=None):
+        """Statistiques domicile / extérieur de toutes les équipes (dict par équipe), à partir des tranches du cube"""
+        totals = self.totals(seasons)
+        matches, wins = self.measures.index('matches'), self.measures.index('wins')
+        goals, goals_n = self.measures.index('goals_for'), self.measures.index('goals_for_n')
+
+        team_stats = {}
+        for i in np.flatnonzero(totals[:, :, matches].sum(axis=1) > 0):
+            stats = {}
+            for v, venue in enumerate(CUBE_VENUES):
+                played, won = int(totals[i, v, matches]), int(totals[i, v, wins])
+                scored, counted = totals[i, v, goals], totals[i, v, goals_n]
+                stats[venue] = (played, won, won / played if played > 0 else 0,
+                                (scored / counted if counted > 0 else np.nan) if played > 0 else 0)
+            team_stats[self.teams[i]] = {
+                'total_home_matches': stats['home'][0],
+                'home_wins': stats['home'][1],
+                'home_win_rate': stats['home'][2],
+                'avg_goals_home': stats['home'][3],
+                'total_away_matches': stats['away'][0],
+                'away_wins': stats['away'][1],
+                'away_win_rate': stats['away'][2],
+                'avg_goals_away': stats['away'][3]
+            }
+        return team_stats
+
+
+# Statistiques pondérées dans le temps (attaque = pour, défense = contre) et demi-vie par défaut (jours)
+DECAY_STATS = [stat for stat in CUBE_STATS if stat[0] in ('goals', 'shots_on_target', 'corners')]
+DEFAULT_HALF_LIFE = 180
+
+
+def profile_field(name, side, venue=None):
+    """Clé de team_profiles de la moyenne d'une mesure (pour / contre), globale ou par terrain"""
+    suffix = '' if venue is None else f"_{venue}"
+    if name == 'goals' and side == 'for':
+        return 'avg_goals_scored' if venue is None else f"avg_goals{suffix}"
+    if name == 'goals':
+        return f"avg_goals_conceded{suffix}"
+    return f"avg_{name}_{side}{suffix}"
+
+
+class TeamStrengths:
+    """Forces d'attaque / de défense pondérées exponentiellement dans le temps
+
+    Le poids d'un match vaut 0.5 ** (âge en jours / demi-vie), l'âge étant mesuré à la
+    date de référence (dernier match par défaut). Les moyennes pondérées par équipe et
+    par terrain (buts, tirs cadrés, corners, pour et contre) sont calculées en un passage
+    par bincount; table a les colonnes de team_profiles qu'elles remplacent.
+    """
+
+    def __init__(self, table, half_life, reference):
+        self.table = table
+        self.half_life = half_life
+        self.reference = reference
+
+    @classmethod
+    def from_frame(cls, data, half_life=DEFAULT_HALF_LIFE, at=None):
+        """Forces à la date at (matchs strictement antérieurs), au dernier match par défaut"""
+        if at is not None:
+            data = data[data['Date'] < pd.Timestamp(at)]
+        reference = pd.Timestamp(at) if at is not None else data['Date'].max()
+        age = (reference - data['Date']).dt.total_seconds().to_numpy() / 86400
+        weights = np.nan_to_num(0.5 ** (age / half_life))
+
+        teams = pd.Index(sorted(set(data['HomeTeam'].dropna().astype(str)) | set(data['AwayTeam'].dropna().astype(str))))
+        sums = {}
+        for venue, team_col in zip(CUBE_VENUES, ['HomeTeam', 'AwayTeam']):
+            codes = teams.get_indexer(data[team_col].astype(str))
+            known = codes >= 0
+            sums[('weight', venue)] = np.bincount(codes[known], weights=weights[known], minlength=len(teams))
+            for name, home_col, away_col in DECAY_STATS:
+                if home_col not in data.columns or away_col not in data.columns:
+                    continue
+                own, other = (home_col, away_col) if venue == 'home' else (away_col, home_col)
+                for side, col in (('for', own), ('against', other)):
+                    values = data[col].to_numpy(dtype='float64', na_value=np.nan)
+                    valid = known & ~np.isnan(values)
+                    sums[(name, side, venue)] = (
+                        np.bincount(codes[valid], weights=weights[valid] * values[valid], minlength=len(teams)),
+                        np.bincount(codes[valid], weights=weights[valid], minlength=len(teams)),
+                    )
+
+        columns = {}
+        for venue in [None] + CUBE_VENUES:
+            venues = CUBE_VENUES if venue is None else [venue]
+            columns['weight' + ('' if venue is None else f"_{venue}")] = sum(sums[('weight', v)] for v in venues)
+            for name, _, _ in DECAY_STATS:
+                for side in ('for', 'against'):
+                    if (name, side, 'home') not in sums:
+                        continue
+                    total = sum(sums[(name, side, v)][0] for v in venues)
+                    weight = sum(sums[(name, side, v)][1] for v in venues)
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        columns[profile_field(name, side, venue)] = np.where(weight > 0, total / weight, np.nan)
+        return cls(pd.DataFrame(columns, index=teams), half_life, reference)
+
+    def team(self, team):
+        """Forces d'une équipe (dict, vide si inconnue)"""
+        if str(team) not in self.table.index:
+            return {}
+        return self.table.loc[str(team)].dropna().to_dict()
+
+    def apply(self, team_stats):
+        """Profils d'équipes dont les moyennes sont remplacées par les valeurs pondérées dans le temps"""
+        fields = [col for col in self.table.columns if not col.startswith('weight')]
+        table = self.table.reindex(list(team_stats))[fields]
+        weighted = {}
+        for team, values in zip(table.index, table.to_numpy()):
+            overrides = {field: float(value) for field, value in zip(fields, values) if not np.isnan(value)}
+            weighted[team] = {**team_stats[team], **overrides}
+        return weighted
@@ -0,0 +1,374 @@
+"""
+🗄️ FOOTBALL STORE - Stockage indexé des matchs
+===============================================
+Backends optionnels:
+- sqlite3 (bibliothèque standard): les recherches par équipe, par confrontation et
+  par saison deviennent des requêtes indexées au lieu de masques booléens sur tout le DataFrame.
+- fichiers .npy mappés en mémoire: plusieurs processus Streamlit partagent une seule
+  copie des colonnes principales, en lecture seule.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from football_data import is_nullable_integer
+from football_features import MatchFeatures
+
+# Colonnes copiées dans la base (l'index du DataFrame devient row_id)
+STORE_COLUMNS = [
+    'Div', 'Season', 'Date', 'HomeTeam', 'AwayTeam',
+    'FTHG', 'FTAG', 'FTR', 'HS', 'AS', 'HST', 'AST', 'HC', 'AC'
+]
+
+# Colonnes renvoyées par les recherches de matchs (forme, H2H, cotes): aucune requête en SELECT *
+MATCH_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']
+
+# Index couvrants: les requêtes de forme / H2H / avantage domicile ne lisent que l'index.
+# (équipe, Season, Date, row_id): le filtre de saisons et le tri (Season, Date, row_id)
+# sont servis par l'index, sans tri temporaire
+INDEXES = {
+    'idx_home_season_date': '(HomeTeam, Season, Date, row_id, AwayTeam, FTHG, FTAG)',
+    'idx_away_season_date': '(AwayTeam, Season, Date, row_id, HomeTeam, FTHG, FTAG)',
+    'idx_season': '(Season)',
+    'idx_pair_season_date': '(team_lo, team_hi, Season, Date, row_id, HomeTeam, AwayTeam, FTHG, FTAG)',
+}
+
+# Les saisons 'AAAA-AAAA' se trient comme leurs dates: trier par (Season, Date) équivaut à trier par Date
+NEWEST_FIRST = 'Season DESC, Date DESC, row_id DESC'
+
+
+class MatchStore:
+    """Matchs dans une base SQLite indexée sur (équipe, date), saison et paire d'équipes
+
+    view(seasons) renvoie une vue limitée à certaines saisons qui partage la même connexion.
+    """
+
+    def __init__(self, path=':memory:', seasons=None, _connection=None, _lock=None):
+        self.path = path
+        self.seasons = list(seasons) if seasons is not None else None
+        self.connection = _connection or sqlite3.connect(path, check_same_thread=False)
+        # Une connexion partagée entre les sessions Streamlit: accès sérialisés
+        self._lock = _lock or threading.Lock()
+        self._features = None
+        self._count = None
+
+    @classmethod
+    def from_frame(cls, data, path=':memory:', signature=None):
+        """Création d'une base à partir du DataFrame des matchs"""
+        store = cls(path)
+        store.load(data, signature)
+        return store
+
+    @classmethod
+    def open(cls, path, data, signature=None):
+        """Ouverture d'une base existante, rechargée si elle ne correspond plus au dataset
+
+        signature: clé de version du dataset (par défaut calculée à partir de data).
+        """
+        store = cls(path)
+        signature = signature or dataset_signature(data)
+        if store.signature() != signature or store._meta('indexes') != json.dumps(INDEXES):
+            # Nouveau dataset ou base créée avec d'autres index
+            store.load(data, signature)
+        return store
+
+    def view(self, seasons):
+        """Vue limitée aux saisons sélectionnées"""
+        return MatchStore(self.path, seasons, self.connection, self._lock)
+
+    def load(self, data, signature=None):
+        """(Re)chargement complet de la table des matchs et de ses index"""
+        table = pd.DataFrame(index=data.index)
+        for col in STORE_COLUMNS:
+            if col not in data.columns:
+                continue
+            series = data[col]
+            if col == 'Date':
+                # Texte ISO: l'ordre alphabétique est l'ordre chronologique
+                table[col] = series.dt.strftime('%Y-%m-%d')
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                table[col] = series.astype(str)
+            else:
+                table[col] = series
+
+        # Paire non ordonnée: (min, max) des deux noms d'équipes
+        home = data['HomeTeam'].astype(str).to_numpy()
+        away = data['AwayTeam'].astype(str).to_numpy()
+        home_first = home < away
+        table['team_lo'] = np.where(home_first, home, away)
+        table['team_hi'] = np.where(home_first, away, home)
+
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.execute("DROP TABLE IF EXISTS matches")
+            table.to_sql('matches', self.connection, index=True, index_label='row_id')
+            for name, columns in INDEXES.items():
+                cursor.execute(f"CREATE INDEX {name} ON matches {columns}")
+            cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            cursor.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [('signature', signature or dataset_signature(data)), ('indexes', json.dumps(INDEXES))]
+            )
+            self.connection.commit()
+
+    def signature(self):
+        """Signature du dataset chargé dans la base (None si base vide)"""
+        return self._meta('signature')
+
+    def _meta(self, key):
+        with self._lock:
+            try:
+                row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            except sqlite3.OperationalError:
+                return None
+        return row[0] if row else None
+
+    def _season_filter(self):
+        if self.seasons is None:
+            return '', []
+        placeholders = ', '.join('?' for _ in self.seasons)
+        return f" AND Season IN ({placeholders})", list(self.seasons)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            frame = pd.read_sql_query(sql, self.connection, params=params, index_col='row_id')
+        if 'Date' in frame.columns:
+            frame['Date'] = pd.to_datetime(frame['Date'], format='%Y-%m-%d')
+        frame.index.name = None
+        return frame
+
+    def __len__(self):
+        # Comptage mis en cache par signature: les tests de vacuité ne parcourent plus l'index de saison
+        signature = self.signature()
+        cached = self._count
+        if cached is None or cached[0] != signature:
+            season_sql, params = self._season_filter()
+            with self._lock:
+                row = self.connection.execute(f"SELECT COUNT(*) FROM matches WHERE 1 = 1{season_sql}",
+                                              params).fetchone()
+            cached = self._count = (signature, row[0])
+        return cached[1]
+
+    def frame(self, columns=STORE_COLUMNS):
+        """Matchs de la base (saisons de la vue) dans l'ordre des lignes source"""
+        season_sql, params = self._season_filter()
+        with self._lock:
+            present = {row[1] for row in self.connection.execute("PRAGMA table_info(matches)")}
+        # Noms entre guillemets: AS (tirs de l'équipe à l'extérieur) est un mot-clé SQL
+        select_sql = ', '.join(['row_id'] + [f'"{col}"' for col in columns if col in present])
+        return self._query(f"SELECT {select_sql} FROM matches WHERE 1 = 1{season_sql} ORDER BY row_id", params)
+
+    def features(self):
+        """Tables de features (MatchFeatures) des matchs de la vue, construites une fois par signature"""
+        signature = self.signature()
+        cached = self._features
+        if cached is None or cached[0] != signature:
+            cached = self._features = (signature, MatchFeatures(self.frame(['Div', 'Season'] + MATCH_COLUMNS)))
+        return cached[1]
+
+    def team_matches(self, team, last_n=None, columns=MATCH_COLUMNS):
+        """Derniers matchs d'une équipe (domicile + extérieur), triés par date croissante
+
+        columns: colonnes lues (par défaut celles de l'index couvrant, sans accès à la table).
+        """
+        sql, params = self._team_matches_sql(team, last_n, columns)
+        return self._query(sql, params)
+
+    def _team_matches_sql(self, team, last_n, columns):
+        season_sql, season_params = self._season_filter()
+        limit_sql = ' LIMIT ?' if last_n is not None else ''
+        limit_params = [int(last_n)] if last_n is not None else []
+        select_sql = ', '.join(['row_id', 'Season'] + [col for col in columns if col not in ('row_id', 'Season')])
+
+        # Chaque branche descend son index (équipe, saison, date) puis on garde les N plus récents
+        sql = f"""
+            SELECT {select_sql} FROM (
+                SELECT * FROM (SELECT {select_sql} FROM matches WHERE HomeTeam = ?{season_sql}
+                               ORDER BY {NEWEST_FIRST}{limit_sql})
+                UNION ALL
+                SELECT * FROM (SELECT {select_sql} FROM matches WHERE AwayTeam = ?{season_sql}
+                               ORDER BY {NEWEST_FIRST}{limit_sql})
+                ORDER BY {NEWEST_FIRST}{limit_sql}
+            ) ORDER BY Season, Date, row_id
+        """
+        return sql, ([team] + season_params + limit_params) * 2 + limit_params
+
+    def pair_matches(self, team_a, team_b, last_n=None, order='Date', columns=MATCH_COLUMNS):
+        """Confrontations entre deux équipes (quel que soit le terrain)
+
+        order='Date' trie par date, order='row' conserve l'ordre du fichier source.
+        """
+        sql, params = self._pair_matches_sql(team_a, team_b, last_n, order, columns)
+        return self._query(sql, params)
+
+    def _pair_matches_sql(self, team_a, team_b, last_n, order, columns):
+        team_lo, team_hi = sorted([str(team_a), str(team_b)])
+        season_sql, season_params = self._season_filter()
+        order_sql = NEWEST_FIRST if order == 'Date' else 'row_id DESC'
+        limit_sql = ' LIMIT ?' if last_n is not None else ''
+        limit_params = [int(last_n)] if last_n is not None else []
+        select_sql = ', '.join(['row_id', 'Season'] + [col for col in columns if col not in ('row_id', 'Season')])
+
+        sql = f"""
+            SELECT {select_sql} FROM (
+                SELECT {select_sql} FROM matches WHERE team_lo = ? AND team_hi = ?{season_sql}
+                ORDER BY {order_sql}{limit_sql}
+            ) ORDER BY {order_sql.replace(' DESC', '')}
+        """
+        return sql, [team_lo, team_hi] + season_params + limit_params
+
+    def venue_record(self, team, venue):
+        """(matchs joués, victoires) d'une équipe à domicile ('home') ou à l'extérieur ('away')"""
+        sql, params = self._venue_record_sql(team, venue)
+        with self._lock:
+            played, wins = self.connection.execute(sql, params).fetchone()
+        return played, wins
+
+    def _venue_record_sql(self, team, venue):
+        season_sql, season_params = self._season_filter()
+        if venue == 'home':
+            sql = f"SELECT COUNT(*), COALESCE(SUM(FTHG > FTAG), 0) FROM matches WHERE HomeTeam = ?{season_sql}"
+        else:
+            sql = f"SELECT COUNT(*), COALESCE(SUM(FTAG > FTHG), 0) FROM matches WHERE AwayTeam = ?{season_sql}"
+        return sql, [team] + season_params
+
+    def query_plan(self, sql, params=()):
+        """Plan d'exécution SQLite d'une requête (EXPLAIN QUERY PLAN): lignes de détail"""
+        with self._lock:
+            return [row[-1] for row in self.connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def dataset_signature(data):
+    """Signature simple du dataset (nombre de lignes et dernière date)"""
+    if data is None or len(data) == 0:
+        return '0'
+    return f"{len(data)}:{data['Date'].max():%Y-%m-%d}:{data.index.max()}"
+
+
+def export_shared_arrays(data, directory, key):
+    """Export des colonnes de data en fichiers .npy pour un mappage mémoire partagé
+
+    Les lignes sont triées par (Div, Season, Date) pour que chaque partition soit une
+    tranche contiguë; l'index d'origine est conservé (row_id). key identifie la version
+    du dataset: un processus ne s'attache qu'à un export de la même version.
+    Les exports d'autres versions ne sont pas touchés (processus encore attachés):
+    collect_shared_arrays() les supprime lors d'une étape de nettoyage séparée.
+    """
+    # Catégories exportées en codes + vocabulaire, le reste tel quel
+    columns = list(data.columns)
+
+    def sort_key(col):
+        series = data[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy()
+        return series.astype(str).to_numpy()
+
+    # np.lexsort: la dernière clé est la clé principale
+    order = np.lexsort((data['Date'].to_numpy(), sort_key('Season'), sort_key('Div')))
+    ordered = data.iloc[order]
+
+    # Écriture dans un sous-dossier temporaire renommé d'un bloc, puis bascule atomique du pointeur
+    version_dir = os.path.join(directory, key)
+    tmp_dir = f"{version_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    categories, masks = {}, []
+    np.save(os.path.join(tmp_dir, 'row_id.npy'), ordered.index.to_numpy(dtype=np.int64))
+    for col in columns:
+        series = ordered[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype) and not pd.api.types.is_numeric_dtype(series) \
+                and not pd.api.types.is_datetime64_any_dtype(series):
+            series = series.astype('category')
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories[col] = [str(value) for value in series.cat.categories]
+            values = series.cat.codes.to_numpy()
+        elif is_nullable_integer(series):
+            # Entiers nullables: valeurs (0 si manquante) + masque dans un second fichier
+            masks.append(col)
+            values = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+            np.save(os.path.join(tmp_dir, f"{col}.mask.npy"), series.isna().to_numpy())
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy(dtype='datetime64[ns]')
+        else:
+            values = series.to_numpy()
+        np.save(os.path.join(tmp_dir, f"{col}.npy"), np.ascontiguousarray(values))
+
+    with open(os.path.join(tmp_dir, 'schema.json'), 'w', encoding='utf-8') as f:
+        json.dump({'columns': columns, 'categories': categories, 'masks': masks}, f)
+
+    try:
+        os.replace(tmp_dir, version_dir)
+    except OSError:
+        # Même version déjà exportée par un autre processus (dossier non vide): elle est conservée
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isfile(os.path.join(version_dir, 'schema.json')):
+            raise
+
+    pointer = os.path.join(directory, 'current.json')
+    tmp_pointer = f"{pointer}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_pointer, 'w', encoding='utf-8') as f:
+        json.dump({'key': key}, f)
+    os.replace(tmp_pointer, pointer)
+
+    return version_dir
+
+
+def collect_shared_arrays(directory, keep=()):
+    """Suppression des exports qui ne sont plus la version courante (hors versions de keep)
+
+    À lancer quand plus aucun processus n'est attaché aux anciennes versions (redémarrage,
+    tâche planifiée): sous Windows, un fichier encore mappé ne peut pas être supprimé.
+    Les exports en cours d'écriture (.tmp) ne sont pas touchés. Renvoie les versions supprimées.
+    """
+    try:
+        with open(os.path.join(directory, 'current.json'), 'r', encoding='utf-8') as f:
+            keep = set(keep) | {json.load(f)['key']}
+    except (OSError, ValueError, KeyError):
+        # Sans pointeur valide, aucune version ne peut être déclarée obsolète
+        return []
+
+    removed = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and name not in keep and not name.endswith('.tmp'):
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
+
+
+def attach_shared_arrays(directory, key=None):
+    """DataFrame en lecture seule adossé aux fichiers .npy mappés (aucune copie par processus)
+
+    Renvoie None si aucun export n'existe ou si sa version ne correspond pas à key.
+    """
+    try:
+        with open(os.path.join(directory, 'current.json'), 'r', encoding='utf-8') as f:
+            current = json.load(f)['key']
+        if key is not None and current != key:
+            return None
+        version_dir = os.path.join(directory, current)
+        with open(os.path.join(version_dir, 'schema.json'), 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    def mapped(name):
+        return np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode='r')
+
+    values = {}
+    for col in schema['columns']:
+        array = mapped(col)
+        if col in schema['categories']:
+            # Codes écrits par export_shared_arrays: pas de validation (elle lirait tout le fichier)
+            # et le tableau mappé est utilisé tel quel, sans copie
+            values[col] = pd.Categorical.from_codes(array, categories=schema['categories'][col], validate=False)
+        elif col in schema.get('masks', ()):
+            values[col] = pd.arrays.IntegerArray(array, mapped(f"{col}.mask"))
+        else:
+            values[col] = array
+
+    return pd.DataFrame(values, index=pd.Index(mapped('row_id')), copy=False)
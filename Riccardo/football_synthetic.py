@@ -0,0 +1,291 @@
+"""
+🧪 FOOTBALL SYNTHETIC - Générateur de données pour les tests de charge
+=======================================================================
+Écrit des fichiers au schéma exact de dataset.csv (football-data.co.uk):
+ligues × saisons × équipes configurables, buts de Poisson, tirs / corners corrélés
+aux buts, cotes des bookmakers avec marge. La sortie est écrite par blocs
+(mémoire bornée, fichiers de plusieurs Go possibles) et déterministe pour une graine.
+
+Usage:
+    python football_synthetic.py synthetic.csv --leagues 20 --seasons 10 --teams 20 --seed 42
+    python football_synthetic.py synthetic_dir --split     # un fichier par division et saison
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+from football_validation import VALUE_RANGES
+
+# Colonnes de dataset.csv, dans le même ordre
+DATASET_COLUMNS = (
+    ['Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR',
+     'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+    + [f"{b}{m}" for b in ['B365', 'BW', 'PS', 'WH', 'Max', 'Avg'] for m in 'HDA']
+    + [f"{b}{m}" for b in ['B365', 'P', 'Max', 'Avg'] for m in ['>2.5', '<2.5']]
+    + ['AHh'] + [f"{b}{m}" for b in ['B365', 'P', 'Max', 'Avg'] for m in ['AHH', 'AHA']]
+    + [f"{b}C{m}" for b in ['B365', 'BW', 'PS', 'WH', 'Max', 'Avg'] for m in 'HDA']
+    + [f"{b}C{m}" for b in ['B365', 'P', 'Max', 'Avg'] for m in ['>2.5', '<2.5']]
+    + ['AHCh'] + [f"{b}C{m}" for b in ['B365', 'P', 'Max', 'Avg'] for m in ['AHH', 'AHA']]
+)
+
+# Codes de division utilisés pour les premières ligues générées (puis S01, S02, ...)
+DIVISIONS = ['B1', 'E0', 'E1', 'F1', 'D1', 'I1', 'SP1', 'N1', 'P1', 'T1', 'G1', 'SC0']
+
+# Marge de chaque bookmaker (somme des probabilités implicites)
+BOOKMAKER_MARGINS = {'B365': 1.055, 'BW': 1.06, 'PS': 1.03, 'WH': 1.065, 'P': 1.03}
+
+# Buts attendus de référence à domicile / à l'extérieur (moyennes du dataset réel)
+BASE_HOME_GOALS = 1.55
+BASE_AWAY_GOALS = 1.30
+
+# Horaires de coup d'envoi
+KICKOFF_TIMES = np.array(['15:00:00', '17:30:00', '18:15:00', '20:45:00'])
+
+# Nombre maximal de buts considéré pour les probabilités des cotes
+MAX_GOALS = 10
+
+# Saison générée du 26 juillet à fin mai (les saisons vont de juillet à juin), une journée par semaine au plus
+SEASON_START = '07-26'
+SEASON_DAYS = 306
+ROUND_DAYS = 7
+
+
+def division_codes(leagues):
+    """Codes de division des ligues générées"""
+    extra = [f"S{i:02d}" for i in range(1, max(0, leagues - len(DIVISIONS)) + 1)]
+    return (DIVISIONS + extra)[:leagues]
+
+
+def round_robin(teams):
+    """Calendrier aller-retour (méthode du cercle): liste de (domicile, extérieur) par journée"""
+    slots = list(range(teams)) + ([None] if teams % 2 else [])
+    n = len(slots)
+    rounds = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = slots[i], slots[n - 1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if (r + i) % 2 == 0 else (away, home))
+        rounds.append(pairs)
+        slots = [slots[0]] + [slots[-1]] + slots[1:-1]
+    # Matchs retour: mêmes affiches, terrains inversés
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def poisson_matrix(home_rate, away_rate):
+    """Probabilités jointes des scores (n, MAX_GOALS + 1, MAX_GOALS + 1), buts indépendants"""
+    goals = np.arange(MAX_GOALS + 1)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    home = np.exp(goals * np.log(home_rate[:, None]) - home_rate[:, None] - log_factorial)
+    away = np.exp(goals * np.log(away_rate[:, None]) - away_rate[:, None] - log_factorial)
+    return home[:, :, None] * away[:, None, :]
+
+
+def market_probabilities(home_rate, away_rate, handicap):
+    """Probabilités 1X2, plus de 2,5 buts et handicap asiatique (domicile) d'après le modèle"""
+    scores = poisson_matrix(home_rate, away_rate)
+    goals = np.arange(MAX_GOALS + 1)
+    diff = goals[:, None] - goals[None, :]
+    total = goals[:, None] + goals[None, :]
+
+    home_win = (scores * (diff > 0)).sum(axis=(1, 2))
+    draw = (scores * (diff == 0)).sum(axis=(1, 2))
+    away_win = 1.0 - home_win - draw
+    over = (scores * (total > 2.5)).sum(axis=(1, 2))
+
+    # Handicap asiatique: une ligne au quart est la moyenne des deux lignes voisines,
+    # un résultat nul sur la ligne (remboursement) compte pour moitié
+    def cover(line):
+        margin = diff[None, :, :] + line[:, None, None]
+        return (scores * ((margin > 0) + 0.5 * (margin == 0))).sum(axis=(1, 2))
+
+    lower, upper = np.floor(handicap * 2) / 2, np.ceil(handicap * 2) / 2
+    asian = (cover(lower) + cover(upper)) / 2
+
+    probabilities = np.column_stack([home_win, draw, away_win])
+    return probabilities, over, np.clip(asian, 0.02, 0.98)
+
+
+def bookmaker_odds(probabilities, margin, rng, noise=0.03):
+    """Cotes d'un bookmaker: probabilités bruitées, renormalisées puis majorées de la marge"""
+    noisy = probabilities * rng.lognormal(0.0, noise, probabilities.shape)
+    noisy = noisy / noisy.sum(axis=1, keepdims=True) * margin
+    return np.maximum(np.round(1.0 / noisy, 2), 1.01)
+
+
+def odds_columns(probabilities, over, asian, handicap, rng, closing=False):
+    """Colonnes de cotes 1X2, plus/moins 2,5 buts et handicap asiatique"""
+    tag = 'C' if closing else ''
+    columns = {}
+    quotes = {}
+    for bookmaker in ['B365', 'BW', 'PS', 'WH']:
+        quotes[bookmaker] = bookmaker_odds(probabilities, BOOKMAKER_MARGINS[bookmaker], rng)
+    stacked = np.stack(list(quotes.values()))
+    quotes['Max'] = stacked.max(axis=0)
+    quotes['Avg'] = np.round(stacked.mean(axis=0), 2)
+    for bookmaker, values in quotes.items():
+        for i, market in enumerate('HDA'):
+            columns[f"{bookmaker}{tag}{market}"] = values[:, i]
+
+    two_way = {'>2.5': np.column_stack([over, 1.0 - over]), 'AH': np.column_stack([asian, 1.0 - asian])}
+    for market, probs in two_way.items():
+        quotes = {bookmaker: bookmaker_odds(probs, BOOKMAKER_MARGINS[bookmaker], rng) for bookmaker in ['B365', 'P']}
+        stacked = np.stack(list(quotes.values()))
+        quotes['Max'] = stacked.max(axis=0)
+        quotes['Avg'] = np.round(stacked.mean(axis=0), 2)
+        if market == 'AH':
+            columns[f"AH{tag}h"] = handicap
+        for bookmaker, values in quotes.items():
+            if market == '>2.5':
+                columns[f"{bookmaker}{tag}>2.5"] = values[:, 0]
+                columns[f"{bookmaker}{tag}<2.5"] = values[:, 1]
+            else:
+                columns[f"{bookmaker}{tag}AHH"] = values[:, 0]
+                columns[f"{bookmaker}{tag}AHA"] = values[:, 1]
+    return columns
+
+
+def generate_season(div, year, team_names, attack, defence, home_advantage, rng):
+    """Une saison complète d'une division (DataFrame au schéma de dataset.csv)"""
+    rounds = round_robin(len(team_names))
+    home = np.array([h for pairs in rounds for h, _ in pairs])
+    away = np.array([a for pairs in rounds for _, a in pairs])
+    round_index = np.repeat(np.arange(len(rounds)), [len(pairs) for pairs in rounds])
+    n = len(home)
+
+    # Une journée par semaine à partir de fin juillet, matchs étalés du vendredi au lundi;
+    # avec trop de journées pour tenir dans la saison, des journées en milieu de semaine
+    # resserrent le calendrier (écart moyen SEASON_DAYS / journées)
+    if len(rounds) > SEASON_DAYS:
+        raise ValueError(f"{len(team_names)} équipes: {len(rounds)} journées ne tiennent pas dans une saison")
+    spacing = min(ROUND_DAYS, SEASON_DAYS / len(rounds))
+    spread = min(4, int(spacing))
+    start = np.datetime64(f"{year}-{SEASON_START}")
+    days = np.floor(round_index * spacing).astype('int64') + rng.integers(0, spread, n)
+    dates = start + days.astype('timedelta64[D]')
+
+    # Buts: Poisson de paramètres attaque × défense adverse (× avantage du terrain)
+    home_rate = np.clip(BASE_HOME_GOALS * home_advantage * attack[home] * defence[away], 0.2, 4.5)
+    away_rate = np.clip(BASE_AWAY_GOALS * attack[away] * defence[home], 0.2, 4.5)
+    fthg = rng.poisson(home_rate)
+    ftag = rng.poisson(away_rate)
+    hthg = rng.binomial(fthg, 0.45)
+    htag = rng.binomial(ftag, 0.45)
+
+    # Tirs cadrés >= buts, tirs >= tirs cadrés, corners corrélés au volume de tirs
+    hst = fthg + rng.poisson(1.5 + 1.1 * home_rate)
+    ast = ftag + rng.poisson(1.5 + 1.1 * away_rate)
+    hs = hst + rng.poisson(4.0 + 2.4 * home_rate)
+    as_ = ast + rng.poisson(4.0 + 2.4 * away_rate)
+    hc = rng.poisson(0.3 * hs + 1.4)
+    ac = rng.poisson(0.3 * as_ + 1.2)
+    hf = rng.poisson(11.7, n)
+    af = rng.poisson(12.5, n)
+    hy = rng.poisson(0.15 * hf)
+    ay = rng.poisson(0.17 * af)
+    hr = rng.poisson(0.1, n)
+    ar = rng.poisson(0.13, n)
+    # Cartons bornés comme dans la validation (une queue de Poisson peut dépasser le maximum)
+    hy, ay = np.clip(hy, *VALUE_RANGES['HY']), np.clip(ay, *VALUE_RANGES['AY'])
+    hr, ar = np.clip(hr, *VALUE_RANGES['HR']), np.clip(ar, *VALUE_RANGES['AR'])
+
+    def result(home_goals, away_goals):
+        return np.where(home_goals > away_goals, 'H', np.where(home_goals < away_goals, 'A', 'D'))
+
+    columns = {
+        'Div': np.full(n, div), 'Date': np.datetime_as_string(dates, unit='D'),
+        'Time': KICKOFF_TIMES[rng.integers(0, len(KICKOFF_TIMES), n)],
+        'HomeTeam': team_names[home], 'AwayTeam': team_names[away],
+        'FTHG': fthg, 'FTAG': ftag, 'FTR': result(fthg, ftag),
+        'HTHG': hthg, 'HTAG': htag, 'HTR': result(hthg, htag),
+        'HS': hs, 'AS': as_, 'HST': hst, 'AST': ast, 'HF': hf, 'AF': af,
+        'HC': hc, 'AC': ac, 'HY': hy, 'AY': ay, 'HR': hr, 'AR': ar,
+    }
+
+    # Cotes d'ouverture puis de clôture (modèle légèrement révisé avant le match)
+    handicap = -np.round((home_rate - away_rate) * 4) / 4
+    probabilities, over, asian = market_probabilities(home_rate, away_rate, handicap)
+    columns.update(odds_columns(probabilities, over, asian, handicap, rng))
+    drift = rng.lognormal(0.0, 0.06, (2, n))
+    closing_home, closing_away = home_rate * drift[0], away_rate * drift[1]
+    closing_handicap = -np.round((closing_home - closing_away) * 4) / 4
+    probabilities, over, asian = market_probabilities(closing_home, closing_away, closing_handicap)
+    columns.update(odds_columns(probabilities, over, asian, closing_handicap, rng, closing=True))
+
+    data = pd.DataFrame(columns)
+    # Le CSV d'origine stocke les statistiques en flottants (1.0, 0.0, ...)
+    stats = ['FTHG', 'FTAG', 'HTHG', 'HTAG', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+    data[stats] = data[stats].astype('float64')
+    return data.sort_values(['Date', 'Time'], kind='stable')[DATASET_COLUMNS]
+
+
+def generate_matches(leagues=1, seasons=5, teams=18, start_year=2015, seed=42):
+    """Blocs (div, saison, DataFrame) d'une division-saison chacun, dans l'ordre chronologique
+
+    Chaque bloc a son propre générateur dérivé de (seed, ligue, saison): le résultat
+    ne dépend que des paramètres, pas de l'ordre de consommation des blocs.
+    """
+    divisions = division_codes(leagues)
+    # Forces initiales des équipes (attaque / défense), qui évoluent d'une saison à l'autre
+    strengths = []
+    for league in range(leagues):
+        rng = np.random.default_rng([seed, league])
+        strengths.append((rng.lognormal(0.0, 0.15, teams), rng.lognormal(0.0, 0.15, teams), rng.uniform(0.95, 1.1)))
+
+    for season in range(seasons):
+        year = start_year + season
+        for league, div in enumerate(divisions):
+            rng = np.random.default_rng([seed, league, season])
+            attack, defence, home_advantage = strengths[league]
+            attack = attack * rng.lognormal(0.0, 0.08, teams)
+            defence = defence * rng.lognormal(0.0, 0.08, teams)
+            strengths[league] = (attack, defence, home_advantage)
+
+            team_names = np.array([f"{div} Team {i + 1:02d}" for i in range(teams)])
+            data = generate_season(div, year, team_names, attack, defence, home_advantage, rng)
+            yield div, f"{year}-{year + 1}", data
+
+
+def write_synthetic_dataset(path, leagues=1, seasons=5, teams=18, start_year=2015, seed=42, split=False):
+    """Écriture en continu du dataset synthétique; renvoie le nombre de lignes écrites
+
+    split=False: un seul CSV (schéma de dataset.csv); split=True: un CSV par division
+    et saison dans le dossier path (format attendu par FOOTBALL_DATA_DIR).
+    Un seul bloc division-saison est en mémoire à la fois.
+    """
+    rows = 0
+    if split:
+        os.makedirs(path, exist_ok=True)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pd.DataFrame(columns=DATASET_COLUMNS).to_csv(path, index=False)
+
+    for div, season, data in generate_matches(leagues, seasons, teams, start_year, seed):
+        if split:
+            data.to_csv(os.path.join(path, f"{div}_{season}.csv"), index=False)
+        else:
+            data.to_csv(path, mode='a', header=False, index=False)
+        rows += len(data)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de données football synthétiques")
+    parser.add_argument('path', help="fichier CSV de sortie (ou dossier avec --split)")
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--seasons', type=int, default=5)
+    parser.add_argument('--teams', type=int, default=18)
+    parser.add_argument('--start-year', type=int, default=2015)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--split', action='store_true', help="un fichier par division et saison")
+    args = parser.parse_args()
+
+    rows = write_synthetic_dataset(args.path, args.leagues, args.seasons, args.teams,
+                                   args.start_year, args.seed, args.split)
+    print(f"✅ {rows} matchs écrits dans {args.path}")
+
+
+if __name__ == '__main__':
+    main()
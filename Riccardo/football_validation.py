@@ -0,0 +1,288 @@
+"""
+🔎 FOOTBALL VALIDATION - Contrôle complet du dataset
+=====================================================
+Validation vectorisée de toute la table en une passe (sans dépendance à Streamlit):
+schéma et types, bornes des statistiques, cohérence des résultats, doublons,
+ordre des dates et cotes. Le résultat est un rapport structuré (un enregistrement
+par contrôle en échec) utilisable pour bloquer ou signaler une ingestion.
+"""
+
+import numpy as np
+import pandas as pd
+from football_data import STAT_COLUMNS, TEXT_COLUMNS, CORE_COLUMNS, ODDS_PATTERN, column_group
+
+# Colonnes indispensables aux applications
+REQUIRED_COLUMNS = ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR']
+
+# Bornes plausibles des statistiques de match (incluses)
+VALUE_RANGES = {
+    'FTHG': (0, 20), 'FTAG': (0, 20), 'HTHG': (0, 15), 'HTAG': (0, 15),
+    'HS': (0, 60), 'AS': (0, 60), 'HST': (0, 40), 'AST': (0, 40),
+    'HF': (0, 50), 'AF': (0, 50), 'HC': (0, 30), 'AC': (0, 30),
+    'HY': (0, 12), 'AY': (0, 12), 'HR': (0, 5), 'AR': (0, 5),
+}
+
+# Paires (tirs, tirs cadrés): les tirs cadrés ne peuvent pas dépasser les tirs
+SHOT_PAIRS = [('HS', 'HST'), ('AS', 'AST')]
+
+# Résultats (plein temps / mi-temps) et scores correspondants
+RESULT_COLUMNS = [('FTR', 'FTHG', 'FTAG'), ('HTR', 'HTHG', 'HTAG')]
+RESULT_SIGN = {'H': 1, 'D': 0, 'A': -1}
+
+# Cote minimale acceptée et bornes de la marge (somme des probabilités implicites 1X2)
+MIN_ODDS = 1.01
+OVERROUND_RANGE = (0.97, 1.35)
+
+# Meilleures cotes du marché: leur marge est normalement inférieure à 1, pas de contrôle de marge
+BEST_PRICE_PREFIXES = ('Max', 'BbMx')
+
+# Nombre d'index de lignes conservés comme exemples par contrôle
+SAMPLE_SIZE = 5
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+class ValidationReport:
+    """Rapport de validation: un enregistrement par contrôle en échec
+
+    issues: DataFrame (check, severity, column, count, sample, message).
+    invalid_rows: index des lignes concernées par au moins une erreur.
+    """
+
+    def __init__(self, issues, invalid_rows, rows):
+        self.issues = issues
+        self.invalid_rows = invalid_rows
+        self.rows = rows
+
+    @property
+    def ok(self):
+        """Aucune erreur (les avertissements sont tolérés)"""
+        return not (self.issues['severity'] == ERROR).any()
+
+    def errors(self):
+        return self.issues[self.issues['severity'] == ERROR]
+
+    def warnings(self):
+        return self.issues[self.issues['severity'] == WARNING]
+
+    def to_dict(self):
+        """Rapport sérialisable (JSON)"""
+        return {
+            'rows': self.rows,
+            'invalid_rows': len(self.invalid_rows),
+            'ok': self.ok,
+            'issues': self.issues.to_dict('records'),
+        }
+
+    def summary(self):
+        """Rapport lisible, une ligne par contrôle"""
+        lines = [f"{self.rows} lignes contrôlées, {len(self.invalid_rows)} lignes en erreur"]
+        for issue in self.issues.itertuples(index=False):
+            icon = '❌' if issue.severity == ERROR else '⚠️'
+            column = f" [{issue.column}]" if issue.column else ''
+            sample = f" ex. lignes {issue.sample}" if issue.sample else ''
+            lines.append(f"{icon} {issue.check}{column}: {issue.message} ({issue.count}){sample}")
+        if len(self.issues) == 0:
+            lines.append("✅ Aucun problème détecté")
+        return '\n'.join(lines)
+
+
+class _Collector:
+    """Accumulation des contrôles en échec et des lignes en erreur"""
+
+    def __init__(self, data):
+        self.index = data.index
+        self.records = []
+        self.invalid = np.zeros(len(data), dtype=bool)
+
+    def add(self, check, severity, message, mask=None, column=None, count=None):
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            count = int(mask.sum())
+            if count == 0:
+                return
+            sample = self.index[np.flatnonzero(mask)[:SAMPLE_SIZE]].tolist()
+            if severity == ERROR:
+                self.invalid |= mask
+        else:
+            sample = []
+        self.records.append({
+            'check': check, 'severity': severity, 'column': column or '',
+            'count': count if count is not None else 0, 'sample': sample, 'message': message,
+        })
+
+    def report(self):
+        issues = pd.DataFrame(self.records, columns=['check', 'severity', 'column', 'count', 'sample', 'message'])
+        return ValidationReport(issues, self.index[self.invalid], len(self.index))
+
+
+def numeric_values(series):
+    """Valeurs float64 d'une colonne (NaN pour les valeurs non numériques)"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def check_schema(data, collector):
+    """Colonnes obligatoires, types et colonnes inconnues"""
+    for col in REQUIRED_COLUMNS:
+        if col not in data.columns:
+            collector.add('schema', ERROR, "colonne obligatoire absente", column=col)
+        elif data[col].isna().any():
+            collector.add('missing', ERROR, "valeurs manquantes", data[col].isna(), column=col)
+
+    if 'Date' in data.columns and not pd.api.types.is_datetime64_any_dtype(data['Date']):
+        collector.add('dtype', ERROR, "dates non converties en datetime", column='Date')
+
+    for col in STAT_COLUMNS:
+        if col in data.columns and not pd.api.types.is_numeric_dtype(data[col]):
+            # Valeurs non numériques dans une colonne de statistiques
+            bad = data[col].notna().to_numpy() & np.isnan(numeric_values(data[col]))
+            collector.add('dtype', ERROR, "valeurs non numériques", bad, column=col)
+
+    for col in TEXT_COLUMNS:
+        if col in data.columns and pd.api.types.is_numeric_dtype(data[col]) and data[col].notna().any():
+            collector.add('dtype', WARNING, "colonne texte lue comme numérique", column=col)
+
+    known = set(STAT_COLUMNS) | set(TEXT_COLUMNS) | set(CORE_COLUMNS)
+    unknown = [col for col in data.columns if col not in known and column_group(col) == 'other']
+    if unknown:
+        collector.add('schema', WARNING, f"colonnes inconnues: {', '.join(map(str, unknown[:10]))}",
+                      count=len(unknown))
+
+
+def check_ranges(data, collector):
+    """Bornes des buts, tirs, fautes, corners et cartons"""
+    for col, (low, high) in VALUE_RANGES.items():
+        if col not in data.columns:
+            continue
+        values = numeric_values(data[col])
+        with np.errstate(invalid='ignore'):
+            out = (values < low) | (values > high) | (np.mod(values, 1) != 0)
+        collector.add('range', ERROR, f"valeurs hors de [{low}, {high}] ou non entières", out & ~np.isnan(values),
+                      column=col)
+
+    for shots, on_target in SHOT_PAIRS:
+        if shots in data.columns and on_target in data.columns:
+            with np.errstate(invalid='ignore'):
+                bad = numeric_values(data[on_target]) > numeric_values(data[shots])
+            collector.add('range', ERROR, f"{on_target} supérieur à {shots}", bad, column=on_target)
+
+    if all(col in data.columns for col in ['FTHG', 'FTAG', 'HTHG', 'HTAG']):
+        with np.errstate(invalid='ignore'):
+            bad = (numeric_values(data['HTHG']) > numeric_values(data['FTHG'])) | \
+                  (numeric_values(data['HTAG']) > numeric_values(data['FTAG']))
+        collector.add('range', ERROR, "score à la mi-temps supérieur au score final", bad, column='HTHG/HTAG')
+
+
+def check_results(data, collector):
+    """FTR cohérent avec FTHG/FTAG et HTR avec HTHG/HTAG"""
+    for result, home, away in RESULT_COLUMNS:
+        if not all(col in data.columns for col in (result, home, away)):
+            continue
+        # Conversion au niveau des catégories (rapide sur une colonne catégorielle)
+        sign = data[result].map(RESULT_SIGN).to_numpy(dtype='float64', na_value=np.nan)
+        known = data[result].notna().to_numpy()
+        collector.add('result', ERROR, "résultat différent de H/D/A", known & np.isnan(sign), column=result)
+
+        diff = numeric_values(data[home]) - numeric_values(data[away])
+        valid = ~np.isnan(sign) & ~np.isnan(diff)
+        collector.add('result', ERROR, f"{result} incohérent avec {home}/{away}",
+                      valid & (np.sign(diff) != sign), column=result)
+
+
+def check_fixtures(data, collector):
+    """Doublons de matchs et dates non croissantes"""
+    if not all(col in data.columns for col in ['Date', 'HomeTeam', 'AwayTeam']):
+        return
+
+    keys = [col for col in ['Div', 'Date', 'HomeTeam', 'AwayTeam'] if col in data.columns]
+    collector.add('duplicate', ERROR, "match en double (même date et mêmes équipes)",
+                  data.duplicated(subset=keys, keep='first'))
+
+    dates = data['Date']
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        return
+    # Ordre vérifié par division (un fichier par division), croissant ou décroissant:
+    # le sens dominant de chaque division fait foi, les pas dans l'autre sens sont signalés
+    groups = data['Div'] if 'Div' in data.columns else pd.Series(0, index=data.index)
+    step = np.sign(dates.groupby(groups, observed=True, sort=False).diff().dt.days.fillna(0))
+    direction = np.sign(step.groupby(groups, observed=True, sort=False).transform('sum'))
+    collector.add('date_order', WARNING, "dates non monotones (sens opposé au reste de la division)",
+                  (step * direction < 0).to_numpy(), column='Date')
+
+
+def odds_triples(columns):
+    """Colonnes de cotes 1X2 regroupées par bookmaker: {préfixe: (H, D, A)}, meilleures cotes exclues"""
+    triples = {}
+    for col in columns:
+        match = ODDS_PATTERN.match(str(col))
+        if match and match.group('market') == 'H' and not str(col).startswith(BEST_PRICE_PREFIXES):
+            prefix = col[:-1]
+            if f"{prefix}D" in columns and f"{prefix}A" in columns:
+                triples[prefix] = (col, f"{prefix}D", f"{prefix}A")
+    return triples
+
+
+def check_odds(data, collector):
+    """Cotes inférieures à MIN_ODDS et marge 1X2 hors bornes"""
+    columns = set(map(str, data.columns))
+    for col in data.columns:
+        match = ODDS_PATTERN.match(str(col))
+        if match is None or match.group('market') is None:
+            continue
+        values = numeric_values(data[col])
+        with np.errstate(invalid='ignore'):
+            # Tolérance pour les cotes stockées en float32 (1.01 -> 1.0099999)
+            collector.add('odds', ERROR, f"cote inférieure à {MIN_ODDS}", values < MIN_ODDS - 1e-6, column=col)
+
+    low, high = OVERROUND_RANGE
+    for prefix, triple in odds_triples(columns).items():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overround = sum(1.0 / numeric_values(data[col]) for col in triple)
+            bad = (overround < low) | (overround > high)
+        collector.add('overround', WARNING, f"marge 1X2 hors de [{low}, {high}]", bad & np.isfinite(overround),
+                      column=prefix)
+
+
+def validate_matches(data):
+    """Validation complète du dataset en une passe vectorisée"""
+    collector = _Collector(data)
+    check_schema(data, collector)
+    check_ranges(data, collector)
+    check_results(data, collector)
+    check_fixtures(data, collector)
+    check_odds(data, collector)
+    return collector.report()
+
+
+# Contrôles applicables aux colonnes d'un seul groupe (voir football_data.COLUMN_GROUPS)
+GROUP_CHECKS = {
+    'core': [check_schema, check_ranges, check_results, check_fixtures],
+    'match_stats': [check_ranges],
+    'odds_1x2': [check_odds],
+    'odds_ou': [check_odds],
+    'odds_ah': [check_odds],
+    'odds_closing': [check_odds],
+}
+
+
+def validate_group(name, data):
+    """Validation d'un groupe de colonnes à son chargement (validator de MatchTable / MatchDirectory)"""
+    collector = _Collector(data)
+    for check in GROUP_CHECKS.get(name, []):
+        check(data, collector)
+    return collector.report()
+
+
+def combine_reports(reports):
+    """Rapport unique à partir des rapports de plusieurs groupes (mêmes lignes)"""
+    reports = list(reports)
+    if not reports:
+        return _Collector(pd.DataFrame()).report()
+    issues = pd.concat([report.issues for report in reports], ignore_index=True)
+    invalid_rows = reports[0].invalid_rows
+    for report in reports[1:]:
+        invalid_rows = invalid_rows.union(report.invalid_rows)
+    return ValidationReport(issues, invalid_rows, max(report.rows for report in reports))
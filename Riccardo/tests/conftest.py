@@ -0,0 +1,29 @@
+"""Configuration pytest: les modules football_* sont importés à plat depuis Riccardo/"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _make_matches(rows, seasons='2023-2024', **columns):
+    """DataFrame de matchs à partir de tuples (date, domicile, extérieur, buts dom., buts ext.)
+
+    seasons: saison de tous les matchs ou une saison par match; columns: colonnes ajoutées ou remplacées.
+    """
+    data = pd.DataFrame(rows, columns=['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'])
+    data.insert(0, 'Div', 'B1')
+    data.insert(1, 'Season', seasons)
+    data['Date'] = pd.to_datetime(data['Date']).dt.as_unit('ns')
+    for col, values in columns.items():
+        data[col] = values
+    return data
+
+
+@pytest.fixture(scope='session')
+def make_matches():
+    """Fabrique de petits DataFrame de matchs partagée par les tests"""
+    return _make_matches
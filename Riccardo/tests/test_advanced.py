@@ -0,0 +1,40 @@
+"""Tests des calculs de forme de l'application avancée (football_prediction_advanced)
+
+L'application importe Streamlit, Plotly, scikit-learn et XGBoost: les tests sont ignorés sans eux.
+"""
+
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('plotly')
+pytest.importorskip('sklearn')
+pytest.importorskip('xgboost')
+
+import football_prediction_advanced as advanced  # noqa: E402
+from football_features import MatchFeatures  # noqa: E402
+from football_store import MatchStore  # noqa: E402
+
+
+@pytest.fixture
+def matches(make_matches):
+    return make_matches([
+        ('2023-08-05', 'Anvers', 'Bruges', 2, 1),
+        ('2023-08-12', 'Bruges', 'Anvers', 0, 0),
+        ('2023-08-19', 'Anvers', 'Genk', 1, 3),
+    ], FTR=['H', 'D', 'A'])
+
+
+@pytest.mark.parametrize('source', ['frame', 'features', 'store'])
+def test_recent_form_same_for_every_source(matches, source):
+    data = {'frame': lambda: matches, 'features': lambda: MatchFeatures(matches),
+            'store': lambda: MatchStore.from_frame(matches)}[source]()
+
+    form = advanced.calculate_recent_form(data, 'Anvers', 5)
+    assert (form['recent_wins'], form['recent_draws'], form['recent_losses']) == (1, 1, 1)
+    assert (form['recent_goals_for'], form['recent_goals_against']) == (3, 4)
+    assert form['recent_form_score'] == round(4 / 9 * 100, 1)
+    assert advanced.calculate_recent_form(data, 'Inconnu', 5) == advanced.NEUTRAL_RECENT_FORM
+
+
+def test_recent_form_neutral_without_data():
+    assert advanced.calculate_recent_form(None, 'Anvers') == advanced.NEUTRAL_RECENT_FORM
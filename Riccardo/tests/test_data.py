@@ -0,0 +1,394 @@
+"""Tests du chargement des fichiers football-data (football_data)"""
+
+import glob
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import football_data
+from football_data import (COLUMN_GROUPS, FILE_ROW_SPAN, MAX_CACHE_CHUNKS, SNIFF_BYTES, TEAM_ALIASES,
+                           MatchDirectory, MatchTable, TeamRegistry, compact_matches, memory_report,
+                           open_dataset, parse_dataset, read_cache, refresh_dataset, save_cache, season_cube,
+                           shared_matches, sniff_encoding)
+from football_stats import SeasonCube
+from football_validation import validate_group
+
+HEADER = 'Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR\n'
+
+
+def write_matches(path, rows, encoding='utf-8'):
+    with open(path, 'wb') as f:
+        f.write(HEADER.encode('ascii'))
+    append_matches(path, rows, encoding)
+
+
+def append_matches(path, rows, encoding='utf-8'):
+    with open(path, 'ab') as f:
+        for row in rows:
+            f.write((','.join(row) + '\n').encode(encoding))
+
+
+def matchday(day, teams=('Anvers', 'Genk', 'Gand', 'Bruges')):
+    """Deux matchs joués le jour day (1 à 28) du mois d'août 2023"""
+    date = f"2023-08-{day:02d}"
+    return [['B1', date, teams[0], teams[1], '1', '0', 'H'], ['B1', date, teams[2], teams[3], '2', '2', 'D']]
+
+
+def test_late_latin1_row_is_not_replaced(tmp_path):
+    # Préfixe examiné en pur ASCII, puis un nom d'équipe latin-1 au-delà
+    filler = ['B1', '2023-08-05', 'Anvers', 'Genk', '1', '0', 'H']
+    rows = [filler] * (SNIFF_BYTES // 30 + 10)
+    rows.append(['B1', '2023-08-12', 'Liège', 'Genk', '2', '2', 'D'])
+    path = tmp_path / 'B1.csv'
+    write_matches(path, rows, 'latin-1')
+
+    assert sniff_encoding(path) == 'utf-8'
+    data = parse_dataset(path)
+    assert len(data) == len(rows)
+    assert data['HomeTeam'].iloc[-1] == 'Liège'
+    assert not data['HomeTeam'].str.contains('�').any()
+
+
+def test_utf8_file_is_read_as_utf8(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, [['B1', '2023-08-12', 'Liège', 'Genk', '2', '2', 'D']], 'utf-8')
+
+    assert parse_dataset(path)['HomeTeam'].iloc[0] == 'Liège'
+
+
+def test_directory_refresh_keeps_row_labels(tmp_path):
+    write_matches(tmp_path / 'A.csv', matchday(1) + matchday(8))
+    write_matches(tmp_path / 'B.csv', matchday(2, ('Mons', 'Eupen', 'Lierse', 'Malines')))
+    directory = MatchDirectory(tmp_path)
+    before = directory.group('core')
+    assert list(before.index) == [0, 1, 2, 3, FILE_ROW_SPAN, FILE_ROW_SPAN + 1]
+
+    published = []
+    # Un abonné qui relit les groupes ne doit pas bloquer (abonnés appelés hors du verrou)
+    directory.subscribe(lambda delta: published.append((delta, directory.group('core'))))
+    append_matches(tmp_path / 'A.csv', matchday(15))
+    worker = threading.Thread(target=directory.refresh)
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+
+    [(delta, after)] = published
+    assert list(delta['core'].index) == [4, 5]
+    assert after.loc[before.index].equals(before)
+    assert (after.loc[[4, 5], 'Date'] == '2023-08-15').all()
+
+
+def test_table_refresh_writes_only_new_rows(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, matchday(1))
+    table = MatchTable(path)
+    table.group('core')
+
+    for day in range(2, MAX_CACHE_CHUNKS + 1):
+        append_matches(path, matchday(day))
+        delta = table.refresh()
+        assert len(delta['core']) == 2
+    assert len(table.chunks['core']) == MAX_CACHE_CHUNKS
+
+    # Morceaux relus à l'ouverture, lignes ajoutées depuis parsées en plus
+    append_matches(path, matchday(20))
+    reopened = MatchTable(path).group('core')
+    # Sans cache, le registre d'équipes est vide au départ: seul le vocabulaire diffère
+    pd.testing.assert_frame_equal(reopened, MatchTable(path, use_cache=False).group('core'),
+                                  check_categorical=False)
+
+    # Au-delà de MAX_CACHE_CHUNKS morceaux, le groupe est réécrit en un seul fichier
+    append_matches(path, matchday(21))
+    table.refresh()
+    assert len(table.chunks['core']) == 1
+    assert len(glob.glob(str(tmp_path / '.football_cache' / 'B1-*-core.npz'))) == 1
+
+
+def test_code_aliases_override_saved_aliases(tmp_path):
+    path = tmp_path / 'teams.json'
+    # Registre écrit avant l'ajout de l'alias STVV -> St Truiden dans le code
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'teams': ['Anvers', 'STVV', 'St Truiden', 'Genk'],
+                   'aliases': {'STVV': 'STVV', 'Liege': 'Standard'}}, f)
+
+    registry = TeamRegistry.load(path)
+    assert registry.aliases['STVV'] == TEAM_ALIASES['STVV'] == 'St Truiden'
+    assert registry.aliases['Liege'] == 'Standard'
+    assert registry.lookup('STVV') == registry.lookup('Sint-Truiden') == registry.lookup('St Truiden') == 1
+    assert registry.names == ['Anvers', 'St Truiden', 'Genk']
+
+    registry.save()
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['teams'] == ['Anvers', 'St Truiden', 'Genk']
+    assert TeamRegistry.load(path).names == registry.names
+
+
+def test_unchanged_registry_keeps_identifiers(tmp_path):
+    path = tmp_path / 'teams.json'
+    registry = TeamRegistry(['Genk', 'Anvers'], path=path)
+    registry._dirty = True
+    registry.save()
+
+    loaded = TeamRegistry.load(path)
+    assert loaded.names == ['Genk', 'Anvers']
+    assert not loaded._dirty
+
+
+def write_stats(path):
+    """Matchs avec statistiques (HS manquant une fois, HF hors de int8) et cotes"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR,HS,AS,HF,B365H\n')
+        f.write('B1,2023-08-05,Anvers,Genk,1,0,H,12,8,300,1.85\n')
+        f.write('B1,2023-08-05,Gand,Bruges,2,2,D,,9,11,2.40\n')
+        f.write('B1,2023-08-12,Genk,Gand,0,3,A,7,15,14,2.10\n')
+
+
+def test_compact_stats_use_narrow_nullable_integers(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    data = MatchTable(path, use_cache=False).frame('match_stats', 'odds_1x2')
+
+    assert str(data['FTHG'].dtype) == 'int8'
+    assert str(data['AS'].dtype) == 'int8'
+    assert str(data['HS'].dtype) == 'Int8'
+    assert str(data['HF'].dtype) == 'int16'
+    assert str(data['B365H'].dtype) == 'float32'
+    assert data['HS'].isna().tolist() == [False, True, False]
+    assert data['HS'].sum() == 19
+
+
+def test_cached_nullable_stats_round_trip(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    expected = MatchTable(path).frame('match_stats')
+    cached = MatchTable(path).frame('match_stats')
+
+    assert glob.glob(str(tmp_path / '.football_cache' / '*match_stats.npz'))
+    pd.testing.assert_frame_equal(cached, expected, check_categorical=False)
+    assert str(cached['HS'].dtype) == 'Int8'
+
+
+def test_memory_report_by_group(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    raw = parse_dataset(path)
+    report = memory_report(raw, compact_matches(raw))
+
+    assert set(report.index) == {'core', 'match_stats', 'odds_1x2', 'total'}
+    assert report.loc['total', 'before'] == raw.memory_usage(index=False, deep=True).sum()
+    # 3 lignes: le vocabulaire des catégories pèse plus que le texte, pas les nombres
+    assert report.loc['match_stats', 'ratio'] < 0.5
+    assert report.loc['odds_1x2', 'ratio'] == 0.5
+
+
+def test_version_changes_on_append_and_rewrite(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, matchday(1))
+    table = MatchTable(path)
+    first = table.version
+    assert (first.rows, first.max_date) == (2, '2023-08-01')
+
+    # Fichier inchangé: même version (pas de recalcul)
+    assert table.refresh() == {}
+    assert table.version is first
+
+    append_matches(path, matchday(8))
+    table.refresh()
+    appended = table.version
+    assert (appended.rows, appended.max_date) == (4, '2023-08-08')
+    assert appended.fingerprint != first.fingerprint
+
+    # Score corrigé: mêmes lignes et même dernière date, empreinte (et clé) différentes
+    rows = matchday(1) + matchday(8)
+    rows[0][4] = '3'
+    write_matches(path, rows)
+    assert table.refresh() is None
+    rewritten = table.version
+    assert (rewritten.rows, rewritten.max_date) == (appended.rows, appended.max_date)
+    assert rewritten.key != appended.key
+    assert MatchTable(path).version == rewritten
+
+
+def test_cache_round_trip_keeps_dtypes(tmp_path):
+    data = pd.DataFrame({
+        'Div': pd.Categorical(['B1', 'B1', 'E0']),
+        'Date': pd.to_datetime(['2023-08-05', '2023-08-12', '2023-08-19']).as_unit('ns'),
+        'FTHG': np.array([1, 0, 3], dtype='int8'),
+        'HF': pd.array([300, None, 14], dtype='Int16'),
+        'B365H': np.array([1.85, np.nan, 2.1], dtype='float32'),
+        'Referee': pd.Series(['A Dupont', np.nan, 'B Martin'], dtype=object),
+    })
+    path = tmp_path / 'cache.npz'
+    save_cache(data, path)
+
+    pd.testing.assert_frame_equal(read_cache(path), data)
+    with np.load(path, allow_pickle=False) as bundle:
+        assert 'm3' in bundle.files and 'm5' in bundle.files
+
+
+def record_parses(monkeypatch):
+    """Colonnes demandées à chaque lecture du CSV (None = toutes)"""
+    calls = []
+    parse = football_data.parse_dataset
+
+    def recording(path, columns=None, *args, **kwargs):
+        calls.append(None if columns is None else list(columns))
+        return parse(path, columns, *args, **kwargs)
+
+    monkeypatch.setattr(football_data, 'parse_dataset', recording)
+    return calls
+
+
+def test_cached_table_is_not_parsed_again(tmp_path, monkeypatch):
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    expected = MatchTable(path).frame(*COLUMN_GROUPS)
+
+    calls = record_parses(monkeypatch)
+    cached = MatchTable(path).frame(*COLUMN_GROUPS)
+    assert calls == []
+    pd.testing.assert_frame_equal(cached, expected, check_categorical=False)
+
+    # Contenu modifié (même taille): l'empreinte change, le cache est reconstruit
+    content = path.read_text().replace('Gand,0,3,A', 'Gand,3,0,H')
+    path.write_text(content)
+    rebuilt = MatchTable(path).frame()
+    assert calls == [MatchTable(path, use_cache=False).columns['core']]
+    assert rebuilt['FTR'].astype(str).tolist() == ['H', 'D', 'H']
+
+
+def test_views_load_only_their_column_groups(tmp_path, monkeypatch):
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    calls = record_parses(monkeypatch)
+    table = MatchTable(path, use_cache=False)
+
+    core = table.frame()
+    assert table.loaded_groups() == ['core']
+    assert set(core.columns) == {'Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'Season'}
+    assert calls == [table.columns['core']]
+
+    odds = table.frame('odds_1x2')
+    assert table.loaded_groups() == ['core', 'odds_1x2']
+    assert list(odds.columns) == list(core.columns) + ['B365H']
+    assert calls[1:] == [['B365H']]
+
+    # Groupe absent du fichier: rien à lire
+    assert table.group('odds_ah').empty
+    assert len(calls) == 2
+    assert 'match_stats' not in table.loaded_groups()
+
+
+def test_purge_removes_old_format_caches_and_manifests(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, matchday(1))
+    cache_dir = tmp_path / '.football_cache'
+    cache_dir.mkdir()
+    stale = ['B1-v6.json', 'B1-v6-0123-core.npz']
+    kept = ['C1-v6.json', 'teams.json']
+    for name in stale + kept:
+        (cache_dir / name).write_text('{}')
+
+    MatchTable(path).frame()
+    names = {p.name for p in cache_dir.iterdir()}
+    assert not names & set(stale)
+    assert set(kept) | {f"B1-v{football_data.CACHE_FORMAT_VERSION}.json"} <= names
+
+
+def test_unchanged_file_is_not_hashed(tmp_path, monkeypatch):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, matchday(1))
+    # Modification ancienne: (taille, date) fiables
+    old = os.stat(path).st_mtime - 60
+    os.utime(path, (old, old))
+    table = MatchTable(path)
+    table.frame()
+
+    hashes = []
+    fingerprint = football_data.fingerprint_with_prefix
+    monkeypatch.setattr(football_data, 'fingerprint_with_prefix',
+                        lambda *args, **kwargs: hashes.append(args[0]) or fingerprint(*args, **kwargs))
+    assert table.refresh() == {}
+    reopened = MatchTable(path)
+    assert reopened.fingerprint == table.fingerprint
+    pd.testing.assert_frame_equal(reopened.frame(), table.frame(), check_categorical=False)
+    assert hashes == []
+
+    # Ajout: une seule lecture du fichier (préfixe et empreinte complète)
+    append_matches(path, matchday(8))
+    assert list(table.refresh()['core'].index) == [2, 3]
+    assert len(hashes) == 1
+    assert table.refresh() == {}
+    assert len(hashes) == 2
+
+
+def test_open_dataset_prefers_configured_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv('FOOTBALL_DATA_DIR', raising=False)
+    write_matches(tmp_path / 'B1.csv', matchday(1))
+    assert open_dataset([tmp_path / 'absent.csv']) is None
+    table = open_dataset([tmp_path / 'absent.csv', tmp_path / 'B1.csv'], validator=validate_group)
+    assert isinstance(table, MatchTable) and table.validator is validate_group
+
+    monkeypatch.setenv('FOOTBALL_DATA_DIR', str(tmp_path))
+    assert isinstance(open_dataset([tmp_path / 'B1.csv']), MatchDirectory)
+
+
+def test_shared_matches_exported_once(tmp_path, monkeypatch):
+    monkeypatch.delenv('FOOTBALL_SHARED_DIR', raising=False)
+    path = tmp_path / 'B1.csv'
+    write_stats(path)
+    table = MatchTable(path)
+    assert shared_matches(table) is None
+
+    shared_dir = tmp_path / 'shared'
+    first = shared_matches(table, str(shared_dir))
+    monkeypatch.setenv('FOOTBALL_SHARED_DIR', str(shared_dir))
+    second = shared_matches(MatchTable(path))
+    assert [entry.name for entry in shared_dir.iterdir() if entry.is_dir()] == [table.version.key]
+    pd.testing.assert_frame_equal(second.sort_index(), first.sort_index())
+    assert second['HS'].tolist()[1] is pd.NA
+
+
+class Loader:
+    """Chargeur mis en cache (compte les appels à clear())"""
+
+    def __init__(self):
+        self.cleared = 0
+
+    def clear(self):
+        self.cleared += 1
+
+
+def test_refresh_dataset_keeps_cube_current(tmp_path):
+    path = tmp_path / 'B1.csv'
+    write_matches(path, matchday(1) + matchday(8))
+    table = MatchTable(path)
+    cube = season_cube(table.frame('match_stats'), table)
+    loader = Loader()
+
+    def assert_rebuilt():
+        expected = SeasonCube.from_frame(table.frame('match_stats'))
+        pd.testing.assert_frame_equal(cube.frame().sort_index(), expected.frame().sort_index())
+
+    assert not refresh_dataset(table, cube, [loader])
+    assert loader.cleared == 0
+
+    # Ajout: le delta passe par l'abonnement du cube
+    append_matches(path, matchday(15))
+    assert refresh_dataset(table, cube, [loader])
+    assert loader.cleared == 1
+    assert_rebuilt()
+
+    # Réécriture (score corrigé): seules les lignes modifiées passent dans le cube
+    rows = matchday(1) + matchday(8) + matchday(15)
+    rows[2][4:7] = ['0', '3', 'A']
+    write_matches(path, rows)
+    assert refresh_dataset(table, cube, [loader])
+    assert loader.cleared == 2
+    assert_rebuilt()
+
+    assert not refresh_dataset(None, cube, [loader])
@@ -0,0 +1,283 @@
+"""Tests des tables de features précalculées (football_features)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from football_data import season_labels
+from football_features import (CONGESTION_WINDOWS, DEFAULT_HOME_ADVANTAGE, H2H_METRICS, REST_CAP_DAYS,
+                               STANDINGS_COLUMNS, AsOfStore, FormTable, HomeAdvantageTable, MatchFeatures,
+                               PairIndex, RestFeatures, Standings, match_features)
+from football_synthetic import generate_matches
+
+
+@pytest.fixture
+def matches(make_matches):
+    return make_matches([
+        ('2023-08-05', 'Anvers', 'Bruges', 2, 1),
+        ('2023-08-12', 'Bruges', 'Anvers', 0, 0),
+        ('2023-08-12', 'Genk', 'Gand', 1, 3),
+        ('2023-08-19', 'Anvers', 'Genk', 1, 1),
+        ('2023-08-26', 'Bruges', 'Anvers', 3, 2),
+    ])
+
+
+def test_pair_index_built_once_per_features(matches, monkeypatch):
+    builds = []
+    build = PairIndex.from_frame.__func__
+    monkeypatch.setattr(PairIndex, 'from_frame',
+                        classmethod(lambda cls, data: builds.append(1) or build(cls, data)))
+
+    features = MatchFeatures(matches)
+    first = features.pair_matches('Anvers', 'Bruges')
+    second = features.pair_matches('Bruges', 'Anvers', last_n=2)
+
+    assert len(builds) == 1
+    assert list(first.index) == [0, 1, 4]
+    assert list(second.index) == [1, 4]
+    assert features.pairs() is features.pairs()
+
+
+def test_match_features_reuses_instance(matches):
+    features = MatchFeatures(matches)
+    assert match_features(features) is features
+    assert match_features(matches).data is matches
+
+
+def test_pair_matches_unknown_team(matches):
+    assert len(MatchFeatures(matches).pair_matches('Anvers', 'Inconnu')) == 0
+
+
+# Référence naïve: chaque table comparée à un groupby pandas sur une petite saison synthétique
+
+TEAMS = ['Anvers', 'Bruges', 'Charleroi', 'Gand', 'Genk', 'Malines']
+
+
+@pytest.fixture
+def season(make_matches):
+    """Double aller-retour de 6 équipes: nul 1-1 d'entrée (égalité parfaite), un match sans score"""
+    rng = np.random.default_rng(7)
+    teams, rounds = list(TEAMS), []
+    for _ in range(len(teams) - 1):
+        rounds.append([(teams[i], teams[-1 - i]) for i in range(len(teams) // 2)])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    dates = pd.Timestamp('2023-08-05') + pd.to_timedelta(np.cumsum(rng.choice([3, 4, 7], len(rounds))), unit='D')
+    rows = [(date, home, away, *rng.integers(0, 4, 2)) for date, pairs in zip(dates, rounds) for home, away in pairs]
+    data = make_matches(rows).astype({'FTHG': 'float64', 'FTAG': 'float64'})
+    data.loc[0, ['FTHG', 'FTAG']] = 1
+    data.loc[7, ['FTHG', 'FTAG']] = np.nan
+    return data
+
+
+def long_frame(data):
+    """Une ligne par (équipe, match), triée par équipe, date puis ordre du fichier"""
+    sides = []
+    for home, team, opponent, goals_for, goals_against in ((True, 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'),
+                                                           (False, 'AwayTeam', 'HomeTeam', 'FTAG', 'FTHG')):
+        sides.append(pd.DataFrame({
+            'row': np.arange(len(data)), 'Date': data['Date'].to_numpy(), 'home': home,
+            'team': data[team].to_numpy(), 'opponent': data[opponent].to_numpy(),
+            'goals_for': data[goals_for].to_numpy(), 'goals_against': data[goals_against].to_numpy(),
+        }))
+    long = pd.concat(sides).sort_values(['team', 'Date', 'row'], ignore_index=True)
+    # Un score manquant compte comme une défaite avec 0 but (convention de LongView.results)
+    long['wins'] = (long['goals_for'] > long['goals_against']).astype('int64')
+    long['draws'] = (long['goals_for'] == long['goals_against']).astype('int64')
+    long['losses'] = 1 - long['wins'] - long['draws']
+    long['points'] = long['wins'] * 3 + long['draws']
+    long[['goals_for', 'goals_against']] = long[['goals_for', 'goals_against']].fillna(0)
+    return long
+
+
+def naive_totals(long, columns):
+    return {col: int(long[col].sum()) for col in columns}
+
+
+def naive_table(data, cutoff):
+    """Classement à une date (incluse), matchs sans score exclus"""
+    scored = data.dropna(subset=['FTHG', 'FTAG'])
+    long = long_frame(scored[scored['Date'] <= cutoff])
+    members = sorted(set(scored['HomeTeam']) | set(scored['AwayTeam']))
+    table = long.groupby('team')[['wins', 'draws', 'losses', 'goals_for', 'goals_against', 'points']].sum()
+    table['played'] = long.groupby('team').size()
+    table = table.reindex(members, fill_value=0).astype('int64')
+    table['goal_difference'] = table['goals_for'] - table['goals_against']
+    table = table.rename_axis('team').reset_index()
+    table = table.sort_values(['points', 'goal_difference', 'goals_for', 'team'],
+                              ascending=[False, False, False, True], ignore_index=True)
+    table['position'] = np.arange(1, len(table) + 1)
+    return table
+
+
+def test_standings_match_naive_table(season):
+    standings = Standings.from_frame(season)
+    dates = season['Date'].drop_duplicates()
+    cutoffs = [dates.iloc[0], dates.iloc[3], dates.iloc[3] + pd.Timedelta(days=1), dates.iloc[-1]]
+    columns = ['team', 'position'] + STANDINGS_COLUMNS
+    for cutoff in cutoffs:
+        table = standings.table(cutoff)[columns].astype({'team': str}).reset_index(drop=True)
+        expected = naive_table(season, cutoff)[columns]
+        pd.testing.assert_frame_equal(table, expected, check_dtype=False)
+
+    # Égalité parfaite après le 1-1 d'ouverture: départage par nom
+    first = standings.table(dates.iloc[0])
+    tied = first[first['draws'] == 1]['team'].astype(str).tolist()
+    assert tied == sorted(tied) and len(tied) == 2
+    assert len(standings.table(dates.iloc[0] - pd.Timedelta(days=1))) == 0
+
+
+def test_standings_ignore_unscored_match(season):
+    standings = Standings.from_frame(season)
+    final = standings.table().set_index(standings.table()['team'].astype(str))
+    unscored = [season.loc[7, 'HomeTeam'], season.loc[7, 'AwayTeam']]
+    assert sorted(final.index[final['played'] == 9]) == sorted(unscored)
+    assert (final.drop(unscored)['played'] == 10).all()
+    assert final['played'].sum() == 2 * (len(season) - 1)
+
+
+def test_standings_lookup_before_match_date(season):
+    standings = Standings.from_frame(season)
+    dates = season['Date'].drop_duplicates()
+    teams = TEAMS + ['Inconnu']
+    result = standings.lookup(teams, [dates.iloc[4]] * len(teams))
+    expected = naive_table(season, dates.iloc[3]).set_index('team')
+    for team, row in zip(teams, result.itertuples()):
+        if team == 'Inconnu':
+            assert row.position == 0 and row.points == 0 and pd.isna(row.Season)
+        else:
+            assert (row.position, row.points, row.played) == tuple(expected.loc[team, ['position', 'points', 'played']])
+
+
+def lookup_grid(season):
+    """Toutes les (équipe, date de match) plus un lendemain de journée et une équipe inconnue"""
+    dates = list(season['Date'].drop_duplicates()) + [season['Date'].iloc[10] + pd.Timedelta(days=1)]
+    return pd.MultiIndex.from_product([TEAMS + ['Inconnu'], dates], names=['team', 'Date']).to_frame(index=False)
+
+
+def test_form_table_matches_naive_window(season):
+    long = long_frame(season)
+    grid = lookup_grid(season)
+    result = FormTable.from_frame(season).lookup(grid['team'], grid['Date'], n=3)
+    columns = ['points', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']
+    for (team, date), row in zip(grid.itertuples(index=False), result.to_dict('records')):
+        recent = long[(long['team'] == team) & (long['Date'] < date)].tail(3)
+        assert row == {'matches': len(recent), **naive_totals(recent, columns)}, (team, date)
+
+
+def test_asof_store_matches_naive_state(season):
+    long = long_frame(season)
+    fixtures = season[['HomeTeam', 'AwayTeam', 'Date']].copy()
+    fixtures.loc[len(fixtures)] = ['Inconnu', 'Genk', season['Date'].iloc[-1]]
+    result = AsOfStore.from_frame(season).features(fixtures, n=3, h2h_n=1)
+    columns = ['points', 'wins', 'goals_for', 'goals_against']
+    for (home, away, date), row in zip(fixtures.itertuples(index=False), result.to_dict('records')):
+        if home == 'Inconnu':
+            assert row['home_matches'] == 0 and row['home_home_advantage'] == DEFAULT_HOME_ADVANTAGE
+            assert row['h2h_matches'] == 0
+            continue
+        before = long[long['Date'] < date]
+        history = before[before['team'] == home]
+        assert row['home_matches'] == len(history)
+        assert row['home_home_matches'] == int(history['home'].sum())
+        assert {f"home_{col}": row[f"home_{col}"] for col in columns} == \
+            {f"home_{col}": value for col, value in naive_totals(history, columns).items()}
+        recent = before[before['team'] == away].tail(3)
+        assert row['away_form_points'] == int(recent['points'].sum())
+        h2h = history[history['opponent'] == away].tail(1)
+        assert (row['h2h_matches'], row['h2h_points'], row['h2h_goals_for']) == \
+            (len(h2h), int(h2h['points'].sum()), int(h2h['goals_for'].sum()))
+
+
+@pytest.mark.parametrize('last_k', [None, 1])
+def test_head_to_head_tensor_matches_naive_pairs(season, last_k):
+    long = long_frame(season.dropna(subset=['FTHG', 'FTAG']))
+    if last_k is not None:
+        long = long.groupby(['team', 'opponent']).tail(last_k)
+    pairs = long.groupby(['team', 'opponent'])
+    expected = pairs[['wins', 'draws', 'losses', 'goals_for', 'goals_against']].sum().astype('int64')
+    expected.insert(0, 'meetings', pairs.size())
+
+    teams = TEAMS + ['Inconnu']
+    grid = pd.MultiIndex.from_product([teams, teams], names=['team', 'opponent'])
+    result = MatchFeatures(season).h2h(last_k).gather(grid.get_level_values(0), grid.get_level_values(1))
+    expected = expected.reindex(grid, fill_value=0)
+    assert result.columns.tolist() == H2H_METRICS
+    np.testing.assert_array_equal(result.to_numpy(), expected[H2H_METRICS].to_numpy())
+
+    # Le match sans score ne compte pas: la paire ne s'est rencontrée qu'une fois
+    home, away = season.loc[7, ['HomeTeam', 'AwayTeam']]
+    assert MatchFeatures(season).h2h().summary(home, away)['meetings'] == 1
+
+
+def test_rest_features_match_naive_calendar(season):
+    long = long_frame(season)
+    grid = lookup_grid(season)
+    rest = RestFeatures.from_frame(season)
+    result = rest.lookup(grid['team'], grid['Date'])
+    for (team, date), row in zip(grid.itertuples(index=False), result.to_dict('records')):
+        # Le calendrier compte tous les matchs datés, avec ou sans score
+        before = long[(long['team'] == team) & (long['Date'] < date)]
+        days = (date - before['Date'].iloc[-1]).days if len(before) else REST_CAP_DAYS
+        expected = {'rest_days': min(days, REST_CAP_DAYS)}
+        for window in CONGESTION_WINDOWS:
+            expected[f"matches_{window}d"] = int((before['Date'] >= date - pd.Timedelta(days=window)).sum())
+        assert row == expected, (team, date)
+
+    # Features des matchs du dataset: état de chaque équipe avant la date du match
+    matches = rest.matches(len(season))
+    home = rest.lookup(season['HomeTeam'], season['Date'])
+    away = rest.lookup(season['AwayTeam'], season['Date'])
+    np.testing.assert_array_equal(matches['home_rest_days'], home['rest_days'])
+    np.testing.assert_array_equal(matches['away_matches_14d'], away['matches_14d'])
+    np.testing.assert_array_equal(matches['diff_rest_days'], home['rest_days'] - away['rest_days'])
+
+
+@pytest.fixture
+def seasons():
+    """Quatre saisons synthétiques; une équipe absente de la première (promue), un score manquant"""
+    data = pd.concat([block for _, _, block in generate_matches(seasons=4, teams=6, seed=11)], ignore_index=True)
+    data['Date'] = pd.to_datetime(data['Date'])
+    data['Season'] = season_labels(data['Date'])
+    first = data['Season'] == data['Season'].min()
+    promoted = data['HomeTeam'].iloc[0]
+    data = data[~(first & ((data['HomeTeam'] == promoted) | (data['AwayTeam'] == promoted)))].reset_index(drop=True)
+    data.loc[len(data) - 1, ['FTHG', 'FTAG']] = np.nan
+    return data
+
+
+def naive_home_advantage(data, team, seasons):
+    """Avantage domicile d'une équipe recalculé en parcourant ses matchs des saisons données"""
+    window = data[data['Season'].isin(seasons)]
+    home = window[window['HomeTeam'] == team]
+    away = window[window['AwayTeam'] == team]
+    if len(home) == 0 or len(away) == 0:
+        return DEFAULT_HOME_ADVANTAGE
+    home_rate = (home['FTHG'] > home['FTAG']).sum() / len(home)
+    away_rate = (away['FTAG'] > away['FTHG']).sum() / len(away)
+    return max(0, min(15, (home_rate - away_rate) * 100))
+
+
+@pytest.mark.parametrize('window, include_current', [(1, False), (2, False), (2, True), (10, True)])
+def test_home_advantage_windows_match_naive_scan(seasons, window, include_current):
+    table = HomeAdvantageTable.from_frame(seasons)
+    labels = sorted(seasons['Season'].unique())
+    windowed = table.windowed(window, include_current)
+    assert list(windowed.columns) == labels
+    for team in windowed.index:
+        for i, label in enumerate(labels):
+            end = i + 1 if include_current else i
+            expected = naive_home_advantage(seasons, team, labels[max(end - window, 0):end])
+            assert windowed.loc[team, label] == pytest.approx(expected), (team, label)
+
+    # Recherche vectorisée: mêmes valeurs, valeur par défaut pour une équipe ou une saison inconnue
+    teams = list(windowed.index) + ['Inconnu', windowed.index[0]]
+    keys = [labels[i % len(labels)] for i in range(len(teams) - 1)] + ['1999-2000']
+    values = table.at(teams, keys, window, include_current)
+    expected = [windowed.loc[team, key] if team in windowed.index and key in labels else DEFAULT_HOME_ADVANTAGE
+                for team, key in zip(teams, keys)]
+    np.testing.assert_allclose(values, expected)
+
+    # Fenêtre couvrant tout l'historique: même valeur que le facteur global
+    if include_current and window >= len(labels):
+        np.testing.assert_allclose(windowed[labels[-1]], table.factors().reindex(windowed.index))
@@ -0,0 +1,98 @@
+"""Tests de football_prediction_pro: prédiction par lot et caches indexés par version du dataset
+
+L'application importe Streamlit, Plotly et scikit-learn: les tests sont ignorés sans eux.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('plotly')
+pytest.importorskip('sklearn')
+
+import football_prediction_pro as pro  # noqa: E402
+from football_data import MatchTable, season_labels  # noqa: E402
+from football_features import MatchFeatures  # noqa: E402
+from football_stats import SeasonCube  # noqa: E402
+from football_store import MatchStore  # noqa: E402
+from football_synthetic import generate_matches  # noqa: E402
+
+# Impact de condition sans tirage: la fatigue mesurée (0 si absente) décalée d'une constante
+CONDITION_SHIFT = 0.1
+
+
+@pytest.fixture
+def fixed_conditions(monkeypatch):
+    monkeypatch.setattr(pro, 'simulate_team_condition', lambda team, fatigue=None: {
+        'condition_impact': CONDITION_SHIFT + (0.0 if fatigue is None else fatigue)})
+    monkeypatch.setattr(pro, 'simulate_team_conditions', lambda size, fatigue=None, rng=None: (
+        CONDITION_SHIFT + (np.zeros(size) if fatigue is None else np.asarray(fatigue, dtype='float64'))))
+
+
+@pytest.fixture(scope='module')
+def matches():
+    data = pd.concat([block for _, _, block in generate_matches(seasons=2, teams=6, seed=3)], ignore_index=True)
+    data['Date'] = pd.to_datetime(data['Date'])
+    data['Season'] = season_labels(data['Date'])
+    return data
+
+
+@pytest.mark.parametrize('source', ['frame', 'features', 'store'])
+def test_batch_matches_scalar_ensemble(matches, fixed_conditions, source):
+    data = {'frame': lambda: matches, 'features': lambda: MatchFeatures(matches),
+            'store': lambda: MatchStore.from_frame(matches)}[source]()
+    team_stats = SeasonCube.from_frame(matches).team_profiles()
+    teams = sorted(team_stats)
+    fixtures = pd.DataFrame([(home, away) for home in teams for away in teams if home != away] + [('Inconnu', teams[0])],
+                            columns=['HomeTeam', 'AwayTeam'])
+
+    results = pro.predict_matches(fixtures, team_stats, data)
+    for fixture, row in zip(fixtures.itertuples(index=False), results.itertuples(index=False)):
+        if fixture.HomeTeam == 'Inconnu':
+            assert np.isnan(row.home_goals) and np.isnan(row.h2h_meetings)
+            continue
+        home, away, confidence, details = pro.advanced_prediction_ensemble(
+            fixture.HomeTeam, fixture.AwayTeam, team_stats, data)
+        probabilities = pro.calculate_match_probabilities(home, away)
+        assert (row.home_goals, row.away_goals, row.confidence) == pytest.approx((home, away, confidence))
+        assert (row.home_condition, row.away_condition) == pytest.approx(
+            (details['home_condition']['condition_impact'], details['away_condition']['condition_impact']))
+        assert (row.home_win, row.draw, row.away_win) == (
+            probabilities['home_win'], probabilities['draw'], probabilities['away_win'])
+
+
+def test_match_probabilities_match_scalar_version():
+    home = np.array([0.0, 1.2, 1.5, 2.9, 0.4, 1.0])
+    away = np.array([0.0, 1.0, 2.3, 0.6, 2.5, 1.75])
+    vectorized = pro.match_probabilities(home, away)
+    for i, (h, a) in enumerate(zip(home, away)):
+        assert {name: values[i] for name, values in vectorized.items()} == pro.calculate_match_probabilities(h, a)
+
+
+def test_version_keyed_loaders_follow_the_dataset(matches, tmp_path, monkeypatch):
+    path = tmp_path / 'B1.csv'
+    columns = ['Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR']
+    first_season = matches['Season'] == matches['Season'].min()
+    matches[first_season][columns].to_csv(path, index=False, date_format='%Y-%m-%d')
+    table = MatchTable(path, use_cache=False)
+    monkeypatch.setattr(pro, 'open_match_table', lambda: table)
+    monkeypatch.setattr(pro, 'get_match_data', lambda: table.frame('match_stats'))
+    pro.load_match_features.clear()
+    pro.load_team_strengths.clear()
+
+    version = pro.dataset_version()
+    features = pro.load_match_features(version)
+    strengths = pro.load_team_strengths(version, 90)
+    # Même version: objets repris du cache
+    assert pro.load_match_features(pro.dataset_version()) is features
+    assert pro.load_team_strengths(pro.dataset_version(), 90) is strengths
+
+    # Nouvelle journée ajoutée au CSV: nouvelle version, tables reconstruites avec les nouvelles lignes
+    matches[~first_season][columns].to_csv(path, mode='a', header=False, index=False, date_format='%Y-%m-%d')
+    table.refresh()
+    assert pro.dataset_version() != version
+    refreshed = pro.load_match_features(pro.dataset_version())
+    assert refreshed is not features
+    assert len(refreshed.data) == len(matches)
+    assert pro.load_team_strengths(pro.dataset_version(), 90).reference == matches['Date'].max()
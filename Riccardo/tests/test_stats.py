@@ -0,0 +1,193 @@
+"""Tests des statistiques d'équipes agrégées (football_stats)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from football_data import PartitionedMatches, compact_matches, season_labels
+from football_stats import CUBE_STATS, DEFAULT_HALF_LIFE, SeasonCube, TeamStrengths, profile_field
+from football_synthetic import generate_matches
+
+
+@pytest.fixture(scope='module')
+def matches():
+    """Trois saisons synthétiques, avec des statistiques manquantes (comme dans dataset.csv)"""
+    data = pd.concat([block for _, _, block in generate_matches(seasons=3, teams=6, seed=5)], ignore_index=True)
+    data['Date'] = pd.to_datetime(data['Date'])
+    data['Season'] = season_labels(data['Date'])
+    rng = np.random.default_rng(5)
+    for col in ['FTAG', 'HS', 'AST', 'HC', 'AC']:
+        data.loc[rng.random(len(data)) < 0.1, col] = np.nan
+    return data
+
+
+def calculate_team_stats(data, seasons):
+    """Boucle par équipe d'origine (football_prediction_pro, avant SeasonCube)"""
+    season_data = data[data['Season'].isin(seasons)]
+    team_stats = {}
+    for team in set(season_data['HomeTeam'].unique()) | set(season_data['AwayTeam'].unique()):
+        home_matches = season_data[season_data['HomeTeam'] == team]
+        home_wins = len(home_matches[home_matches['FTR'] == 'H'])
+        home_goals = home_matches['FTHG'].mean() if len(home_matches) > 0 else 0
+        away_matches = season_data[season_data['AwayTeam'] == team]
+        away_wins = len(away_matches[away_matches['FTR'] == 'A'])
+        away_goals = away_matches['FTAG'].mean() if len(away_matches) > 0 else 0
+        team_stats[team] = {
+            'total_home_matches': len(home_matches),
+            'home_wins': home_wins,
+            'home_win_rate': home_wins / len(home_matches) if len(home_matches) > 0 else 0,
+            'avg_goals_home': home_goals,
+            'total_away_matches': len(away_matches),
+            'away_wins': away_wins,
+            'away_win_rate': away_wins / len(away_matches) if len(away_matches) > 0 else 0,
+            'avg_goals_away': away_goals
+        }
+    return team_stats
+
+
+def naive_profile(data, team):
+    """Champs étendus de team_profiles recalculés match par match pour une équipe"""
+    sides = {
+        'home': (data[data['HomeTeam'] == team], 'H', 'A', 0),
+        'away': (data[data['AwayTeam'] == team], 'A', 'H', 1),
+    }
+    profile = {}
+
+    def mean(values):
+        values = [value for value in values if not pd.isna(value)]
+        return sum(values) / len(values) if values else 0
+
+    for venue in [None, 'home', 'away']:
+        suffix = '' if venue is None else f"_{venue}"
+        played = [side for name, side in sides.items() if venue in (None, name)]
+        results = [(result, win) for rows, win, _, _ in played for result in rows['FTR']]
+        stat_values = {}
+        for name, home_col, away_col in CUBE_STATS:
+            for rows, _, _, own in played:
+                for_col, against_col = (home_col, away_col) if own == 0 else (away_col, home_col)
+                stat_values.setdefault((name, 'for'), []).extend(rows[for_col])
+                stat_values.setdefault((name, 'against'), []).extend(rows[against_col])
+
+        conceded = [value for value in stat_values[('goals', 'against')] if not pd.isna(value)]
+        profile[f"draw_rate{suffix}"] = mean([result == 'D' for result, _ in results])
+        profile[f"clean_sheets{suffix}"] = sum(value == 0 for value in conceded)
+        profile[f"clean_sheet_rate{suffix}"] = mean([value == 0 for value in conceded])
+        profile[f"avg_goals_conceded{suffix}"] = mean(conceded)
+        for name, _, _ in CUBE_STATS[1:]:
+            for side in ['for', 'against']:
+                profile[f"avg_{name}_{side}{suffix}"] = mean(stat_values[(name, side)])
+        if venue is None:
+            profile['total_matches'] = len(results)
+            profile['wins'] = sum(result == win for result, win in results)
+            profile['draws'] = sum(result == 'D' for result, _ in results)
+            profile['losses'] = len(results) - profile['wins'] - profile['draws']
+            profile['win_rate'] = mean([result == win for result, win in results])
+            profile['avg_goals_scored'] = mean(stat_values[('goals', 'for')])
+    return profile
+
+
+def assert_same_cube(cube, expected):
+    """Mêmes agrégats (équipes ayant joué) pour toutes les saisons et saison par saison"""
+    for seasons in [None] + [[season] for season in expected.seasons]:
+        pd.testing.assert_frame_equal(cube.frame(seasons).sort_index(), expected.frame(seasons).sort_index())
+
+
+@pytest.mark.parametrize('seasons', [None, 1, 2])
+def test_team_stats_match_per_team_loop(matches, seasons):
+    labels = sorted(matches['Season'].unique())
+    selected = labels if seasons is None else labels[-seasons:]
+    expected = calculate_team_stats(matches, selected)
+
+    team_stats = SeasonCube.from_frame(matches).team_stats(None if seasons is None else selected)
+    assert set(team_stats) == set(expected)
+    for team, stats in team_stats.items():
+        assert stats == pytest.approx(expected[team], nan_ok=True)
+
+
+def test_team_profiles_match_per_team_loop(matches):
+    selected = sorted(matches['Season'].unique())[1:]
+    season_data = matches[matches['Season'].isin(selected)]
+    profiles = SeasonCube.from_frame(compact_matches(matches)).team_profiles(selected)
+
+    expected_stats = calculate_team_stats(matches, selected)
+    assert set(profiles) == set(expected_stats)
+    for team, profile in profiles.items():
+        expected = {**expected_stats[team], **naive_profile(season_data, team)}
+        assert profile == pytest.approx(expected, nan_ok=True)
+
+
+def test_apply_in_batches_equals_full_build(matches):
+    cube = SeasonCube()
+    for start in range(0, len(matches), 37):
+        cube.apply(matches.iloc[start:start + 37])
+    assert_same_cube(cube, SeasonCube.from_frame(matches))
+
+
+def test_retract_equals_rebuild_without_batch(matches):
+    last_season = matches['Season'] == matches['Season'].max()
+    batch = matches[last_season].iloc[:25]
+    cube = SeasonCube.from_frame(matches).retract(batch)
+    assert_same_cube(cube, SeasonCube.from_frame(matches.drop(batch.index)))
+
+
+def test_update_equals_rebuild(matches):
+    previous = compact_matches(matches)
+    current = compact_matches(pd.concat([matches.iloc[5:], matches.iloc[:2].assign(Season='2099-2100')]
+                                        ).set_axis(list(matches.index[5:]) + [10 ** 6, 10 ** 6 + 1]))
+    # Résultat corrigé et statistique complétée sur des lignes conservées
+    current.loc[current.index[0], ['FTHG', 'FTAG', 'FTR']] = [4, 0, 'H']
+    current.loc[current.index[1], 'HS'] = 12
+
+    cube = SeasonCube.from_frame(previous).update(previous, current)
+    assert_same_cube(cube, SeasonCube.from_frame(current))
+
+
+def naive_strengths(data, team, half_life, reference):
+    """Moyennes pondérées 0.5 ** (âge / demi-vie) recalculées match par match pour une équipe"""
+    totals, strengths = {}, {'weight': 0.0, 'weight_home': 0.0, 'weight_away': 0.0}
+    for match in data.itertuples(index=False):
+        venues = [venue for venue, col in [('home', 'HomeTeam'), ('away', 'AwayTeam')] if getattr(match, col) == team]
+        for venue in venues:
+            weight = 0.5 ** ((reference - match.Date).total_seconds() / 86400 / half_life)
+            strengths['weight'] += weight
+            strengths[f"weight_{venue}"] += weight
+            for name, home_col, away_col in [('goals', 'FTHG', 'FTAG'), ('shots_on_target', 'HST', 'AST'),
+                                             ('corners', 'HC', 'AC')]:
+                own, other = (home_col, away_col) if venue == 'home' else (away_col, home_col)
+                for side, col in [('for', own), ('against', other)]:
+                    value = getattr(match, col)
+                    if pd.isna(value):
+                        continue
+                    for key in [(name, side, None), (name, side, venue)]:
+                        total, weights = totals.get(key, (0.0, 0.0))
+                        totals[key] = (total + weight * value, weights + weight)
+    for (name, side, venue), (total, weights) in totals.items():
+        if weights > 0:
+            strengths[profile_field(name, side, venue)] = total / weights
+    return {key: value for key, value in strengths.items() if value > 0}
+
+
+@pytest.mark.parametrize('half_life, at', [(DEFAULT_HALF_LIFE, None), (60, '2017-01-01')])
+def test_strengths_match_naive_weighted_average(matches, half_life, at):
+    # Même restriction que les applications: matchs des saisons sélectionnées seulement
+    selected = sorted(matches['Season'].unique())[1:]
+    season_data = PartitionedMatches.from_frame(compact_matches(matches)).select(seasons=selected)
+    assert sorted(season_data['Season'].astype(str).unique()) == selected
+    strengths = TeamStrengths.from_frame(season_data, half_life, at)
+
+    used = season_data if at is None else season_data[season_data['Date'] < pd.Timestamp(at)]
+    reference = used['Date'].max() if at is None else pd.Timestamp(at)
+    assert strengths.reference == reference
+    teams = sorted(set(used['HomeTeam'].astype(str)) | set(used['AwayTeam'].astype(str)))
+    assert list(strengths.table.index) == teams
+    for team in teams:
+        assert strengths.team(team) == pytest.approx(naive_strengths(used, team, half_life, reference))
+
+    # Les profils gardent leurs autres champs, les moyennes sont remplacées
+    profiles = SeasonCube.from_frame(season_data).team_profiles(selected)
+    weighted = strengths.apply(profiles)
+    team = teams[0]
+    expected = naive_strengths(used, team, half_life, reference)
+    assert weighted[team]['total_matches'] == profiles[team]['total_matches']
+    assert weighted[team]['avg_goals_scored'] == pytest.approx(expected['avg_goals_scored'])
+    assert weighted[team]['avg_corners_against_away'] == pytest.approx(expected['avg_corners_against_away'])
@@ -0,0 +1,168 @@
+"""Tests des backends de stockage (football_store)"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from football_features import MatchFeatures, match_features
+from football_store import (MATCH_COLUMNS, MatchStore, attach_shared_arrays, collect_shared_arrays,
+                            export_shared_arrays)
+
+
+TEXT_COLUMNS = ['Div', 'Season', 'HomeTeam', 'AwayTeam']
+
+
+@pytest.fixture
+def matches(make_matches):
+    """Quatre matchs sur deux saisons, colonnes texte catégorielles comme dans la table compacte"""
+    data = make_matches([
+        ('2022-08-06', 'Anvers', 'Bruges', 2, 1),
+        ('2023-08-05', 'Genk', 'Anvers', 1, 1),
+        ('2022-08-13', 'Bruges', 'Genk', 0, 2),
+        ('2023-08-12', 'Anvers', 'Bruges', 3, 0),
+    ], seasons=['2022-2023', '2023-2024', '2022-2023', '2023-2024'])
+    return data.astype({**dict.fromkeys(TEXT_COLUMNS, 'category'), 'FTHG': 'float64', 'FTAG': 'float64'})
+
+
+def is_mapped(array):
+    """Le tableau est-il (une vue d') un fichier mappé en mémoire ?"""
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def test_attach_keeps_mapped_category_codes(matches, tmp_path):
+    data = matches
+    export_shared_arrays(data, tmp_path, 'v1')
+    shared = attach_shared_arrays(tmp_path, 'v1')
+
+    assert is_mapped(shared['HomeTeam'].array.codes)
+    assert is_mapped(shared['FTHG'].to_numpy())
+    pd.testing.assert_frame_equal(shared.sort_index(), data, check_categorical=False)
+
+
+def test_attach_maps_nullable_integers(matches, tmp_path):
+    data = matches
+    data['HS'] = pd.array([12, None, 7, 9], dtype='Int8')
+    export_shared_arrays(data, tmp_path, 'v1')
+    shared = attach_shared_arrays(tmp_path, 'v1')
+    assert is_mapped(shared['HS'].array._data)
+
+    shared = shared.sort_index()
+    assert str(shared['HS'].dtype) == 'Int8'
+    assert shared['HS'].isna().tolist() == [False, True, False, False]
+    pd.testing.assert_series_equal(shared['HS'], data['HS'])
+
+
+def test_export_keeps_other_versions_until_collected(matches, tmp_path):
+    data = matches
+    export_shared_arrays(data, tmp_path, 'v1')
+    old = attach_shared_arrays(tmp_path, 'v1')
+    export_shared_arrays(data.iloc[:3], tmp_path, 'v2')
+
+    assert sorted(os.listdir(tmp_path)) == ['current.json', 'v1', 'v2']
+    assert attach_shared_arrays(tmp_path, 'v1') is None
+    assert len(attach_shared_arrays(tmp_path, 'v2')) == 3
+    # L'ancienne version reste lisible par les processus qui y sont attachés
+    assert np.array_equal(old.sort_index()['FTHG'].to_numpy(), data['FTHG'].to_numpy())
+
+    assert collect_shared_arrays(tmp_path) == ['v1']
+    assert sorted(os.listdir(tmp_path)) == ['current.json', 'v2']
+
+
+def test_export_same_version_twice(matches, tmp_path):
+    data = matches
+    export_shared_arrays(data, tmp_path, 'v1')
+    export_shared_arrays(data, tmp_path, 'v1')
+
+    assert sorted(os.listdir(tmp_path)) == ['current.json', 'v1']
+    with open(tmp_path / 'current.json', encoding='utf-8') as f:
+        assert json.load(f) == {'key': 'v1'}
+    assert len(attach_shared_arrays(tmp_path, 'v1')) == 4
+
+
+def searches(plan):
+    """Lignes SEARCH du plan, avec la ligne qui suit (un tri temporaire éventuel)"""
+    return [(line, plan[i + 1] if i + 1 < len(plan) else '') for i, line in enumerate(plan)
+            if line.startswith('SEARCH')]
+
+
+def test_season_view_queries_use_team_season_indexes(matches):
+    store = MatchStore.from_frame(matches).view(['2023-2024'])
+    queries = {
+        'idx_home_season_date': store._venue_record_sql('Anvers', 'home'),
+        'idx_away_season_date': store._venue_record_sql('Anvers', 'away'),
+        'idx_pair_season_date': store._pair_matches_sql('Anvers', 'Bruges', 10, 'Date', MATCH_COLUMNS),
+    }
+    for index, (sql, params) in queries.items():
+        [(search, following)] = searches(store.query_plan(sql, params))
+        assert f"COVERING INDEX {index} " in search and 'Season=?' in search
+        assert 'TEMP B-TREE' not in following
+
+    sql, params = store._team_matches_sql('Anvers', 5, MATCH_COLUMNS)
+    plan = searches(store.query_plan(sql, params))
+    assert [search.split(' (')[0] for search, _ in plan] == [
+        'SEARCH matches USING COVERING INDEX idx_home_season_date',
+        'SEARCH matches USING COVERING INDEX idx_away_season_date',
+    ]
+    # Chaque branche lit ses N derniers matchs dans l'ordre de l'index (pas de tri avant LIMIT)
+    assert all('Season=?' in search and 'TEMP B-TREE' not in following for search, following in plan)
+
+
+def test_queries_return_projected_columns(matches):
+    store = MatchStore.from_frame(matches)
+    team_matches = store.team_matches('Anvers', 2)
+    assert list(team_matches.columns) == ['Season'] + MATCH_COLUMNS
+    assert list(team_matches.index) == [1, 3]
+    assert list(store.pair_matches('Bruges', 'Anvers').index) == [0, 3]
+
+
+def test_store_features_follow_the_view(matches):
+    data = matches
+    data['AS'] = [4, 6, 3, 5]
+    store = MatchStore.from_frame(data)
+    frame = store.frame()
+    assert list(frame.index) == [0, 1, 2, 3]
+    assert frame['AS'].tolist() == [4, 6, 3, 5]
+
+    features = match_features(store)
+    assert features is match_features(store)
+    assert features.form().last('Anvers') == MatchFeatures(data).form().last('Anvers')
+    season = match_features(store.view(['2023-2024']))
+    assert list(season.data.index) == [1, 3]
+
+
+def test_len_counted_once_per_signature(matches):
+    data = matches
+    store = MatchStore.from_frame(data, signature='v1')
+    view = store.view(['2023-2024'])
+    counts = []
+    store.connection.set_trace_callback(lambda sql: counts.append(sql) if 'COUNT(*)' in sql else None)
+
+    assert [len(store), len(store), len(view), len(view)] == [4, 4, 2, 2]
+    assert len(counts) == 2
+
+    store.load(data.iloc[:3], signature='v2')
+    assert (len(store), len(view)) == (3, 1)
+    assert len(counts) == 4
+
+
+def test_shared_pair_matches_keep_source_row_order(matches, make_matches, tmp_path):
+    # Match d'une saison antérieure en fin de fichier: les tableaux partagés le placent en tête
+    late = make_matches([('2021-09-01', 'Bruges', 'Anvers', 0.0, 0.0)], seasons='2021-2022')
+    data = pd.concat([matches.astype(dict.fromkeys(TEXT_COLUMNS, str)), late], ignore_index=True)
+    export_shared_arrays(data, tmp_path, 'v1')
+    shared = attach_shared_arrays(tmp_path, 'v1')
+    store = MatchStore.from_frame(data)
+
+    for last_n in [None, 2]:
+        by_row = MatchFeatures(shared).pair_matches('Anvers', 'Bruges', last_n, order='row')
+        assert list(by_row.index) == list(store.pair_matches('Anvers', 'Bruges', last_n, order='row').index)
+    assert list(MatchFeatures(shared).pair_matches('Anvers', 'Bruges', order='row').index) == [0, 3, 4]
+    assert list(MatchFeatures(shared).pair_matches('Anvers', 'Bruges').index) == [4, 0, 3]
@@ -0,0 +1,33 @@
+"""Tests du générateur de données synthétiques (football_synthetic)"""
+
+import pandas as pd
+
+from football_data import season_labels
+from football_synthetic import generate_matches
+from football_validation import validate_matches
+
+
+def generated_frame(**params):
+    blocks = list(generate_matches(**params))
+    data = pd.concat([block for _, _, block in blocks], ignore_index=True)
+    data['Date'] = pd.to_datetime(data['Date'])
+    return blocks, data
+
+
+def test_large_league_is_valid():
+    _, data = generated_frame(teams=30)
+    report = validate_matches(data)
+    assert report.ok, report.summary()
+
+
+def test_large_league_fits_in_its_season():
+    blocks, _ = generated_frame(teams=30, seasons=2)
+    for _, season, block in blocks:
+        assert (season_labels(pd.to_datetime(block['Date'])) == season).all()
+
+
+def test_teams_play_at_most_once_a_day():
+    _, data = generated_frame(teams=30, seasons=1)
+    appearances = pd.concat([data[['Date', 'HomeTeam']].set_axis(['Date', 'Team'], axis=1),
+                             data[['Date', 'AwayTeam']].set_axis(['Date', 'Team'], axis=1)])
+    assert not appearances.duplicated().any()
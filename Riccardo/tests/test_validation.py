@@ -0,0 +1,135 @@
+"""Tests des contrôles du dataset (football_validation)"""
+
+import pandas as pd
+import pytest
+
+from football_data import MatchDirectory, MatchTable
+from football_validation import (ERROR, WARNING, _Collector, check_fixtures, check_odds, check_ranges,
+                                 check_results, check_schema, combine_reports, validate_group)
+
+
+@pytest.fixture
+def matches(make_matches):
+    """Trois matchs cohérents: matches(**columns) remplace ou ajoute des colonnes"""
+    rows = [('2023-08-05', 'Anvers', 'Bruges', 2, 1), ('2023-08-12', 'Bruges', 'Genk', 0, 0),
+            ('2023-08-19', 'Genk', 'Anvers', 1, 3)]
+    return lambda **columns: make_matches(rows, **{'FTR': ['H', 'D', 'A'], **columns})
+
+
+def run(check, data):
+    """Enregistrements (check, gravité, colonne, lignes) d'un contrôle"""
+    collector = _Collector(data)
+    check(data, collector)
+    return [(record['check'], record['severity'], record['column'], record['sample'])
+            for record in collector.records]
+
+
+def test_check_schema(matches):
+    assert run(check_schema, matches()) == []
+
+    data = matches(HS=['12', 'x', '9'], Extra=[1, 2, 3]).drop(columns='FTR')
+    data.loc[1, 'HomeTeam'] = None
+    data['Date'] = data['Date'].dt.strftime('%Y-%m-%d')
+    assert run(check_schema, data) == [
+        ('missing', ERROR, 'HomeTeam', [1]),
+        ('schema', ERROR, 'FTR', []),
+        ('dtype', ERROR, 'Date', []),
+        ('dtype', ERROR, 'HS', [1]),
+        ('schema', WARNING, '', []),
+    ]
+
+
+def test_check_ranges(matches):
+    assert run(check_ranges, matches(HS=[10, 8, 12], HST=[4, 2, 5])) == []
+
+    data = matches(HS=[10, 70, 3], HST=[4, 2, 5], HY=[1.5, 0, 1], HTHG=[3, 0, 1], HTAG=[0, 0, 1])
+    assert run(check_ranges, data) == [
+        ('range', ERROR, 'HS', [1]),
+        ('range', ERROR, 'HY', [0]),
+        ('range', ERROR, 'HST', [2]),
+        ('range', ERROR, 'HTHG/HTAG', [0]),
+    ]
+
+
+def test_check_results(matches):
+    assert run(check_results, matches()) == []
+
+    data = matches(FTR=['H', 'X', 'H'], HTHG=[1, 0, 0], HTAG=[0, 0, 0], HTR=['D', 'D', 'D'])
+    assert run(check_results, data) == [
+        ('result', ERROR, 'FTR', [1]),
+        ('result', ERROR, 'FTR', [2]),
+        ('result', ERROR, 'HTR', [0]),
+    ]
+
+
+def test_check_fixtures(matches):
+    assert run(check_fixtures, matches()) == []
+
+    data = pd.concat([matches(), matches().iloc[[0]]], ignore_index=True)
+    assert run(check_fixtures, data) == [
+        ('duplicate', ERROR, '', [3]),
+        ('date_order', WARNING, 'Date', [3]),
+    ]
+    # Une division en ordre décroissant est acceptée
+    assert run(check_fixtures, matches().iloc[::-1]) == []
+
+
+def test_check_odds(matches):
+    odds = {'B365H': [1.9, 2.5, 1.5], 'B365D': [3.4, 3.2, 4.0], 'B365A': [4.2, 2.9, 6.5]}
+    assert run(check_odds, matches(**odds)) == []
+
+    odds = {'B365H': [1.9, 1.0, 1.5], 'B365D': [3.4, 3.2, 4.0], 'B365A': [4.2, 2.9, 1.5],
+            'MaxH': [1.0, 2.5, 1.5], 'AHh': [-0.5, 0.25, -1.0]}
+    assert run(check_odds, matches(**odds)) == [
+        ('odds', ERROR, 'B365H', [1]),
+        ('odds', ERROR, 'MaxH', [0]),
+        ('overround', WARNING, 'B365', [1, 2]),
+    ]
+
+
+def test_validate_group_runs_group_checks(matches):
+    data = matches(HS=[10, 70, 3], B365H=[1.9, 1.0, 1.5])
+    assert validate_group('core', data[['Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR']]).ok
+    assert list(validate_group('match_stats', data[['HS']]).invalid_rows) == [1]
+    assert list(validate_group('odds_1x2', data[['B365H']]).invalid_rows) == [1]
+    assert validate_group('other', data).ok
+
+    report = combine_reports([validate_group('match_stats', data[['HS']]),
+                              validate_group('odds_1x2', data[['B365H']].assign(B365H=[1.0, 1.9, 1.5]))])
+    assert list(report.invalid_rows) == [0, 1]
+    assert combine_reports([]).ok
+
+
+ODDS_HEADER = 'Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR,HS,AS,B365H,B365D,B365A\n'
+
+
+def write_rows(path, rows, mode='w'):
+    with open(path, mode) as f:
+        if mode == 'w':
+            f.write(ODDS_HEADER)
+        f.writelines(','.join(row) + '\n' for row in rows)
+
+
+@pytest.mark.parametrize('directory', [False, True])
+def test_table_validates_groups_on_ingest_and_refresh(tmp_path, directory):
+    path = tmp_path / 'B1.csv'
+    write_rows(path, [
+        ['B1', '2023-08-05', 'Anvers', 'Bruges', '2', '1', 'H', '10', '8', '1.9', '3.4', '4.2'],
+        ['B1', '2023-08-12', 'Bruges', 'Genk', '0', '0', 'D', '9', '7', '2.5', '3.2', '2.9'],
+    ])
+    table = (MatchDirectory(tmp_path, validator=validate_group) if directory
+             else MatchTable(path, validator=validate_group))
+    table.frame('odds_1x2')
+    assert sorted(table.validation()) == ['core', 'odds_1x2']
+    assert all(report.ok for report in table.validation().values())
+
+    # Nouvelle journée: cote impossible et résultat incohérent, signalés par refresh()
+    write_rows(path, [['B1', '2023-08-19', 'Genk', 'Anvers', '1', '3', 'H', '12', '6', '1.0', '3.1', '3.0']], 'a')
+    delta = table.refresh()
+    assert list(delta['core'].index) == [2]
+    reports = table.validation()
+    assert [issue.check for issue in reports['core'].errors().itertuples()] == ['result']
+    assert [issue.check for issue in reports['odds_1x2'].errors().itertuples()] == ['odds']
+    assert list(combine_reports(reports.values()).invalid_rows) == [2]
+
+    assert MatchTable(path).validation() == {}